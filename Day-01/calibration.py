@@ -4,8 +4,99 @@ Advent of Code 2023 - Day 1: Trebuchet?!
 Stephen Houser <stephenhouser@gmail.com>
 """
 
+import os
 import re
+import sys
+import time
+import argparse
+import unittest
 from functools import reduce
+from itertools import pairwise
+from collections import deque
+
+# shared modules (performance.py) live in the directory above
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from performance import add_profile_arguments, profiler    # pylint: disable=wrong-import-position
+
+class TestAOC(unittest.TestCase):
+    """Test Advent of Code"""
+
+    #
+    # Part One
+    #
+    def test_part1_example(self):
+        """Part 1 solution for test-1.txt"""
+        self.assertEqual(read_calibration('test-1.txt', line_value1), 142)
+
+    def test_part1_solution(self):
+        """Part 1 solution for input.txt"""
+        self.assertEqual(read_calibration('input.txt', line_value1), 53386)
+
+    #
+    # Part Two
+    #
+    def test_part2_example(self):
+        """Part 2 solution for test-2.txt"""
+        self.assertEqual(reduce_calibration('test-2.txt', line_value2), 309)
+
+    def test_part2_solution(self):
+        """Part 2 solution for input.txt"""
+        self.assertEqual(reduce_calibration('input.txt', line_value2), 53312)
+
+    def test_parallel(self):
+        """Chunks split on line boundaries add up to the serial sum"""
+        # pylint: disable=import-outside-toplevel
+        import random
+        import tempfile
+
+        with tempfile.NamedTemporaryFile('w', suffix='.txt') as file:
+            rng = random.Random(2)
+            for _ in range(500):
+                file.write(rng.choice(list(DIGIT_WORDS)) + 'x' * rng.randint(0, 30)
+                           + str(rng.randint(1, 9)) + '\n')
+            file.flush()
+
+            ranges = chunk_ranges(file.name, 7)
+            self.assertEqual(ranges[0][0], 0)
+            self.assertTrue(all(a[1] == b[0] for a, b in pairwise(ranges)))
+            serial = read_calibration(file.name, line_value2)
+            self.assertEqual(parallel_calibration(file.name, line_value2, 3, 7), serial)
+
+    def test_part1_bulk(self):
+        """Bulk byte version agrees with read_calibration"""
+        self.assertEqual(bulk_calibration1('test-1.txt'), 142)
+        self.assertEqual(bulk_calibration1('test-1.txt', block_size=7), 142)
+        # pylint: disable=import-outside-toplevel
+        import random
+        import tempfile
+
+        with tempfile.NamedTemporaryFile('w', suffix='.txt') as file:
+            rng = random.Random(3)
+            for _ in range(500):
+                file.write(''.join(rng.choices('abc0123456789', k=rng.randint(0, 20)))
+                           + str(rng.randint(1, 9)) + '\n')
+            file.write('x5y')     # no newline at the end
+            file.flush()
+            expected = read_calibration(file.name, line_value1)
+            self.assertEqual(bulk_calibration1(file.name), expected)
+            self.assertEqual(bulk_calibration1(file.name, block_size=64), expected)
+
+    def test_part2_overlapping(self):
+        """Overlapping words count for both the first and last digit"""
+        self.assertEqual(line_value2('eightwo'), 82)
+        self.assertEqual(line_value2('2oneight'), 28)
+        self.assertEqual(line_value2('twone'), 21)
+        self.assertEqual(line_value2('sevenine'), 79)
+
+    def test_part2_scanner(self):
+        """Scanner agrees with the regular expressions on random lines"""
+        import random   # pylint: disable=import-outside-toplevel
+
+        rng = random.Random(1)
+        pieces = list(DIGIT_WORDS) + list('123456789') + ['x', 'n', 'e', 'on', 'ei']
+        for _ in range(1000):
+            line = ''.join(rng.choices(pieces, k=rng.randint(1, 12))) + '1'
+            self.assertEqual(line_value2(line), line_value2_regex(line), line)
 
 
 # Part 1
@@ -37,6 +128,48 @@ def line_value1(line: str) -> int:
 
     return int(first_digit + last_digit)
 
+#
+# Bulk version of part 1 that works on the raw bytes of the file.
+# Deleting every byte that is not a digit or newline (bytes.translate) leaves
+# just the digits of each line; the first and last digit of every line are
+# then found with two regular expression scans over the whole block. No
+# per-line objects are created (one byte bytes objects are shared).
+#
+NOT_DIGITS = bytes(b for b in range(256) if b not in b'123456789\n')
+FIRST_DIGIT_RE = re.compile(rb'^[1-9]', re.MULTILINE)
+LAST_DIGIT_RE = re.compile(rb'[1-9]$', re.MULTILINE)
+
+def digit_sum(digits: bytes) -> int:
+    """Return the sum of the ASCII digits in digits"""
+    return sum(digits) - ord('0') * len(digits)
+
+def block_value1(block: bytes) -> int:
+    """Return the sum of the calibration values of complete lines in block"""
+    digits = block.translate(None, NOT_DIGITS)
+    first = b''.join(FIRST_DIGIT_RE.findall(digits))
+    last = b''.join(LAST_DIGIT_RE.findall(digits))
+    return 10 * digit_sum(first) + digit_sum(last)
+
+def bulk_calibration1(filename, block_size=2**24):
+    """Read calibration file and return calibration value for part 1
+
+       Same result as read_calibration(filename, line_value1). The file is
+       read block_size bytes at a time, each block cut at its last newline.
+    """
+    calibration, rest = 0, b''
+    try:
+        with open(filename, 'rb') as file:
+            while block := file.read(block_size):
+                block = rest + block
+                end = block.rfind(b'\n') + 1
+                calibration += block_value1(block[:end])
+                rest = block[end:]
+
+    except FileNotFoundError:
+        print(f'ERROR: file {filename} not found!')
+
+    return calibration + block_value1(rest + b'\n')
+
 # Part 2
 # Some of the digits are actually spelled out with letters:
 #   one, two, three, four, five, six, seven, eight, and nine
@@ -66,12 +199,15 @@ def number_str(number_name: str) -> str:
 
     return number_name
 
-def line_value2(line: str) -> int:
+def line_value2_regex(line: str) -> int:
     """Return the line's calibration value.
 
        Combines the first digit and last digit (in order) to form a single 
        two-digit number. Digits can also be the strings that represent the 
        digit, e.g. one = 1, two = 2, ...
+
+       Initial version, the regular expressions backtrack over the whole
+       line to find each match. See line_value2().
     """
     number_re = '(one|two|three|four|five|six|seven|eight|nine|1|2|3|4|5|6|7|8|9)'
     first_match = re.search('^.*?' + number_re + '.*$', line) # find first occurrence
@@ -82,6 +218,101 @@ def line_value2(line: str) -> int:
 
     return int(first_digit + last_digit)
 
+#
+# Multi-pattern scanner (Aho-Corasick)
+# All the digit words are compiled into one automaton so a line is read once
+# from the front to find the first digit and once from the back (with an
+# automaton of the reversed words) to find the last. Overlapping words such
+# as "eightwo" are both found, 8 from the front and 2 from the back.
+#
+DIGIT_WORDS = {'one': 1, 'two': 2, 'three': 3, 'four': 4, 'five': 5,
+               'six': 6, 'seven': 7, 'eight': 8, 'nine': 9}
+DIGITS = {str(value): value for value in DIGIT_WORDS.values()}
+
+def build_automaton(words: dict) -> tuple[list, list]:
+    """Return the (transitions, matches) of an Aho-Corasick automaton for words.
+
+       transitions[state] is {char: next state}, complete so there is no
+       failure link to follow while scanning; any other char goes to state 0.
+       matches[state] is the (length, value) of the longest word that ends
+       in that state, or None.
+    """
+    trie, matches = [{}], [None]
+    for word, value in words.items():
+        state = 0
+        for char in word:
+            if char not in trie[state]:
+                trie.append({})
+                matches.append(None)
+                trie[state][char] = len(trie) - 1
+            state = trie[state][char]
+        matches[state] = (len(word), value)
+
+    # breadth first, so the failure state (shorter suffix) is always done first
+    transitions = [dict(edges) for edges in trie]
+    failure = [0] * len(trie)
+    queue = deque(trie[0].values())
+    while queue:
+        state = queue.popleft()
+        fail = failure[state]
+        if matches[state] is None:
+            matches[state] = matches[fail]
+        for char, target in transitions[fail].items():
+            transitions[state].setdefault(char, target)
+        for char, child in trie[state].items():
+            failure[child] = transitions[fail].get(char, 0) if state else 0
+            queue.append(child)
+
+    return transitions, matches
+
+class DigitScanner:
+    """Finds the first and last of a set of words in a line in one pass
+       from each end, each character is looked at most once per pass.
+    """
+    def __init__(self, words: dict):
+        self.longest = max(map(len, words))
+        self.forward = build_automaton(words)
+        self.reverse = build_automaton({w[::-1]: v for w, v in words.items()})
+
+    def _scan(self, automaton, chars):
+        """Return the value of the word that starts first in chars"""
+        transitions, matches = automaton
+        state, best, best_start = 0, None, 0
+        for end, char in enumerate(chars):
+            state = transitions[state].get(char, 0)
+            match = matches[state]
+            if match and (best is None or end - match[0] + 1 < best_start):
+                best, best_start = match[1], end - match[0] + 1
+
+            # nothing ending later can start before the best match
+            if best is not None and end + 2 - self.longest >= best_start:
+                break
+
+        return best
+
+    def first(self, line: str) -> int:
+        """Return the value of the first word in line, None if there is none"""
+        return self._scan(self.forward, line)
+
+    def last(self, line: str) -> int:
+        """Return the value of the last word in line, None if there is none"""
+        return self._scan(self.reverse, reversed(line))
+
+    def value(self, line: str) -> int:
+        """Return the first and last word's values as a two-digit number"""
+        return self.first(line) * 10 + self.last(line)
+
+DIGIT_SCANNER = DigitScanner(DIGIT_WORDS | DIGITS)
+
+def line_value2(line: str) -> int:
+    """Return the line's calibration value.
+
+       Combines the first digit and last digit (in order) to form a single 
+       two-digit number. Digits can also be the strings that represent the 
+       digit, e.g. one = 1, two = 2, ...
+    """
+    return DIGIT_SCANNER.value(line)
+
 #
 # Initial version using a traditional for-loop
 #
@@ -94,7 +325,8 @@ def read_calibration(filename, value_fn):
     calibration = 0
     try:
         with open(filename, 'r', encoding='utf-8') as file:
-            for line in file.readlines():
+            # one line at a time, the file is never read in all at once
+            for line in file:
                 calibration += value_fn(line.strip())
 
     except FileNotFoundError:
@@ -115,20 +347,121 @@ def reduce_calibration(filename, value_fn):
         with open(filename, 'r', encoding='utf-8') as file:
             # c = calibration value
             # l = line from file
-            return reduce(lambda c,l: c + value_fn(l), file.readlines(), 0)
+            return reduce(lambda c,l: c + value_fn(l), file, 0)
 
     except FileNotFoundError:
         print(f'ERROR: file {filename} not found!')
 
     return 0
 
+#
+# Parallel version for (very) large files
+# The file is split into byte ranges that each end on a newline and every
+# range is summed in a separate process, only the partial sums come back.
+#
+def chunk_ranges(filename, chunks):
+    """Return [(start, end), ...] byte ranges splitting filename into about
+       `chunks` pieces. Every range starts at the beginning of a line.
+    """
+    size = os.path.getsize(filename)
+    boundaries = [0]
+    with open(filename, 'rb') as file:
+        for chunk in range(1, chunks):
+            file.seek(max(size * chunk // chunks, boundaries[-1]))
+            file.readline()     # finish the line the range ends in
+            boundaries.append(min(file.tell(), size))
+
+    boundaries.append(size)
+    return [(start, end) for start, end in pairwise(boundaries) if start < end]
+
+def sum_chunk(task):
+    """Pool worker: return the sum of value_fn over the lines in a byte range"""
+    filename, start, end, value_fn = task
+    calibration = 0
+    with open(filename, 'rb') as file:
+        file.seek(start)
+        position = start
+        while position < end:
+            line = file.readline()
+            position += len(line)
+            calibration += value_fn(line.decode('utf-8').strip())
+
+    return calibration
+
+def parallel_calibration(filename, value_fn, processes=None, chunks=None):
+    """Read calibration file and return calibration value
+
+       Like read_calibration() but the file is summed in chunks on a pool of
+       processes (default one per CPU). value_fn must be a module level
+       function so it can be sent to the workers.
+    """
+    processes = processes or os.cpu_count()
+    try:
+        # a few chunks per process evens out lines of different lengths
+        ranges = chunk_ranges(filename, chunks or processes * 4)
+    except FileNotFoundError:
+        print(f'ERROR: file {filename} not found!')
+        return 0
+
+    # only the parallel path needs it, it is slow to import
+    import multiprocessing  # pylint: disable=import-outside-toplevel
+
+    tasks = [(filename, start, end, value_fn) for start, end in ranges]
+    with multiprocessing.Pool(processes) as pool:
+        return sum(pool.imap_unordered(sum_chunk, tasks))
+
+def benchmark_parallel(filename, max_processes=None,
+                       value_fns=(line_value1, line_value2)):
+    """Print the time to sum filename serially and on 1, 2, 4, ... processes
+       up to max_processes (default the number of CPUs), with the speedup
+       over the serial sum.
+    """
+    size = os.path.getsize(filename)
+    counts = [2**n for n in range((max_processes or os.cpu_count()).bit_length())]
+    print(f'{filename}: {size / 2**20:0.1f}MB, {os.cpu_count()} CPUs')
+    print(f'{"function":12} {"processes":>9} {"seconds":>9} {"MB/s":>8} {"speedup":>8}')
+    for value_fn in value_fns:
+        t0 = time.perf_counter()
+        expected = read_calibration(filename, value_fn)
+        serial = time.perf_counter() - t0
+        print(f'{value_fn.__name__:12} {"serial":>9} {serial:9.3f} '
+              f'{size / 2**20 / serial:8.1f} {1:8.2f}')
+
+        for processes in counts:
+            t0 = time.perf_counter()
+            total = parallel_calibration(filename, value_fn, processes)
+            elapsed = time.perf_counter() - t0
+            assert total == expected, f'{total} != {expected}'
+            print(f'{value_fn.__name__:12} {processes:9} {elapsed:9.3f} '
+                  f'{size / 2**20 / elapsed:8.1f} {serial / elapsed:8.2f}')
+
+
+def main():
+    """Main Routine, does all the work"""
+    parser = argparse.ArgumentParser()
+    parser.add_argument('-b', '--benchmark', metavar='FILE',
+                        help='time the parallel sum of FILE for 1..CPUs processes')
+    parser.add_argument('-j', '--jobs', type=int,
+                        help='most processes to benchmark (default CPUs)')
+    add_profile_arguments(parser)
+    args = parser.parse_args()
+
+    if args.benchmark:
+        benchmark_parallel(args.benchmark, args.jobs)
+        return
+
+    with profiler(args.profile, args.profile_output):
+        p1 = read_calibration('test-1.txt', line_value1) # 142
+        print(f'Initial calibration value is {p1} (142)')
+        p2 = read_calibration('input.txt', line_value1) # 53386
+        print(f'Initial calibration value is {p2} (53386)')
+        p2 = bulk_calibration1('input.txt') # 53386
+        print(f'Initial calibration value (bulk) is {p2} (53386)')
 
-p1 = read_calibration('test-1.txt', line_value1) # 142
-print(f'Initial calibration value is {p1} (142)')
-p2 = read_calibration('input.txt', line_value1) # 53386
-print(f'Initial calibration value is {p2} (53386)')
+        p1 = reduce_calibration('test-2.txt', line_value2) # 281
+        print(f'Final calibration value is {p1} (281)')
+        p2 = reduce_calibration('input.txt', line_value2) # 53312
+        print(f'Final calibration value is {p2} (53312)')
 
-p1 = reduce_calibration('test-2.txt', line_value2) # 281
-print(f'Final calibration value is {p1} (281)')
-p2 = reduce_calibration('input.txt', line_value2) # 53312
-print(f'Final calibration value is {p2} (53312)')
+if __name__ == '__main__':
+    main()
@@ -4,8 +4,62 @@ Advent of Code 2023 - Day 2: Cube Conundrum
 Stephen Houser <stephenhouser@gmail.com>
 """
 
+import os
 import re
+import sys
+import random
+import argparse
+import unittest
+from array import array
+from bisect import bisect_left, bisect_right
 from functools import reduce
+from collections import Counter, defaultdict
+
+# shared modules (performance.py) live in the directory above
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from performance import add_profile_arguments, profiler    # pylint: disable=wrong-import-position
+
+class TestAOC(unittest.TestCase):
+    """Test Advent of Code"""
+
+    #
+    # Part One
+    #
+    def test_part1_example(self):
+        """Part 1 solution for test.txt"""
+        games = valid_games(load_games('test.txt'), (12, 13, 14))
+        self.assertEqual(sum(games.keys()), 8)
+
+    def test_part1_store(self):
+        """Part 1 solution for test.txt from the GameStore"""
+        store = load_game_store('test.txt')
+        self.assertEqual(sum(store.valid_ids((12, 13, 14))), 8)
+
+    def test_store_queries(self):
+        """Batch queries agree with valid_games for every threshold"""
+        games = load_games('test.txt')
+        store = GameStore.from_games(games)
+        rng = random.Random(1)
+        thresholds = [tuple(rng.randint(0, 21) for _ in range(3)) for _ in range(200)]
+        expected = [sorted(valid_games(games, t).keys()) for t in thresholds]
+        self.assertEqual(store.count_valid(thresholds), list(map(len, expected)))
+        self.assertEqual(list(map(sorted, store.valid_ids_many(thresholds))), expected)
+
+    def test_streaming(self):
+        """One pass over the file gives both answers"""
+        self.assertEqual(list(iter_games('test.txt'))[2], (3, 20, 13, 6))
+        self.assertEqual(game_totals(iter_games('test.txt'), (12, 13, 14)), (8, 2286))
+
+    #
+    # Part Two
+    #
+    def test_part2_example(self):
+        """Part 2 solution for test.txt"""
+        self.assertEqual(sum(game_powers(load_games('test.txt'))), 2286)
+
+    def test_part2_store(self):
+        """Part 2 solution for test.txt from the GameStore"""
+        self.assertEqual(sum(load_game_store('test.txt').powers()), 2286)
 
 
 #
@@ -147,11 +201,198 @@ def game_powers(games: dict[int, list[tuple[int]]]) -> list[int]:
     """
     return map(game_power, games.values())
 
+#
+# Streaming version
+# One regular expression finds the game id and every "<count> <color>" in a
+# line in a single scan, the trials don't matter once only the most cubes of
+# each color are kept. Games are yielded as they are read so memory does not
+# grow with the number of games.
+#
+TOKEN_RE = re.compile(r'Game (\d+)|(\d+) (red|green|blue)')
+COLOR_INDEX = {'red': 0, 'green': 1, 'blue': 2}
+
+def parse_game_cubes(line: str) -> tuple[int, int, int, int]:
+    """Return (game_id, red, green, blue), the fewest cubes of each color
+       the game described by line needs.
+    """
+    game_id, cubes = None, [0, 0, 0]
+    for game, count, color in TOKEN_RE.findall(line):
+        if game:
+            game_id = int(game)
+        else:
+            index = COLOR_INDEX[color]
+            cubes[index] = max(cubes[index], int(count))
+
+    return (game_id, *cubes)
+
+def iter_games(filename: str):
+    """Yield (game_id, red, green, blue) for each game in the file, the
+       fewest cubes of each color that game needs.
+    """
+    try:
+        with open(filename, 'r', encoding='utf-8') as file:
+            for line in file:
+                if line.strip():
+                    yield parse_game_cubes(line)
+
+    except FileNotFoundError:
+        print(f'ERROR: file {filename} not found.')
+
+def game_totals(games, max_rgb: tuple[int]) -> tuple[int, int]:
+    """Return (sum of the valid game ids, sum of the game powers) in one
+       pass over games, (game_id, red, green, blue) e.g. from iter_games().
+    """
+    max_red, max_green, max_blue = max_rgb
+    valid_sum = power_sum = 0
+    for game_id, red, green, blue in games:
+        if red <= max_red and green <= max_green and blue <= max_blue:
+            valid_sum += game_id
+        power_sum += red * green * blue
+
+    return valid_sum, power_sum
+
+#
+# Columnar version
+# The fewest cubes of each color every game needs are computed once, at load,
+# into one array per color. A game is valid for max_rgb when it needs no more
+# than max_rgb of every color. Sorting each color's column gives, for every
+# distinct count, a bitmask (int) of the games needing at most that many, so
+# the games valid for a threshold are the AND of three prefix masks found by
+# binary search: one query costs O(games / 64) machine words, not a walk over
+# every trial of every game.
+#
+def prefix_masks(column) -> tuple[list[int], list[int]]:
+    """Return (values, masks) where values are the distinct values in column,
+       sorted, and masks[i] has bit n set if column[n] <= values[i].
+    """
+    rows = defaultdict(list)
+    for row, value in enumerate(column):
+        rows[value].append(row)
+
+    values, masks, mask = [], [], 0
+    for value in sorted(rows):
+        bits = bytearray((len(column) + 7) // 8)
+        for row in rows[value]:
+            bits[row >> 3] |= 1 << (row & 7)
+        mask |= int.from_bytes(bits, 'little')
+        values.append(value)
+        masks.append(mask)
+
+    return values, masks
+
+class GameStore:
+    """Fewest red, green and blue cubes each game needs, one array per color
+       (index n is the game ids[n]).
+    """
+    def __init__(self, ids, red, green, blue):
+        self.ids = array('L', ids)
+        self.red = array('L', red)
+        self.green = array('L', green)
+        self.blue = array('L', blue)
+        self.masks = [prefix_masks(column) for column in (self.red, self.green, self.blue)]
+
+    @classmethod
+    def from_games(cls, games: dict[int, list[tuple[int]]]):
+        """Return a GameStore for games loaded with load_games()"""
+        cubes = [tuple(cubes_for_game(trials)) for trials in games.values()]
+        return cls(games.keys(), *zip(*cubes)) if cubes else cls((), (), (), ())
+
+    def __len__(self):
+        return len(self.ids)
+
+    def valid_mask(self, max_rgb: tuple[int]) -> int:
+        """Return a bitmask of the games that are valid with max_rgb cubes"""
+        mask = -1
+        for (values, masks), maximum in zip(self.masks, max_rgb):
+            index = bisect_right(values, maximum) - 1
+            mask &= masks[index] if index >= 0 else 0
+
+        return mask
+
+    def mask_ids(self, mask: int) -> list[int]:
+        """Return the game ids for the bits set in mask"""
+        ids = []
+        for offset, byte in enumerate(mask.to_bytes((len(self.ids) + 7) // 8, 'little')):
+            while byte:
+                low = byte & -byte
+                ids.append(self.ids[offset * 8 + low.bit_length() - 1])
+                byte ^= low
+
+        return ids
+
+    def valid_ids(self, max_rgb: tuple[int]) -> list[int]:
+        """Return the ids of the games that are valid with max_rgb cubes"""
+        return self.mask_ids(self.valid_mask(max_rgb))
+
+    def count_valid(self, thresholds: list[tuple[int]]) -> list[int]:
+        """Return how many games are valid for each max_rgb in thresholds.
+
+           Offline dominance counting: the games (grouped by their cubes)
+           and thresholds are both sorted by red, and as the red threshold
+           passes a group it is added to a 2-D Fenwick tree over its
+           (green, blue) ranks, so each threshold is one prefix count of
+           the games added so far. That is O(C log C + T log T +
+           (C + T) log G log B) time for C distinct (red, green, blue),
+           T thresholds, G distinct greens and B distinct blues, and
+           G x B memory.
+        """
+        groups = sorted(Counter(zip(self.red, self.green, self.blue)).items())
+        greens = sorted(set(self.green))
+        blues = sorted(set(self.blue))
+        tree = [[0] * (len(blues) + 1) for _ in range(len(greens) + 1)]
+
+        added = 0
+        counts = [0] * len(thresholds)
+        for query in sorted(range(len(thresholds)), key=lambda q: thresholds[q][0]):
+            (max_red, max_green, max_blue) = thresholds[query]
+            while added < len(groups) and groups[added][0][0] <= max_red:
+                ((_, green, blue), games) = groups[added]
+                added += 1
+                i = bisect_left(greens, green) + 1
+                first_j = bisect_left(blues, blue) + 1
+                while i <= len(greens):
+                    row, j = tree[i], first_j
+                    while j <= len(blues):
+                        row[j] += games
+                        j += j & -j
+                    i += i & -i
+
+            # games added so far with green <= max_green and blue <= max_blue
+            i = bisect_right(greens, max_green)
+            last_j = bisect_right(blues, max_blue)
+            while i > 0:
+                row, j = tree[i], last_j
+                while j > 0:
+                    counts[query] += row[j]
+                    j -= j & -j
+                i -= i & -i
+
+        return counts
+
+    def valid_ids_many(self, thresholds: list[tuple[int]]) -> list[list[int]]:
+        """Return the ids of the valid games for each max_rgb in thresholds"""
+        return [self.valid_ids(max_rgb) for max_rgb in thresholds]
+
+    def powers(self):
+        """Return the power (red * green * blue) of each game"""
+        return map(lambda r, g, b: r * g * b, self.red, self.green, self.blue)
+
+def load_game_store(filename: str) -> GameStore:
+    """Return a GameStore for the games in filename"""
+    columns = tuple(zip(*iter_games(filename)))
+    return GameStore(*columns) if columns else GameStore((), (), (), ())
+
+
+def main():
+    """Main Routine, does all the work"""
+    parser = argparse.ArgumentParser()
+    add_profile_arguments(parser)
+    args = parser.parse_args()
 
-sample_games = load_games('input.txt')
-possible_games = valid_games(sample_games, (12, 13, 14))
-possible_games_sum = sum(possible_games.keys())
-print(f'The sum of the possible games ids is: {possible_games_sum}')
+    with profiler(args.profile, args.profile_output):
+        possible_games_sum, powers = game_totals(iter_games('input.txt'), (12, 13, 14))
+        print(f'The sum of the possible games ids is: {possible_games_sum}')
+        print(f'The sum of the game powers is: {powers}')
 
-powers = game_powers(sample_games)
-print(f'The sum of the game powers is: {sum(powers)}')
+if __name__ == '__main__':
+    main()
@@ -1,13 +1,78 @@
 #!/usr/bin/env python
 """
-Advent of Code 2023 - Day _: Cube Conundrum
+Advent of Code 2023 - Day 3: Gear Ratios
 Stephen Houser <stephenhouser@gmail.com>
 """
 
+import os
 import re
+import sys
+import time
+import argparse
+import tempfile
+import unittest
+from bisect import bisect_right
 from itertools import chain
 from functools import partial
 
+# shared modules (performance.py) live in the directory above
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from performance import add_profile_arguments, profiler    # pylint: disable=wrong-import-position
+
+class TestAOC(unittest.TestCase):
+    """Test Advent of Code"""
+
+    #
+    # Part One
+    #
+    def test_part1_example(self):
+        """Part 1 solution for test.txt"""
+        engine_map = load_map('test.txt')
+        parts = part_numbers(find_symbols(engine_map), find_parts(engine_map))
+        self.assertEqual(sum(parts), 4361)
+
+    def test_part1_solution(self):
+        """Part 1 solution for input.txt"""
+        engine_map = load_map('input.txt')
+        parts = part_numbers(find_symbols(engine_map), find_parts(engine_map))
+        self.assertEqual(sum(parts), 527446)
+
+    def test_streaming(self):
+        """Three row window gives the same answers as the whole map"""
+        self.assertEqual(stream_totals('test.txt'), (4361, 467835))
+        # pylint: disable=import-outside-toplevel
+        from generators import generate
+        lines = generate(3, 0.5, 7).split('\n')
+        symbols, parts = find_symbols(lines), find_parts(lines)
+        expected = list(find_connected_parts(symbols, parts))
+        self.assertEqual([numbers for _, numbers in stream_connected(lines)], expected)
+
+    def test_part_index(self):
+        """Indexed lookup finds the same parts as filtering every part"""
+        engine_map = load_map('test.txt')
+        symbols, parts = find_symbols(engine_map), find_parts(engine_map)
+        index = index_parts(parts)
+        for _, center in symbols:
+            box = make_box(center)
+            self.assertEqual(indexed_part_numbers(box, parts, index),
+                             overlapping_part_numbers(box, parts))
+
+    #
+    # Part Two
+    #
+    def test_part2_example(self):
+        """Part 2 solution for test.txt"""
+        engine_map = load_map('test.txt')
+        ratios = gear_ratios(find_symbols(engine_map), find_parts(engine_map))
+        self.assertEqual(sum(ratios), 467835)
+
+    def test_part2_solution(self):
+        """Part 2 solution for input.txt"""
+        engine_map = load_map('input.txt')
+        ratios = gear_ratios(find_symbols(engine_map), find_parts(engine_map))
+        self.assertEqual(sum(ratios), 73201705)
+
+
 def load_map(filename: str) -> list[str]:
     """Load map of gears and parts from the given file
         
@@ -64,6 +129,50 @@ def overlapping_part_numbers(box, parts):
     # include only the part numbers in the result list
     return list(map(lambda part: part[0], find_overlaps(box, parts)))
 
+#
+# Spatial index of parts
+# Checking every symbol against every part is O(symbols x parts). Instead the
+# parts are bucketed by row once, sorted by starting column. Parts on a row
+# never overlap, so the parts touching a box are found with a binary search
+# on each of the (three) rows the box covers.
+#
+def index_parts(parts) -> dict[int, tuple[list[int], list[int]]]:
+    """Return {row: (starts, indexes)} for parts, where starts are the first
+       columns of the parts on that row in order and indexes their position
+       in parts.
+    """
+    rows = {}
+    for index, (_, ((x1, y), _)) in enumerate(parts):
+        starts, indexes = rows.setdefault(y, ([], []))
+        starts.append(x1)
+        indexes.append(index)
+
+    for starts, indexes in rows.values():
+        if any(a > b for a, b in zip(starts, starts[1:])):
+            order = sorted(range(len(starts)), key=starts.__getitem__)
+            starts[:] = [starts[i] for i in order]
+            indexes[:] = [indexes[i] for i in order]
+
+    return rows
+
+def indexed_part_numbers(box, parts, index):
+    """Return list of part numbers that overlap box, using index_parts()"""
+    ((x1, y1), (x2, y2)) = box
+    found = []
+    for y in range(y1, y2 + 1):
+        if y not in index:
+            continue
+
+        starts, indexes = index[y]
+        # parts starting at or before the right edge, nearest first
+        position = bisect_right(starts, x2) - 1
+        while position >= 0 and parts[indexes[position]][1][1][0] >= x1:
+            found.append(indexes[position])
+            position -= 1
+
+    # same order as overlapping_part_numbers(), the order of parts
+    return [parts[i][0] for i in sorted(found)]
+
 def find_connected_parts(symbols, parts):
     """Return list of part numbers that are connected via a symbol
 
@@ -75,9 +184,9 @@ def find_connected_parts(symbols, parts):
     # boxes that will be used to check for connected parts
     symbol_boxes = map(make_box, map(lambda x: x[1], symbols))
 
-    # map overlapping_part_numbers over symbol bounding boxes to get
-    # list of part numbers that are connected to each symbol
-    return map(lambda box: overlapping_part_numbers(box, parts), symbol_boxes)
+    # look up the part numbers that are connected to each symbol
+    index = index_parts(parts)
+    return map(lambda box: indexed_part_numbers(box, parts, index), symbol_boxes)
 
 def make_box(center):
     """Return a box ((x1,y1), (x2,y2)) that surrounds a center point (x, y).
@@ -98,6 +207,71 @@ def overlaps(box_a, box_b):
 
     return not (right_of or left_of or above or below)
 
+#
+# Streaming version
+# Only three rows of the schematic are kept: the row whose symbols are being
+# connected and the rows above and below it. Each row is scanned for numbers
+# once, when it is read, so a schematic of any height is one pass over the
+# file in constant memory.
+#
+SYMBOL_RE = re.compile(r'[^\.\d]')
+NUMBER_RE = re.compile(r'\d+')
+
+def scan_row(row: str) -> tuple[str, list[int], list[tuple[int]]]:
+    """Return (row, starts, numbers) where numbers are the (x1, x2, number)
+       of the numbers on row, in order, and starts their x1s.
+    """
+    numbers = [(m.start(), m.end() - 1, int(m.group())) for m in NUMBER_RE.finditer(row)]
+    return (row, [n[0] for n in numbers], numbers)
+
+def touching_numbers(scanned, x1, x2) -> list[int]:
+    """Return the numbers on a scanned row that overlap columns x1..x2"""
+    _, starts, numbers = scanned
+    position = bisect_right(starts, x2) - 1
+    found = []
+    while position >= 0 and numbers[position][1] >= x1:
+        found.append(numbers[position][2])
+        position -= 1
+
+    return found[::-1]
+
+def connected_in_row(above, current, below):
+    """Yield (symbol, [part numbers]) for each symbol on the current row"""
+    for match in SYMBOL_RE.finditer(current[0]):
+        x = match.start()
+        yield (match.group(), [number for row in (above, current, below)
+                               for number in touching_numbers(row, x - 1, x + 1)])
+
+def stream_connected(lines):
+    """Yield (symbol, [part numbers connected to it]) for every symbol in the
+       schematic, reading lines (e.g. an open file) one at a time.
+    """
+    above = current = scan_row('')
+    started = False
+    for line in lines:
+        below = scan_row(line.strip())
+        if started:
+            yield from connected_in_row(above, current, below)
+        above, current, started = current, below, True
+
+    if started:
+        yield from connected_in_row(above, current, scan_row(''))
+
+def stream_totals(filename: str) -> tuple[int, int]:
+    """Return (sum of part numbers, sum of gear ratios) in one pass over filename"""
+    part_sum = gear_sum = 0
+    try:
+        with open(filename, 'r', encoding='utf-8') as map_file:
+            for symbol, numbers in stream_connected(map_file):
+                part_sum += sum(numbers)
+                if symbol == '*' and len(numbers) == 2:
+                    gear_sum += numbers[0] * numbers[1]
+
+    except FileNotFoundError:
+        print(f'ERROR: file {filename} not found.')
+
+    return part_sum, gear_sum
+
 ## Debug and Print Utilities
 
 def print_symbols(symbols, engine_map=None):
@@ -134,10 +308,10 @@ def symbol_stats(symbols, parts):
         # W0640: Cell variable symbol defined in loop (cell-var-from-loop)
         # n_symbols = list(filter(lambda x: x[0] == symbol, symbols))
         # See partial(): https://docs.python.org/3/library/functools.html
-        n_symbols = filter(partial(lambda x, y: x[0] == y, symbol), symbols)
+        n_symbols = list(filter(partial(lambda x, y: x[0] == y, symbol), symbols))
         n_parts = find_connected_parts(n_symbols, parts)
         n_boxes = list(filter(lambda x: len(x) == 2, n_parts))
-        print(f'{symbol} occurs {len(list(n_symbols))} times. {len(n_boxes)} of which connect to 2 parts')
+        print(f'{symbol} occurs {len(n_symbols)} times. {len(n_boxes)} of which connect to 2 parts')
 
 #
 # Part 1
@@ -167,7 +341,7 @@ def gear_ratios(symbols, parts):
     # ^ occurs 0 times. 0 of which connect to 2 parts
     # & occurs 38 times. 0 of which connect to 2 parts
     # * occurs 367 times. 325 of which connect to 2 parts
-    symbol_stats(symbols, parts)
+    # (see symbol_stats(), main() -s)
 
     # filter symbols to get only "gear" symbols
     gear_symbols = list(filter(lambda x: x[0] == '*', symbols))
@@ -181,30 +355,85 @@ def gear_ratios(symbols, parts):
     return ratios
 
 
+def benchmark(side, seed=0):
+    """Print the time taken for each step on a generated side x side
+       schematic (stream is both parts, reading the file again), and for
+       the unindexed lookup when the map is small enough.
+    """
+    # pylint: disable=import-outside-toplevel
+    from generators import generate
+
+    with tempfile.NamedTemporaryFile('w', suffix='.txt') as file:
+        file.write(generate(3, (side / 140) ** 2, seed))
+        file.flush()
+
+        t0 = time.perf_counter()
+        engine_map = load_map(file.name)
+        symbols, parts = find_symbols(engine_map), find_parts(engine_map)
+        print(f'{side}x{side}: {len(symbols):,} symbols, {len(parts):,} parts '
+              f'loaded in {time.perf_counter() - t0:0.2f}s')
+
+        steps = [('part_numbers', lambda: sum(part_numbers(symbols, parts))),
+                 ('gear_ratios', lambda: sum(gear_ratios(symbols, parts))),
+                 ('stream', partial(stream_totals, file.name))]
+        if len(symbols) * len(parts) < 5 * 10**7:
+            steps.append(('unindexed', lambda: sum(chain(*(
+                overlapping_part_numbers(make_box(c), parts) for _, c in symbols)))))
+
+        for name, step in steps:
+            t0 = time.perf_counter()
+            answer = step()
+            print(f'{name:>12} {time.perf_counter() - t0:8.2f}s  {answer}')
+
 def main():
     """Main Routine"""
-    #engine_map = load_map('test-1.txt')  # 4361
-    engine_map = load_map('input.txt')  # 4361
-
-    symbols = find_symbols(engine_map)
-    #print('--- Symbols ---')
-    #print_symbols(symbols)
-
-    parts = find_parts(engine_map)
-    #print('--- Parts ---')
-    #print_parts(parts)
-
-    #
-    # Part 1
-    #
-    part_sum = sum(part_numbers(symbols, parts))
-    print(f'The sum of the connected part numbers is: {part_sum} (4631, 527446)')
-
-    #
-    # Part 2
-    #
-    gear_ratio_sum = sum(gear_ratios(symbols, parts))
-    print(f'The sum of the gear ratios is: {gear_ratio_sum} (467835, 73201705)')
-
-
-main()
+    parser = argparse.ArgumentParser()
+    parser.add_argument('-s', '--stats', action='store_true',
+                        help='print how often each symbol connects two parts')
+    parser.add_argument('-b', '--benchmark', type=int, metavar='SIDE',
+                        help='time a generated SIDE x SIDE schematic, e.g. 10000')
+    parser.add_argument('--stream', metavar='FILE',
+                        help='solve FILE in one pass, three rows at a time')
+    add_profile_arguments(parser)
+    args = parser.parse_args()
+
+    if args.benchmark:
+        benchmark(args.benchmark)
+        return
+
+    if args.stream:
+        with profiler(args.profile, args.profile_output):
+            part_sum, gear_ratio_sum = stream_totals(args.stream)
+            print(f'The sum of the connected part numbers is: {part_sum}')
+            print(f'The sum of the gear ratios is: {gear_ratio_sum}')
+        return
+
+    with profiler(args.profile, args.profile_output):
+        #engine_map = load_map('test-1.txt')  # 4361
+        engine_map = load_map('input.txt')  # 4361
+
+        symbols = find_symbols(engine_map)
+        #print('--- Symbols ---')
+        #print_symbols(symbols)
+
+        parts = find_parts(engine_map)
+        #print('--- Parts ---')
+        #print_parts(parts)
+
+        #
+        # Part 1
+        #
+        part_sum = sum(part_numbers(symbols, parts))
+        print(f'The sum of the connected part numbers is: {part_sum} (4631, 527446)')
+
+        if args.stats:
+            symbol_stats(symbols, parts)
+
+        #
+        # Part 2
+        #
+        gear_ratio_sum = sum(gear_ratios(symbols, parts))
+        print(f'The sum of the gear ratios is: {gear_ratio_sum} (467835, 73201705)')
+
+if __name__ == '__main__':
+    main()
@@ -4,37 +4,113 @@ Advent of Code 2023 - Day 4: Scratchcards
 Stephen Houser <stephenhouser@gmail.com>
 """
 
+import os
+import sys
 import re
+import random
 import argparse
+import unittest
+from array import array
+
+# shared modules (performance.py) live in the directory above
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from performance import add_profile_arguments, profiler    # pylint: disable=wrong-import-position
+
+class TestAOC(unittest.TestCase):
+    """Test Advent of Code"""
+
+    #
+    # Part One
+    #
+    def test_part1_example(self):
+        """Part 1 solution for test.txt"""
+        self.assertEqual(sum(map(Card.get_score, load_cards('test.txt'))), 13)
+
+    def test_part1_matches(self):
+        """Bulk loaded match counts"""
+        matches = load_card_matches('test.txt')
+        self.assertEqual(list(matches), [4, 2, 2, 1, 0, 0])
+        self.assertEqual(sum(map(match_score, matches)), 13)
+
+    def test_card(self):
+        """Numbers are kept as bitmasks"""
+        card = Card('Card 1: 41 48 83 86 17 | 83 86  6 31 17  9 48 53')
+        self.assertEqual((card.card_id, card.get_matches(), card.get_score()), (1, 4, 8))
+        self.assertEqual(mask_numbers(card.winning), [17, 41, 48, 83, 86])
+
+    #
+    # Part Two
+    #
+    def test_part2_example(self):
+        """Part 2 solution for test.txt"""
+        cards = load_cards('test.txt')
+        duplicate_cards(cards)
+        self.assertEqual(sum(map(Card.get_copies, cards)), 30)
+        self.assertEqual(count_copies(load_card_matches('test.txt')), 30)
+
+    def test_part2_big_counts(self):
+        """Copy counts past 2**64 are counted exactly"""
+        cards = [Card(f'Card {n}: 1 2 | 1 2 3') for n in range(1, 101)]
+        duplicate_cards(cards)
+        total = sum(map(Card.get_copies, cards))
+        self.assertGreater(total, 2**64)
+        self.assertEqual(count_copies([2] * 100), total)
+
+    def test_streaming(self):
+        """Ring buffer of pending copies gives both answers in one pass"""
+        self.assertEqual(stream_card_totals('test.txt'), (13, 30))
+        rng = random.Random(4)
+        matches = [rng.choice([0, 0, 1, 2, 3, 10, 40]) for _ in range(300)]
+        # the original solution on cards with those matches (numbers 50-90)
+        cards = [Card(f'Card {n}: 50 ' + ' '.join(map(str, range(51, 51 + m)))
+                      + ' | 1 ' + ' '.join(map(str, range(51, 51 + m))))
+                 for n, m in enumerate(matches, 1)]
+        self.assertEqual([card.get_matches() for card in cards], matches)
+        duplicate_cards(cards)
+        self.assertEqual(card_totals(matches, ring_size=2),
+                         (sum(map(Card.get_score, cards)),
+                          sum(map(Card.get_copies, cards))))
+
+
+CARD_RE = re.compile(r'Card\s+(\d+):([\d ]+)\|([\d ]+)')
+
+def number_mask(text: str) -> int:
+    """Return a bitmask with bit n set for each number n in text"""
+    mask = 0
+    for number in text.split():
+        mask |= 1 << int(number)
+    return mask
+
+def mask_numbers(mask: int) -> list[int]:
+    """Return the numbers (bits) set in a number_mask(), in order"""
+    return [n for n in range(mask.bit_length()) if mask >> n & 1]
+
+def match_score(matches: int) -> int:
+    """Return the score of a card with matches winning picks, 1, 2, 4, ..."""
+    return 1 << matches >> 1
 
 class Card:
-    """Class to represent a card in the elf lottery"""
+    """Class to represent a card in the elf lottery.
+       The winning numbers and picks are bitmasks (bit n for number n) so the
+       matches are the bits set in both.
+    """
+    __slots__ = ('card_id', 'winning', 'picks', 'matches', 'copies')
 
     def __init__(self, card_line):
-        self.card_id = None
-        self.winning = []
-        self.picks = []
-        self.score = None
-        self.matches = 0
+        card_match = CARD_RE.match(card_line)
+        self.card_id = int(card_match.group(1))
+        self.winning = number_mask(card_match.group(2))
+        self.picks = number_mask(card_match.group(3))
+        self.matches = (self.winning & self.picks).bit_count()
         self.copies = 1
-        self._parse_card_line(card_line)
-
-    def _compute_score(self):
-        # cache the score and matches computation
-        if not self.score or not self.matches:
-            card_winners = set(self.winning) & set(self.picks)
-            self.score = int(pow(2, len(card_winners)-1))
-            self.matches = len(card_winners)
 
     def get_matches(self):
         """Return the number of picks that match winning numbers."""
-        self._compute_score()
         return self.matches
 
     def get_score(self):
         """Return the score for this card."""
-        self._compute_score()
-        return self.score
+        return match_score(self.matches)
 
     def add_copies(self, copies):
         """Increase the number of copies of this card"""
@@ -44,38 +120,94 @@ class Card:
         """Return the number of copies of this card."""
         return self.copies
 
-    def _parse_card_line(self, card_line):
-        """Parse text description of card"""
-        card_match = re.match(r'Card\s+(\d+):([\d ]+)\|([\d ]+)', card_line)
-        self.card_id = int(card_match.group(1))
-        self.winning = list(map(int, re.findall(r'\d+', card_match.group(2))))
-        self.picks = list(map(int, re.findall(r'\d+', card_match.group(3))))
-
     def __repr__(self):
         """Return REPL representation of the card"""
         return str(self)
 
     def __str__(self):
         """Return string representation of the card."""
-        winn = ' '.join(map(str, self.winning))
-        pick = ' '.join(map(str, self.picks))
-        return f'Card {self.card_id}: {winn} | {pick} | score={self.score}, copies={self.copies}'
-
-def load_cards(filename: str) -> list[str]:
-    """Load ...
-        
-       filename: the file to read game descriptions from.
-       returns: a list of strings, one string for each row in the map
-    """
+        winn = ' '.join(map(str, mask_numbers(self.winning)))
+        pick = ' '.join(map(str, mask_numbers(self.picks)))
+        return f'Card {self.card_id}: {winn} | {pick} | score={self.get_score()}, copies={self.copies}'
+
+def load_cards(filename: str) -> list[Card]:
+    """Return the Cards in filename, one per line"""
     try:
         with open(filename, 'r', encoding='utf-8') as map_file:
-            return list(map(Card, map_file.readlines()))
+            return list(map(Card, map_file))
 
     except FileNotFoundError:
         print(f'ERROR: file {filename} not found.')
 
     return []
 
+def iter_card_matches(filename: str):
+    """Yield the number of matches on each card in filename, in order"""
+    try:
+        with open(filename, 'r', encoding='utf-8') as map_file:
+            for card_match in map(CARD_RE.match, map_file):
+                winning = number_mask(card_match.group(2))
+                yield (winning & number_mask(card_match.group(3))).bit_count()
+
+    except FileNotFoundError:
+        print(f'ERROR: file {filename} not found.')
+
+def load_card_matches(filename: str) -> array:
+    """Return the number of matches on each card in filename, in order, as
+       a compact array (one byte per card). Only the counts are kept so a
+       million cards take a megabyte rather than hundreds.
+    """
+    return array('B', iter_card_matches(filename))
+
+def count_copies(matches) -> int:
+    """Return the total number of cards (originals and copies) won with
+       cards that have the given numbers of matches.
+    """
+    copies = [1] * len(matches)     # counts outgrow any fixed width
+    for card_n, card_matches in enumerate(matches):
+        for card_copy in range(card_n + 1, min(card_n + 1 + card_matches, len(matches))):
+            copies[card_copy] += copies[card_n]
+
+    return sum(copies)
+
+#
+# Streaming version
+# A card with m matches adds its copies to each of the next m cards. Rather
+# than adding to m cards, the change is recorded where it starts (+copies on
+# the next card) and where it stops (-copies m+1 cards on) in a ring buffer
+# of differences, and a running total picks the changes up as cards are read.
+# Every card is O(1) work and only max matches + 2 counts are kept.
+#
+def card_totals(matches, ring_size=32) -> tuple[int, int]:
+    """Return (total score, total cards) for cards with the given numbers of
+       matches (any iterable, e.g. iter_card_matches()), in one pass.
+    """
+    ring = [0] * ring_size  # changes in copies won, ring[head] is this card
+    head = won = 0
+    total_score = total_cards = 0
+    for card_matches in matches:
+        won += ring[head]
+        ring[head] = 0
+        copies = 1 + won
+        total_score += match_score(card_matches)
+        total_cards += copies
+
+        if card_matches + 2 > len(ring):
+            # more matches than ever before, unroll and make room
+            ring = ring[head:] + ring[:head] + [0] * (card_matches + 2 - len(ring))
+            head = 0
+        if card_matches:
+            ring[(head + 1) % len(ring)] += copies
+            ring[(head + 1 + card_matches) % len(ring)] -= copies
+
+        head = (head + 1) % len(ring)
+
+    return total_score, total_cards
+
+def stream_card_totals(filename: str) -> tuple[int, int]:
+    """Return (total score, total cards) for filename reading one card at a time"""
+    return card_totals(iter_card_matches(filename))
+
 def duplicate_cards(cards):
     """Updates cards to reflect winning new cards.
     """
@@ -89,20 +221,31 @@ def main():
     """Main Routine, does all the work"""
     parser = argparse.ArgumentParser()
     parser.add_argument('filename', default='input.txt', nargs='+')
+    parser.add_argument('-s', '--stream', action='store_true',
+                        help='read one card at a time, for very large files')
+    add_profile_arguments(parser)
     args = parser.parse_args()
 
-    for filename in args.filename:
-        print(filename)
-        cards = load_cards(filename)
+    with profiler(args.profile, args.profile_output):
+        for filename in args.filename:
+            print(filename)
+            if args.stream:
+                total_score, total_cards = stream_card_totals(filename)
+                print(f'\tSum of scores: {total_score}')
+                print(f'\tTotal number of cards: {total_cards}')
+                print()
+                continue
 
-        total_score = sum(map(Card.get_score, cards))
-        print(f'\tSum of scores: {total_score}')
+            cards = load_cards(filename)
 
-        duplicate_cards(cards)
-        total_cards = sum(map(Card.get_copies, cards))
-        print(f'\tTotal number of cards: {total_cards}')
+            total_score = sum(map(Card.get_score, cards))
+            print(f'\tSum of scores: {total_score}')
+
+            duplicate_cards(cards)
+            total_cards = sum(map(Card.get_copies, cards))
+            print(f'\tTotal number of cards: {total_cards}')
 
-        print()
+            print()
 
 if __name__ == '__main__':
     main()
@@ -4,18 +4,140 @@ Advent of Code 2023 - Day 5: If You Give A Seed A Fertilizer
 Stephen Houser <stephenhouser@gmail.com>
 """
 
+import os
+import sys
 import re
+import math
+import time
+import random
 import argparse
+import tempfile
+import unittest
+import importlib.util
+from bisect import bisect_left, bisect_right
+from itertools import accumulate, chain
 from functools import partial
 
+# shared modules (performance.py) live in the directory above
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from performance import add_profile_arguments, profiler    # pylint: disable=wrong-import-position
+
+# numpy is optional, it is only imported by the *_array() batch functions
+HAVE_NUMPY = importlib.util.find_spec('numpy') is not None
+
+class TestAOC(unittest.TestCase):
+    """Test Advent of Code"""
+
+    #
+    # Part One
+    #
+    def test_part1_example(self):
+        """Part 1 solution for test.txt"""
+        (seeds, almanac) = load_almanac('test.txt')
+        locations = map(partial(plant_recursive, seed_type='seed', almanac=almanac), seeds)
+        self.assertEqual(min(locations), 35)
+        self.assertEqual(min(locate_many(seeds, almanac)), 35)
+        self.assertEqual(min(map(almanac.locate, seeds)), 35)
+
+    def test_compiled(self):
+        """Compiled segments agree with walking the maps one at a time"""
+        (seeds, almanac) = load_almanac('test.txt')
+        values = random.Random(5).sample(range(-10, 120), 100)
+        self.assertEqual(list(map(almanac.locate, values)),
+                         [plant_recursive(v, 'seed', almanac) for v in values])
+        self.assertEqual(almanac.locate(79, 'seed', 'soil'), 81)
+        locations = [almanac.locate_range(s, s + n) for (s, n) in pairwise(seeds)]
+        self.assertEqual(min(l[0] for r in locations for l in r), 46)
+
+    def test_compiled_changes(self):
+        """Compiled segments follow changes to the almanac and its maps"""
+        (_, almanac) = load_almanac('test.txt')
+        self.assertEqual(almanac.locate(79), 82)
+        almanac['soil'].planting_map.append((81, 82, 1000))
+        almanac['soil'].sort()
+        self.assertEqual(almanac.locate(79), plant_recursive(79, 'seed', almanac))
+        self.assertEqual(almanac.locate(79, 'seed', 'soil'), 81)
+        almanac.update(soil=almanac.pop('soil'))
+        self.assertEqual(almanac.locate(79), plant_recursive(79, 'seed', almanac))
+        identity = PlantingMap('seed', 'soil')
+        del almanac['seed']
+        almanac.setdefault('seed', identity)
+        self.assertEqual(almanac.locate(79, 'seed', 'soil'), 79)
+        almanac.clear()
+        self.assertRaises(KeyError, almanac.locate, 79)
+
+    #
+    # Part Two
+    #
+    def test_part2_example(self):
+        """Part 2 solution for test.txt"""
+        (seeds, almanac) = load_almanac('test.txt')
+        self.assertEqual(locate_seeds(seed_ranges(seeds), 'seed', almanac)[0][0], 46)
+
+    def test_part2_inverse(self):
+        """Binary search over location using the preimage of the maps"""
+        (seeds, almanac) = load_almanac('test.txt')
+        self.assertEqual(lowest_location(seed_ranges(seeds), almanac), 46)
+        self.assertEqual(almanac.preimage([(46, 47)]), [(82, 83)])
+
+    def test_preimage(self):
+        """Every value in the preimage converts into the range"""
+        plant_map = PlantingMap.from_text('seed-to-soil map:\n50 98 2\n52 50 48\n0 0 3')
+        ranges = plant_map.preimage(49, 53)
+        self.assertEqual(sorted(ranges), [(49, 50), (50, 51), (98, 100)])
+        self.assertEqual({plant_map.convert(v) for (s, e) in ranges for v in range(s, e)},
+                         {49, 50, 51, 52})
+
+    @unittest.skipUnless(HAVE_NUMPY, 'numpy is not installed')
+    def test_locate_array(self):
+        """Batch conversion with numpy agrees with one seed at a time"""
+        (seeds, almanac) = load_almanac('test.txt')
+        self.assertEqual(min(locate_array(seeds, almanac)), 35)
+        values = random.Random(5).sample(range(200), 100)
+        self.assertEqual(locate_array(values, almanac).tolist(),
+                         list(map(almanac.locate, values)))
+
+    def test_ranges(self):
+        """Ranges split at both ends of a mapping, and coalesce"""
+        plant_map = PlantingMap.from_text('seed-to-soil map:\n100 10 5')
+        self.assertEqual(apply_mappings([(0, 20)], plant_map),
+                         [(0, 10), (15, 20), (100, 105)])
+        self.assertEqual(coalesce([(5, 8), (0, 3), (3, 4), (7, 9)]), [(0, 4), (5, 9)])
+
+        (_, almanac) = load_almanac('test.txt')
+        rng = random.Random(5)
+        for _ in range(20):
+            blocks = [(s, s + rng.randint(1, 20)) for s in rng.sample(range(100), 3)]
+            expected = {almanac.locate(v) for (s, e) in blocks for v in range(s, e)}
+            found = {v for (s, e) in locate_seeds(blocks, 'seed', almanac) for v in range(s, e)}
+            self.assertEqual(found, expected)
+
+    def test_convert(self):
+        """Range ends are exclusive, lookups agree with a linear scan"""
+        plant_map = PlantingMap.from_text('seed-to-soil map:\n50 98 2\n52 50 48')
+        self.assertEqual(list(map(plant_map.convert, [49, 50, 97, 98, 99, 100])),
+                         [49, 52, 99, 50, 51, 100])
+        values = sorted(random.Random(5).sample(range(120), 60))
+        self.assertEqual(plant_map.convert_many(values),
+                         [plant_map.convert(v) for v in values])
+
+
 class PlantingMap:
     """Map of plantings from domain->range"""
 
+    revision = 0  # bumped by every sort(), so compiled Almanac chains can tell
+
+
     def __init__(self, source, destination):
         """Initialize a PlantingMap with source and destination"""
         self.source = source
         self.destination = destination
-        self.planting_map = []
+        self.planting_map = []  # (start, end, offset), sorted by start
+        self.starts = []        # start of each mapping, for bisect
+        self.images = []        # (start, end, -offset) where mappings land, sorted
+        self.image_starts = []
+        self.image_ends = []    # running maximum of image ends, images may overlap
+        self._arrays = None     # (starts, ends, offsets) numpy arrays
 
     @classmethod
     def from_text(cls, map_text):
@@ -33,17 +155,110 @@ class PlantingMap:
             # if the seed value is in the domain to get it in the range
             plant_map.planting_map.append((map_domain, map_domain+length, offset))
 
+        plant_map.sort()
         return plant_map
 
+    def sort(self):
+        """Sort the mappings by start and rebuild the boundaries for bisect.
+           Call after changing planting_map.
+        """
+        self.planting_map.sort()
+        self.starts = [mapping[0] for mapping in self.planting_map]
+        self.images = sorted((start + offset, end + offset, -offset)
+                             for (start, end, offset) in self.planting_map)
+        self.image_starts = [image[0] for image in self.images]
+        self.image_ends = list(accumulate((image[1] for image in self.images), max))
+        self._arrays = None
+        PlantingMap.revision += 1
+
     # map() would be a better name, but avoiding built-in names
     def convert(self, input_value):
         """Return the mapped input value. If no ranges match, return input"""
-        for mapping in self.planting_map:
-            if mapping[0] <= input_value <= mapping[1]:
-                return input_value + mapping[2]
+        # the last mapping starting at or before input_value (end is exclusive)
+        index = bisect_right(self.starts, input_value) - 1
+        if index >= 0 and input_value < self.planting_map[index][1]:
+            return input_value + self.planting_map[index][2]
 
         return input_value
 
+    def convert_many(self, input_values):
+        """Return the mapped values for a sorted list of input values, in the
+           same order, walking the values and mappings together once.
+        """
+        converted = []
+        mappings = iter(self.planting_map)
+        mapping = next(mappings, None)
+        for value in input_values:
+            while mapping and mapping[1] <= value:
+                mapping = next(mappings, None)
+
+            if mapping and mapping[0] <= value:
+                converted.append(value + mapping[2])
+            else:
+                converted.append(value)
+
+        return converted
+
+    def convert_array(self, input_values):
+        """Return the mapped values for a numpy int64 array of input values,
+           any order, with one searchsorted and a gather of the offsets.
+        """
+        import numpy as np  # pylint: disable=import-outside-toplevel
+
+        if not self.planting_map:
+            return input_values
+        if self._arrays is None:
+            self._arrays = tuple(np.array(column, dtype=np.int64)
+                                 for column in zip(*self.planting_map))
+        (starts, ends, offsets) = self._arrays
+
+        # the last mapping starting at or before each value, as in convert()
+        index = np.searchsorted(starts, input_values, side='right') - 1
+        inside = index >= 0
+        index[~inside] = 0
+        inside &= input_values < ends[index]
+        return input_values + np.where(inside, offsets[index], 0)
+
+    def pieces(self, start, end):
+        """Yield (start, end, offset) pieces that split the values [start, end)
+           at the mapping boundaries. Values no mapping covers have offset 0.
+        """
+        mappings = self.planting_map
+        index = max(bisect_right(self.starts, start) - 1, 0)
+        while index < len(mappings) and mappings[index][0] < end:
+            (map_start, map_end, offset) = mappings[index]
+            index += 1
+            if map_end <= start:
+                continue
+
+            if start < map_start:
+                yield (start, map_start, 0)
+                start = map_start
+
+            piece_end = min(end, map_end)
+            yield (start, piece_end, offset)
+            start = piece_end
+
+        if start < end:
+            yield (start, end, 0)
+
+    def preimage(self, start, end):
+        """Return the ranges of values that convert into [start, end).
+           Values no mapping covers convert to themselves, and more than one
+           value may convert to the same one, so this is a list of ranges.
+        """
+        ranges = [(p_start, p_end) for (p_start, p_end, offset)
+                  in self.pieces(start, end) if offset == 0]
+
+        # only images ending after start and starting before end can overlap
+        first = bisect_right(self.image_ends, start)
+        last = bisect_left(self.image_starts, end)
+        for (i_start, i_end, offset) in self.images[first:last]:
+            if offset and start < i_end:    # offset 0 is one of the pieces
+                ranges.append((max(start, i_start) + offset, min(end, i_end) + offset))
+
+        return ranges
+
     def __repr__(self):
         """Return the REPL version of object"""
         return str(self)
@@ -53,14 +268,135 @@ class PlantingMap:
         return f'PlantingMap: {self.source}->{self.destination}, {self.planting_map}'
 
 
+class Almanac(dict):
+    """PlantingMaps keyed by their source, { 'seed': PlantingMap(), ... }.
+       The chain of maps from one type to another is compiled, on first use,
+       into a single sorted list of (start, end, offset) segments so a value
+       is converted with one bisect however many maps are in between.
+    """
+
+    def __init__(self, *args, **kwargs):
+        """Initialize an Almanac, same arguments as dict"""
+        super().__init__(*args, **kwargs)
+        self._compiled = {}
+        self._revision = PlantingMap.revision
+
+    # every way of changing the dict forgets the compiled segments
+    def __setitem__(self, key, value):
+        """Add or replace a PlantingMap, forgetting compiled segments"""
+        super().__setitem__(key, value)
+        self._compiled.clear()
+
+    def __delitem__(self, key):
+        """Remove a PlantingMap"""
+        super().__delitem__(key)
+        self._compiled.clear()
+
+    def __ior__(self, other):
+        """Merge in PlantingMaps, almanac |= other"""
+        self._compiled.clear()
+        return super().__ior__(other)
+
+    def update(self, *args, **kwargs):
+        """Add or replace PlantingMaps, same arguments as dict"""
+        super().update(*args, **kwargs)
+        self._compiled.clear()
+
+    def setdefault(self, key, default=None):
+        """Return the PlantingMap for key, adding default if missing"""
+        self._compiled.clear()
+        return super().setdefault(key, default)
+
+    def pop(self, *args):
+        """Remove and return a PlantingMap"""
+        self._compiled.clear()
+        return super().pop(*args)
+
+    def popitem(self):
+        """Remove and return the last (source, PlantingMap)"""
+        self._compiled.clear()
+        return super().popitem()
+
+    def clear(self):
+        """Remove every PlantingMap"""
+        super().clear()
+        self._compiled.clear()
+
+    def compile(self, source='seed', destination='location'):
+        """Return (segments, starts) converting source directly to destination.
+           segments cover every value, (-inf, inf), in order with no gaps.
+           A PlantingMap changed in place is picked up once it is sort()ed.
+        """
+        if self._revision != PlantingMap.revision:
+            self._compiled.clear()
+            self._revision = PlantingMap.revision
+
+        if (source, destination) not in self._compiled:
+            segments = [(-math.inf, math.inf, 0)]
+            seed_type = source
+            while seed_type != destination:
+                plant_map = self[seed_type]
+                composed = []
+                for (start, end, offset) in segments:
+                    # split where the values land in this map, then move
+                    # the pieces back to the source's values
+                    for (p_start, p_end, p_offset) in plant_map.pieces(start + offset,
+                                                                       end + offset):
+                        segment = (p_start - offset, p_end - offset, offset + p_offset)
+                        if composed and composed[-1][2] == segment[2]:
+                            # joins the previous segment, same offset
+                            segment = (composed.pop()[0], segment[1], segment[2])
+                        composed.append(segment)
+
+                segments = composed
+                seed_type = plant_map.destination
+
+            self._compiled[(source, destination)] = (
+                segments, [segment[0] for segment in segments])
+
+        return self._compiled[(source, destination)]
+
+    def locate(self, seed, source='seed', destination='location'):
+        """Return where seed ends up, one bisect into the compiled segments"""
+        segments, starts = self.compile(source, destination)
+        return seed + segments[bisect_right(starts, seed) - 1][2]
+
+    def locate_range(self, start, end, source='seed', destination='location'):
+        """Return the (start, end) ranges that seeds [start, end) end up in"""
+        segments, starts = self.compile(source, destination)
+        locations = []
+        index = bisect_right(starts, start) - 1
+        while index < len(segments) and segments[index][0] < end:
+            (s_start, s_end, offset) = segments[index]
+            locations.append((max(start, s_start) + offset, min(end, s_end) + offset))
+            index += 1
+
+        return locations
+
+    def preimage(self, ranges, source='location', destination='seed'):
+        """Return the coalesced ranges of destination values that end up in
+           the source ranges, walking the maps backwards.
+        """
+        by_destination = {plant_map.destination: plant_map for plant_map in self.values()}
+        blocks = coalesce(ranges)
+        seed_type = source
+        while seed_type != destination:
+            plant_map = by_destination[seed_type]
+            blocks = coalesce(chain.from_iterable(plant_map.preimage(*block)
+                                                  for block in blocks))
+            seed_type = plant_map.source
+
+        return blocks
+
+
 def load_almanac(filename: str):
     """Load initial seeds to be planted and almanac from the given file
         
        filename: the file to read game descriptions from.
        returns: tuple (seeds, almanac) which is ([list], {dict})
     """
-    seeds = []      # 79, 14, 55, 13
-    almanac = {}    # keyed by input { input: PlantingMap(), ... }
+    seeds = []          # 79, 14, 55, 13
+    almanac = Almanac() # keyed by input { input: PlantingMap(), ... }
     try:
         with open(filename, 'r', encoding='utf-8') as file:
             almanac_text = file.read().split('\n\n')
@@ -89,92 +425,108 @@ def plant_recursive(seed, seed_type, almanac):
     plant_map = almanac[seed_type]
     return plant_recursive(plant_map.convert(seed), plant_map.destination, almanac)
 
-def apply_mapping(block, mapping):
-    """Returns a set of domains mapped onto mapping
-        domain (start, end)
-        mapping start, end, offset
-        returns mapped, leftover
-
-        domain either gets mapped or left over
+def locate_many(seeds, almanac):
+    """Return the locations of many seeds, a map at a time. The seeds are
+       sorted before each map so one sweep converts them all.
     """
-    # block is the seed range we are considering
-    # mapping is the plant-soil or what-what mapping
-    TOP = 1
-    BOTTOM = 0
-
-    mappings = []       # our result
-    offset = mapping[2] # offset for mapping to add if we map
-
-    if block[TOP] < mapping[BOTTOM] or mapping[TOP] < block[BOTTOM]:
-        # outside domain, leave alone, check next range
-        return (None, block)
-
-    # completely enclosed in domain of mapping, save it as mapped
-    if mapping[BOTTOM] <= block[BOTTOM] and block[TOP] <= mapping[TOP]:
-        return (((block[BOTTOM]+offset, block[TOP]+offset), ), None)
+    values = sorted(seeds)
+    seed_type = 'seed'
+    while seed_type != 'location':
+        plant_map = almanac[seed_type]
+        values = sorted(plant_map.convert_many(values))
+        seed_type = plant_map.destination
+
+    return values
+
+def locate_array(seeds, almanac):
+    """Return a numpy int64 array with the locations of seeds (an array or
+       a list), converting all of them through one map at a time.
+    """
+    import numpy as np  # pylint: disable=import-outside-toplevel
 
-    # split bottom part at domain[0], map the overlap, keep trying on the extra
-    if block[BOTTOM] < mapping[BOTTOM] and block[TOP] <= mapping[TOP]:
-        mappings.append((mapping[BOTTOM]+offset, block[TOP]+offset))
-        block = (block[BOTTOM], mapping[BOTTOM]-1)
+    values = np.asarray(seeds, dtype=np.int64)
+    seed_type = 'seed'
+    while seed_type != 'location':
+        plant_map = almanac[seed_type]
+        values = plant_map.convert_array(values)
+        seed_type = plant_map.destination
 
-    # split top part at domain[1], map the overlap, keep trying on the extra
-    if mapping[BOTTOM] < block[BOTTOM] and mapping[TOP] <= block[TOP]:
-        mappings.append((block[BOTTOM]+offset, mapping[1]+offset-1))
-        block = (mapping[TOP], block[TOP])
+    return values
 
-    return mappings, block
+#
+# Part Two, ranges of seeds
+# Ranges are (start, end) with the end excluded. Each map splits a range at
+# its boundaries and moves the pieces, then the ranges are coalesced so the
+# number carried to the next map stays small.
+#
+def coalesce(ranges):
+    """Return ranges sorted with overlapping and adjacent ranges merged"""
+    merged = []
+    for (start, end) in sorted(ranges):
+        if merged and start <= merged[-1][1]:
+            if merged[-1][1] < end:
+                merged[-1] = (merged[-1][0], end)
+        else:
+            merged.append((start, end))
+
+    return merged
 
 def apply_mappings(p_blocks, plant_map):
     """Returns the result of applying all the mappings for a plant map
 
        p_blocks: blocks to map [(x1, y1), (x2, y2), ...]
-       returns: all the possible ranged p_blocks might end up in
+       returns: all the ranges p_blocks end up in, coalesced
             [(x1, y1), (x2, y2), ...]
     """
-    blocks = list(p_blocks)
-    print('\nBLOCKS\n', blocks, '==>\n')
-
-    mapped_blocks = []
-    while len(blocks) > 0:
-        # pop the next block to map
-        block = blocks.pop()
-        print(f'block {block}')
-
-        # for each range (mapping) in the planting map
-        for mapping in plant_map.planting_map:
-            # we get back possibly two parts
-            # mapped -> what was remapped
-            # block  -> what maps stright through with no change in numbers
-            mapped, block = apply_mapping(block, mapping)
-
-            print(f'\tapply {mapping} {mapped} : {block}')
-            # add the part that got mapped to our result
-            if mapped:
-                mapped_blocks.extend(mapped)
-
-            # if there's nothing left, we are done
-            if not block:
-                break
-
-        # append the part that did not get mapped, if any
-        if block:
-            mapped_blocks.append(block)
-
-    print('\t', mapped_blocks, '\n')
-    return mapped_blocks
+    return coalesce((start + offset, end + offset)
+                    for block in p_blocks
+                    for (start, end, offset) in plant_map.pieces(*block))
 
 def locate_seeds(seed_blocks, seed_type, almanac):
-    """Returns last of locations (ranges) that seeds from seed_blocks 
-       will end up
+    """Returns the sorted list of location ranges that seeds from
+       seed_blocks will end up in
     """
-    if seed_type == 'location':
-        return seed_blocks
+    blocks = coalesce(seed_blocks)
+    while seed_type != 'location':
+        planting_map = almanac[seed_type]
+        blocks = apply_mappings(blocks, planting_map)
+        seed_type = planting_map.destination
+
+    return blocks
+
+def overlaps(ranges, others):
+    """Return True if any of the coalesced ranges overlaps one of others"""
+    others = iter(others)
+    other = next(others, None)
+    for (start, end) in ranges:
+        while other and other[1] <= start:
+            other = next(others, None)
+        if not other:
+            return False
+        if other[0] < end:
+            return True
+
+    return False
+
+def lowest_location(seed_blocks, almanac):
+    """Returns the lowest location of any seed in seed_blocks by binary
+       search over locations, for the lowest L where the seeds that land in
+       [0, L] include one of seed_blocks. Locations are not negative.
+    """
+    seeds = coalesce(seed_blocks)
+    low, high = 0, almanac.locate(seeds[0][0])
+    while low < high:
+        middle = (low + high) // 2
+        if overlaps(almanac.preimage([(0, middle + 1)]), seeds):
+            high = middle
+        else:
+            low = middle + 1
+
+    return low
 
-    planting_map = almanac[seed_type]
-    return locate_seeds(apply_mappings(seed_blocks, planting_map),
-                        planting_map.destination,
-                        almanac)
+def seed_ranges(seeds):
+    """Return the (start, end) seed ranges described by (start, length) pairs"""
+    return [(seed, seed + length) for (seed, length) in pairwise(seeds)]
 
 def pairwise(things):
     """Return a list of pairs from list.
@@ -183,40 +535,90 @@ def pairwise(things):
     thing_iter = iter(things)
     return zip(thing_iter, thing_iter)
 
+def compiled_minimum(ranges, almanac):
+    """Returns the lowest location of ranges using the compiled segments"""
+    return min(locations[0] for (start, end) in ranges
+               for locations in almanac.locate_range(start, end))
+
+def print_steps(title, steps):
+    """Print the time taken and answer of each (name, step) in steps"""
+    print(title)
+    for name, step in steps:
+        t0 = time.perf_counter()
+        answer = step()
+        print(f'{name:>12} {time.perf_counter() - t0:8.4f}s  {answer}')
+
+def benchmark(scale, seed=0, count=20_000):
+    """Print the time taken to find the lowest location of a generated
+       almanac for three workloads. Part 2's few wide seed ranges are
+       fastest with the forward interval engine (used by main). The
+       compiled segments pay off for many single seeds (part 1) or many
+       short ranges, where each lookup is one bisect.
+    """
+    # pylint: disable=import-outside-toplevel
+    from generators import generate
+
+    with tempfile.NamedTemporaryFile('w', suffix='.txt') as file:
+        file.write(generate(5, scale, seed))
+        file.flush()
+        (seeds, almanac) = load_almanac(file.name)
+
+    t0 = time.perf_counter()
+    segments, _ = almanac.compile()
+    print(f'x{scale:g}: {sum(len(m.planting_map) for m in almanac.values()):,} '
+          f'mappings compiled into {len(segments):,} segments '
+          f'in {time.perf_counter() - t0:0.4f}s')
+
+    ranges = seed_ranges(seeds)
+    print_steps(f'part 2, {len(ranges):,} seed ranges',
+                [('forward', lambda: locate_seeds(ranges, 'seed', almanac)[0][0]),
+                 ('inverse', partial(lowest_location, ranges, almanac)),
+                 ('compiled', partial(compiled_minimum, ranges, almanac))])
+
+    rng = random.Random(seed)
+    points = [rng.randrange(2**32) for _ in range(count)]
+    print_steps(f'{count:,} seeds',
+                [('each map', lambda: min(plant_recursive(p, 'seed', almanac)
+                                          for p in points)),
+                 ('sorted', lambda: locate_many(points, almanac)[0]),
+                 ('compiled', lambda: min(map(almanac.locate, points)))])
+
+    short = [(p, p + 1000) for p in points]
+    print_steps(f'{count:,} ranges of 1,000 seeds',
+                [('forward', lambda: locate_seeds(short, 'seed', almanac)[0][0]),
+                 ('compiled', partial(compiled_minimum, short, almanac))])
+
 def main():
     """Main Routine, does all the work"""
     parser = argparse.ArgumentParser()
-    parser.add_argument('filename', default='test.txt', nargs='+')
+    parser.add_argument('filename', default=['test.txt'], nargs='*')
+    parser.add_argument('-b', '--benchmark', type=float, metavar='SCALE',
+                        help='time the ways of locating seeds on a generated almanac')
+    add_profile_arguments(parser)
     args = parser.parse_args()
 
-    for filename in args.filename:
-        print(filename)
-        (seeds, almanac) = load_almanac(filename)
-
-        #
-        # Part One
-        #
-        locations = map(
-            partial(plant_recursive, seed_type='seed', almanac=almanac),
-            seeds)
-        print(f'\tPart 1: The minimim location for planting is {min(locations)}')
-
-        #
-        # Part Two
-        #
-        min_location = None
-        for (seed, length) in list(pairwise(seeds))[2:3]:
-            locations = locate_seeds([(seed, seed+length)], 'seed', almanac)
-            # get first element of each range
-            local_minimum = min(map(lambda x: x[0], locations))
-            #print(locations)
-
-            if min_location is None:
-                min_location = local_minimum
-            else:
-                min_location = min(min_location, local_minimum)
-
-        print(f'\tPart 2: The minimim location for planting is {min_location}')
+    if args.benchmark:
+        benchmark(args.benchmark)
+        return
+
+    with profiler(args.profile, args.profile_output):
+        for filename in args.filename:
+            print(filename)
+            (seeds, almanac) = load_almanac(filename)
+
+            #
+            # Part One
+            #
+            min_location = min(map(almanac.locate, seeds))
+            print(f'\tPart 1: The minimim location for planting is {min_location}')
+
+            #
+            # Part Two
+            #
+            # location ranges are sorted, the first starts at the minimum
+            locations = locate_seeds(seed_ranges(seeds), 'seed', almanac)
+            min_location = locations[0][0]
+            print(f'\tPart 2: The minimim location for planting is {min_location}')
 
 if __name__ == '__main__':
     main()
@@ -4,12 +4,88 @@ Advent of Code 2023 - Day 6: Wait For It
 Stephen Houser <stephenhouser@gmail.com>
 """
 
+import os
+import sys
 import re
 import argparse
 import time
 import math
-from functools import reduce, wraps
-import multiprocessing
+import random
+import timeit
+import unittest
+import importlib.util
+from functools import reduce, partial, wraps
+
+# shared modules (performance.py) live in the directory above
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from performance import add_profile_arguments, profiler    # pylint: disable=wrong-import-position
+
+# numpy is optional, race_times_batch() uses it when it is installed
+HAVE_NUMPY = importlib.util.find_spec('numpy') is not None
+
+# largest race time and distance where race_time**2 and 4*distance fit in
+# int64 (4 * 2**61 is 2**63, one past the largest int64)
+INT64_RACE_TIME = 3_000_000_000
+INT64_DISTANCE = 2**61 - 1
+
+
+class TestAOC(unittest.TestCase):
+    """Test Advent of Code"""
+
+    #
+    # Part One
+    #
+    def test_part1_example(self):
+        """Part 1 solution for test.txt"""
+        races = load_file('test.txt')
+        self.assertEqual(list(map(race_times_exact, races)), [4, 8, 9])
+        self.assertEqual(reduce(lambda a, c: c * a, race_times_batch(*zip(*races)), 1), 288)
+
+    #
+    # Part Two
+    #
+    def test_part2_example(self):
+        """Part 2 solution for test.txt"""
+        self.assertEqual(race_times_exact(load_race_2('test.txt')[0]), 71503)
+
+    def test_exact(self):
+        """Integer solver agrees with brute force, and where floats do not"""
+        for race_time in range(40):
+            for distance in range(race_time * race_time // 4 + 2):
+                race = (distance, race_time)
+                self.assertEqual(race_times_exact(race), race_times_brute(race))
+
+        race = (49_889_210_670_065_150, 634_256_200)
+        self.assertEqual(race_times_exact(race), 450_248_915)
+        self.assertNotEqual(race_times_quadratic(race), 450_248_915)
+
+    def test_batch(self):
+        """Batches agree with one race at a time, in and out of int64"""
+        for magnitude in (6, 15):
+            races = random_races(random.Random(6), 1000, magnitude)
+            self.assertEqual(race_times_batch(*zip(*races)),
+                             list(map(race_times_exact, races)))
+
+    def test_batch_int64_limit(self):
+        """A distance of 2**61 is past the int64 limit, one less is not"""
+        races = [(2**61, INT64_RACE_TIME), (2**61 - 1, INT64_RACE_TIME), (2**61, 2**32)]
+        self.assertEqual(race_times_batch(*zip(*races)), list(map(race_times_exact, races)))
+
+    def test_batch_mixed(self):
+        """Races past int64 in the middle of a batch keep their place"""
+        races = random_races(random.Random(25), 200, 6)
+        races[10] = (2**61, 2**32)
+        races[50] = (10**30, 10**20)
+        races[51] = (-5, 10)
+        races[199] = (3, INT64_RACE_TIME + 1)
+        self.assertEqual(race_times_batch(*zip(*races)), list(map(race_times_exact, races)))
+        self.assertEqual(race_times_batch([], []), [])
+
+    @unittest.skipUnless(HAVE_NUMPY, 'numpy is not installed')
+    def test_numpy_int64_limit(self):
+        """numpy is exact up to the int64 limits"""
+        races = [(INT64_DISTANCE, INT64_RACE_TIME), (0, INT64_RACE_TIME), (2**60, INT64_RACE_TIME)]
+        self.assertEqual(race_times_numpy(*zip(*races)), list(map(race_times_exact, races)))
 
 def load_file(filename: str):
     """Load lines from file into a list of ITEMS
@@ -117,41 +193,181 @@ def race_times_quadratic(race):
     #print(f'math d1={d1:.2f}, d2={d2:.2f} a={math.ceil(d2)-math.floor(d1)-1}')
     return math.ceil(d2) - math.floor(d1) - 1
 
+def race_times_exact(race):
+    """Return the number of hold times that beat the race distance, solving
+       the quadratic above with integers only. isqrt() gives the lower root
+       to within one, which is corrected by checking the boundary.
+    """
+    (distance, race_time) = race
+    discriminant = race_time * race_time - 4 * distance
+    if discriminant <= 0:
+        return 0
+
+    # first winning hold time, distance rises until race_time // 2
+    low = (race_time - math.isqrt(discriminant)) // 2
+    while low <= race_time // 2 and low * (race_time - low) <= distance:
+        low += 1
+    while low > 0 and (low - 1) * (race_time - low + 1) > distance:
+        low -= 1
+
+    # winners are symmetric, low to race_time - low
+    return max(race_time - 2 * low + 1, 0)
+
+def race_times_numpy(distances, race_times):
+    """Return the numbers of winning hold times for many races with numpy.
+       Every race time must be within 0..INT64_RACE_TIME and every distance
+       within 0..INT64_DISTANCE, race_times_batch() sends the rest elsewhere.
+    """
+    import numpy as np  # pylint: disable=import-outside-toplevel
+
+    distance = np.asarray(distances, dtype=np.int64)
+    race_time = np.asarray(race_times, dtype=np.int64)
+
+    # the float square root is close, step the boundary until it is exact
+    discriminant = race_time * race_time - 4 * distance
+    root = np.sqrt(np.maximum(discriminant, 0).astype(np.float64)).astype(np.int64)
+    low = (race_time - root) // 2
+    while True:
+        losing = (low <= race_time // 2) & (low * (race_time - low) <= distance)
+        if not losing.any():
+            break
+        low += losing
+    while True:
+        winning = (low > 0) & ((low - 1) * (race_time - low + 1) > distance)
+        if not winning.any():
+            break
+        low -= winning
+
+    counts = np.maximum(race_time - 2 * low + 1, 0)
+    return np.where(discriminant > 0, counts, 0).tolist()
+
+def race_times_batch(distances, race_times):
+    """Return the number of winning hold times for each race, given the
+       distances and race times as sequences (lists or arrays) of the same
+       length. With numpy installed the races that fit in int64 are solved
+       by race_times_numpy() and only the others by race_times_exact(),
+       without numpy every race is solved by race_times_exact().
+    """
+    if not HAVE_NUMPY:
+        return list(map(race_times_exact, zip(distances, race_times)))
+
+    import numpy as np  # pylint: disable=import-outside-toplevel
+
+    try:
+        distance = np.asarray(distances, dtype=np.int64)
+        race_time = np.asarray(race_times, dtype=np.int64)
+    except OverflowError:
+        # some values are past int64 itself, compare them as Python integers
+        distance = np.asarray(distances, dtype=object)
+        race_time = np.asarray(race_times, dtype=object)
+
+    fits = ((race_time >= 0) & (race_time <= INT64_RACE_TIME)
+            & (distance >= 0) & (distance <= INT64_DISTANCE))
+    if fits.all():
+        return race_times_numpy(distance, race_time)
+
+    # solve each side on its own then put the counts back in race order,
+    # outliers are solved as Python integers (an int64 race_time squared
+    # could overflow) and their counts may be past int64, hence objects
+    counts = np.zeros(len(fits), dtype=object)
+    counts[fits] = race_times_numpy(distance[fits].astype(np.int64),
+                                    race_time[fits].astype(np.int64))
+    outliers = np.flatnonzero(~fits)
+    counts[outliers] = [race_times_exact((int(distance[i]), int(race_time[i])))
+                        for i in outliers.tolist()]
+    return counts.tolist()
+
+def random_races(rng, count, magnitude):
+    """Return count (distance, race_time) races with race times of about
+       10**magnitude, and distances at or next to a whole hold time.
+    """
+    races = []
+    for _ in range(count):
+        race_time = rng.randrange(10**magnitude, 10**(magnitude + 1))
+        hold = rng.randrange(race_time // 2)
+        races.append((hold * (race_time - hold) + rng.choice((-1, 0, 1)), race_time))
+
+    return races
+
+def benchmark(count, magnitudes=(1, 3, 5, 6, 9, 12, 15, 18), seed=0):
+    """Print the time per race of each solver for race times of increasing
+       magnitude (the brute force ones only up to 10**6), then for count
+       races at once. 'wrong' marks answers that differ from the exact one.
+    """
+    rng = random.Random(seed)
+    solvers = [('o1', race_times_o1), ('brute', race_times_brute),
+               ('quadratic', race_times_quadratic), ('exact', race_times_exact)]
+    for magnitude in magnitudes:
+        race = random_races(rng, 1, magnitude)[0]
+        answer = race_times_exact(race)
+        print(f'race time 10**{magnitude}')
+        for name, solver in solvers:
+            if name in ('o1', 'brute') and magnitude > 6:
+                continue
+
+            (number, elapsed) = timeit.Timer(partial(solver, race)).autorange()
+            flag = '' if solver(race) == answer else '  wrong'
+            print(f'{name:>12} {elapsed / number * 1e6:12.2f}us{flag}')
+
+    batch = 'numpy' if HAVE_NUMPY else 'python'
+    for magnitude in (6, 15):
+        races = random_races(rng, count, magnitude)
+        columns = tuple(zip(*races))
+        answers = list(map(race_times_exact, races))
+        print(f'{count:,} races, race time 10**{magnitude}')
+        for name, solve in [('quadratic', lambda: list(map(race_times_quadratic, races))),
+                            ('exact', lambda: list(map(race_times_exact, races))),
+                            (f'batch ({batch})', lambda: race_times_batch(*columns))]:
+            t0 = time.perf_counter()
+            counts = solve()
+            elapsed = time.perf_counter() - t0
+            wrong = sum(c != a for c, a in zip(counts, answers))
+            print(f'{name:>16} {elapsed:8.4f}s' + (f'  {wrong:,} wrong' if wrong else ''))
+
 def main():
     """Main Routine, does all the work"""
     parser = argparse.ArgumentParser()
-    parser.add_argument('filename', default='input.txt', nargs='+')
+    parser.add_argument('filename', default=['input.txt'], nargs='*')
+    parser.add_argument('-b', '--benchmark', type=int, metavar='COUNT',
+                        help='time the solvers, with batches of COUNT races')
+    add_profile_arguments(parser)
     args = parser.parse_args()
 
-    for filename in args.filename:
-        print(filename)
+    if args.benchmark:
+        benchmark(args.benchmark)
+        return
+
+    with profiler(args.profile, args.profile_output):
+        for filename in args.filename:
+            print(filename)
 
-        #
-        # Part One
-        #
-        races = load_file(filename)
-        print(f'1. Races: {races}')
+            #
+            # Part One
+            #
+            races = load_file(filename)
+            print(f'1. Races: {races}')
 
-        # winners_product = reduce(lambda a, c: c * a, map(race_times_brute, races), 1)
-        # print(f'\t1. (brute) The product of winning race combinations is: {winners_product}')
+            # winners_product = reduce(lambda a, c: c * a, map(race_times_brute, races), 1)
+            # print(f'\t1. (brute) The product of winning race combinations is: {winners_product}')
 
-        winners_product = reduce(lambda a, c: c * a, map(race_times_quadratic, races), 1)
-        print(f'\t1. (quad)  The product of winning race combinations is: {winners_product}')
+            winners_product = reduce(lambda a, c: c * a, map(race_times_exact, races), 1)
+            print(f'\t1. (exact) The product of winning race combinations is: {winners_product}')
 
-        #
-        # Part Two
-        #
-        races = load_race_2(filename)
-        print(f'2. Races: {races}')
+            #
+            # Part Two
+            #
+            races = load_race_2(filename)
+            print(f'2. Races: {races}')
 
-        # with multiprocessing.Pool(processes=4) as pool:
-        #     winners_product = reduce(lambda a, c: c * a, pool.map(race_times_brute, races), 1)
-        #     print(f'\t2. (brute) The product of winning race combinations is: {winners_product}')
+            # import multiprocessing
+            # with multiprocessing.Pool(processes=4) as pool:
+            #     winners_product = reduce(lambda a, c: c * a, pool.map(race_times_brute, races), 1)
+            #     print(f'\t2. (brute) The product of winning race combinations is: {winners_product}')
 
-        winners_product = reduce(lambda a, c: c * a, map(race_times_quadratic, races), 1)
-        print(f'\t2. (quad)  The product of winning race combinations is: {winners_product}')
+            winners_product = reduce(lambda a, c: c * a, map(race_times_exact, races), 1)
+            print(f'\t2. (exact) The product of winning race combinations is: {winners_product}')
 
-        print()
+            print()
 
 if __name__ == '__main__':
     main()
@@ -4,9 +4,15 @@ Advent of Code 2023 - Day 7: Camel Cards
 Stephen Houser <stephenhouser@gmail.com>
 """
 
+import os
+import sys
 import re
 import argparse
 
+# shared modules (performance.py) live in the directory above
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from performance import add_profile_arguments, profiler    # pylint: disable=wrong-import-position
+
 def score_hand(hand, joker=None):
     """Return a score for the poker hand"""
 
@@ -128,37 +134,39 @@ def main():
     """Main Routine, does all the work"""
     parser = argparse.ArgumentParser()
     parser.add_argument('filename', default='input.txt', nargs='+')
+    add_profile_arguments(parser)
     args = parser.parse_args()
 
-    for filename in args.filename:
-        print(filename)
-        hands = load_file(filename)
+    with profiler(args.profile, args.profile_output):
+        for filename in args.filename:
+            print(filename)
+            hands = load_file(filename)
 
-        #
-        # Part One
-        #
-        n_hands = len(hands)
-        print(f'\tNumber of hands: {n_hands}')
+            #
+            # Part One
+            #
+            n_hands = len(hands)
+            print(f'\tNumber of hands: {n_hands}')
 
-        # sort by hand rank and then score within rank
-        sorted_hands = sorted(hands, key=lambda x: (rank_hand(x.hand), score_hand(x.hand)))
-        #pretty_print(sorted_hands)
+            # sort by hand rank and then score within rank
+            sorted_hands = sorted(hands, key=lambda x: (rank_hand(x.hand), score_hand(x.hand)))
+            #pretty_print(sorted_hands)
 
-        # each hand is worth (its position in the list) * (the listed bid)
-        # compute the sum of all these values for the answer
-        bid_sum = sum(map(lambda h, i: h.bid*i, sorted_hands, range(1, n_hands+1)))
-        print(f'\tSum of ranked hand bids (regular): {bid_sum}')
+            # each hand is worth (its position in the list) * (the listed bid)
+            # compute the sum of all these values for the answer
+            bid_sum = sum(map(lambda h, i: h.bid*i, sorted_hands, range(1, n_hands+1)))
+            print(f'\tSum of ranked hand bids (regular): {bid_sum}')
 
-        #
-        # Part Two
-        #
-        sorted_hands = sorted(hands, key=lambda x: (joker_rank(x.hand), joker_score(x.hand)))
-        #pretty_print(sorted_hands)
+            #
+            # Part Two
+            #
+            sorted_hands = sorted(hands, key=lambda x: (joker_rank(x.hand), joker_score(x.hand)))
+            #pretty_print(sorted_hands)
 
-        bid_sum = sum(map(lambda h, i: h.bid*i, sorted_hands, range(1, n_hands+1)))
-        print(f'\tSum of ranked hand bids (jokers) : {bid_sum}')
+            bid_sum = sum(map(lambda h, i: h.bid*i, sorted_hands, range(1, n_hands+1)))
+            print(f'\tSum of ranked hand bids (jokers) : {bid_sum}')
 
-        print()
+            print()
 
 if __name__ == '__main__':
     main()
@@ -4,11 +4,17 @@ Advent of Code 2023 - Day 8: Haunted Wasteland
 Stephen Houser <stephenhouser@gmail.com>
 """
 
+import os
+import sys
 import re
 import argparse
 import math
 from functools import partial
 
+# shared modules (performance.py) live in the directory above
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from performance import add_profile_arguments, profiler    # pylint: disable=wrong-import-position
+
 class Node:
     """Represents a node in the map to traverse"""
 
@@ -78,47 +84,49 @@ def main():
     """Main Routine, does all the work"""
     parser = argparse.ArgumentParser()
     parser.add_argument('filename', default='input.txt', nargs='+')
+    add_profile_arguments(parser)
     args = parser.parse_args()
 
-    for filename in args.filename:
-        print(filename)
-        (directions, nodes) = load_file(filename)
+    with profiler(args.profile, args.profile_output):
+        for filename in args.filename:
+            print(filename)
+            (directions, nodes) = load_file(filename)
 
-        #print(f'Directions: {directions}')
-        #print_nodes(nodes)
+            #print(f'Directions: {directions}')
+            #print_nodes(nodes)
 
-        #
-        # Part One
-        #
+            #
+            # Part One
+            #
 
-        # Start with 'AAA'
-        start_node = nodes['AAA']
-        # partial function to traverse from start node to 'ZZZ' node
-        traverse_3z = partial(traverse, lambda l: l == 'ZZZ',
-                              directions=directions, nodes=nodes)
-        steps = traverse_3z(start_node)
-        print(f'\t1. It took {steps} steps to traverse from \'AAA\' to \'ZZZ\'')
+            # Start with 'AAA'
+            start_node = nodes['AAA']
+            # partial function to traverse from start node to 'ZZZ' node
+            traverse_3z = partial(traverse, lambda l: l == 'ZZZ',
+                                  directions=directions, nodes=nodes)
+            steps = traverse_3z(start_node)
+            print(f'\t1. It took {steps} steps to traverse from \'AAA\' to \'ZZZ\'')
 
-        #
-        # Part Two
-        #
+            #
+            # Part Two
+            #
 
-        # start with any node with a label ending with 'A'
-        start_nodes = filter(lambda x: x.label[2] == 'A', nodes.values())
+            # start with any node with a label ending with 'A'
+            start_nodes = filter(lambda x: x.label[2] == 'A', nodes.values())
 
-        # partial function to traverse from start node to 'xxZ' nodes
-        traverse_1z = partial(traverse, lambda l: l[2] == 'Z',
-                              directions=directions, nodes=nodes)
+            # partial function to traverse from start node to 'xxZ' nodes
+            traverse_1z = partial(traverse, lambda l: l[2] == 'Z',
+                                  directions=directions, nodes=nodes)
 
-        # map traversal onto all start nodes, get list of steps for each
-        steps = map(traverse_1z, start_nodes)
+            # map traversal onto all start nodes, get list of steps for each
+            steps = map(traverse_1z, start_nodes)
 
-        # least common multiple is where they will converge
-        lcm = math.lcm(*list(steps))
+            # least common multiple is where they will converge
+            lcm = math.lcm(*list(steps))
 
-        print(f'\tIt took {lcm} steps to traverse the map.')
+            print(f'\tIt took {lcm} steps to traverse the map.')
 
-        print()
+            print()
 
 if __name__ == '__main__':
     main()
@@ -4,9 +4,15 @@ Advent of Code 2023 - Day 9: Mirage Maintenance
 Stephen Houser <stephenhouser@gmail.com>
 """
 
+import os
+import sys
 import argparse
 from functools import reduce, partial
 
+# shared modules (performance.py) live in the directory above
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from performance import add_profile_arguments, profiler    # pylint: disable=wrong-import-position
+
 def load_file(filename: str):
     """Load lines from file into a list of ITEMS
         
@@ -53,26 +59,28 @@ def main():
     """Main Routine, does all the work"""
     parser = argparse.ArgumentParser()
     parser.add_argument('filename', default='input.txt', nargs='+')
+    add_profile_arguments(parser)
     args = parser.parse_args()
 
-    for filename in args.filename:
-        print(filename)
-        sensors = load_file(filename)
-        print(f'\tThere are {len(sensors)} sensors')
-
-        #
-        # Part One
-        #
-        forward_sum = reduce(lambda a, c: a + predict_forward(c)[-1], sensors, 0)
-        print(f'\tThe sum of forward predictions is {forward_sum}')
-
-        #
-        # Part Two
-        #
-        backward_sum = reduce(lambda a, c: a + predict_backward(c)[0], sensors, 0)
-        print(f'\tThe sum of backward predictions is {backward_sum}')
-
-        print()
+    with profiler(args.profile, args.profile_output):
+        for filename in args.filename:
+            print(filename)
+            sensors = load_file(filename)
+            print(f'\tThere are {len(sensors)} sensors')
+
+            #
+            # Part One
+            #
+            forward_sum = reduce(lambda a, c: a + predict_forward(c)[-1], sensors, 0)
+            print(f'\tThe sum of forward predictions is {forward_sum}')
+
+            #
+            # Part Two
+            #
+            backward_sum = reduce(lambda a, c: a + predict_backward(c)[0], sensors, 0)
+            print(f'\tThe sum of backward predictions is {backward_sum}')
+
+            print()
 
 if __name__ == '__main__':
     main()
@@ -4,9 +4,15 @@ Advent of Code 2023 - Day 10: Day 10: Pipe Maze
 Stephen Houser <stephenhouser@gmail.com>
 """
 
+import os
+import sys
 import argparse
 import math
 
+# shared modules (performance.py) live in the directory above
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from performance import add_profile_arguments, profiler    # pylint: disable=wrong-import-position
+
 
 def load_file(filename: str):
     """Load lines from file into a list of lists of characters
@@ -138,72 +144,97 @@ def mark_tile(grid, tile, mark):
     (x, y) = tile[:2]
     grid[y][x] = f'{grid[y][x][0]}' + mark
 
+def trace_loop(grid, start):
+    """Returns the list of tiles on the loop that starts at `start`.
+       Marks each tile on the loop with a `*` as it is traversed.
+    """
+    mark_tile(grid, start, '*') # mark starting tile as "on the path"
+    tile = find_path(grid, start)
+    trail = []
+    while not same_tile(tile, start):
+        trail.append(tile)
+        tile = get_next_tile(grid, tile) # will also mark tiles
+
+    return trail
+
+def farthest_tile(grid):
+    """Returns the number of steps to the tile farthest from the start"""
+    trail = trace_loop(grid, find_start(grid))
+    return math.ceil(len(trail)/2)
+
+def count_enclosed(grid, start):
+    """Returns the number of tiles enclosed by the (marked) loop"""
+    patch_tile(grid, start) # Replace starting tile with it's true form
+    mark_tile(grid, start, '*') # mark starting tile as "on the path"
+
+    # for each line count the enclosed ground symbols `.`
+    enclosed_count = 0
+    for i, y in enumerate(grid):
+        crossings = 0
+        started_with = None
+        for j, x in enumerate(y):
+            # sequences of `L---J` and `F---7` don't count as crossings,
+            # they are the bottom and top of boxes.
+            if x in ('F*', 'L*'):   # F, L might be start of box boundary
+                crossings += 1
+                started_with = x
+            elif x == '7*' and started_with == 'F*':
+                crossings -= 1      # this was a box bounday, don't count
+                started_with = None
+            elif x == 'J*' and started_with == 'L*':
+                crossings -= 1      # this was a box bounday, don't count
+                started_with = None
+
+            if x == '|*':           # crossed a boundary
+                crossings += 1
+
+            # of the crossings is odd we are "inside" the loop
+            if len(x) == 1 and crossings != 0 and crossings % 2 == 1:
+                grid[i][j] = 'I+'   # mark cell for display
+                enclosed_count += 1
+
+    return enclosed_count
+
+def enclosed_tiles(grid):
+    """Returns the number of tiles enclosed by the loop"""
+    start = find_start(grid)
+    trace_loop(grid, start)
+    return count_enclosed(grid, start)
+
 def main():
     """Main Routine, does all the work"""
     parser = argparse.ArgumentParser()
     parser.add_argument('filename', default='input.txt', nargs='+')
+    add_profile_arguments(parser)
     args = parser.parse_args()
 
-    for filename in args.filename:
-        print(filename)
-        grid = load_file(filename)
-        start = find_start(grid)
-
-        #print_grid(grid)
-        print(f'\tStart at: {start}\n')
-        #
-        # Part One
-        #
-        mark_tile(grid, start, '*') # mark starting tile as "on the path"
-        tile = find_path(grid, start)
-        trail = []
-        while not same_tile(tile, start):
-            trail.append(tile)
-            tile = get_next_tile(grid, tile) # will also mark tiles
-
-        farthest = math.ceil(len(trail)/2)
-
-        #print_grid(grid)
-        print(f'\t1. The farthest tile is: {farthest} steps away')
-        print()
-
-        #
-        # Part Two
-        #
-
-        patch_tile(grid, start) # Replace starting tile with it's true form
-        mark_tile(grid, start, '*') # mark starting tile as "on the path"
-
-        # for each line count the enclosed ground symbols `.`
-        enclosed_count = 0
-        for i, y in enumerate(grid):
-            crossings = 0
-            started_with = None
-            for j, x in enumerate(y):
-                # sequences of `L---J` and `F---7` don't count as crossings,
-                # they are the bottom and top of boxes.
-                if x in ('F*', 'L*'):   # F, L might be start of box boundary
-                    crossings += 1
-                    started_with = x
-                elif x == '7*' and started_with == 'F*':
-                    crossings -= 1      # this was a box bounday, don't count
-                    started_with = None
-                elif x == 'J*' and started_with == 'L*':
-                    crossings -= 1      # this was a box bounday, don't count
-                    started_with = None
-
-                if x == '|*':           # crossed a boundary
-                    crossings += 1
-
-                # of the crossings is odd we are "inside" the loop
-                if len(x) == 1 and crossings != 0 and crossings % 2 == 1:
-                    grid[i][j] = 'I+'   # mark cell for display
-                    enclosed_count += 1
-
-        #mark_tile(grid, start, '-')
-        #print_grid(grid)
-        print(f'\t2. There are {enclosed_count} enclosed tiles. (269)')
-        print()
+    with profiler(args.profile, args.profile_output):
+        for filename in args.filename:
+            print(filename)
+            grid = load_file(filename)
+            start = find_start(grid)
+
+            #print_grid(grid)
+            print(f'\tStart at: {start}\n')
+            #
+            # Part One
+            #
+            trail = trace_loop(grid, start)
+            farthest = math.ceil(len(trail)/2)
+
+            #print_grid(grid)
+            print(f'\t1. The farthest tile is: {farthest} steps away')
+            print()
+
+            #
+            # Part Two
+            #
+            enclosed_count = count_enclosed(grid, start)
+
+            #mark_tile(grid, start, '-')
+            #print_grid(grid)
+            print(f'\t2. There are {enclosed_count} enclosed tiles. (269)')
+            print()
 
 if __name__ == '__main__':
     main()
@@ -4,10 +4,17 @@ Advent of Code 2023 - Day 11: Cosmic Expansion
 Stephen Houser <stephenhouser@gmail.com>
 """
 
+import os
+import sys
 import argparse
 from itertools import combinations
 import unittest
 
+# shared modules (puzzle_input.py) live in the directory above
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from puzzle_input import mapped_grid    # pylint: disable=wrong-import-position
+from performance import add_profile_arguments, profiler    # pylint: disable=wrong-import-position
+
 
 #
 # Testing how things might work if I use Python unittest framework
@@ -70,11 +77,10 @@ class Galaxy:
 def load_file(filename: str):
     """Load map of space from file
        filename: the file to read game descriptions from.
-       returns: a list of lists of characters representing the space map
+       returns: a Grid mapped onto the file representing the space map
     """
     try:
-        with open(filename, 'r', encoding='utf-8') as file:
-            return list(map(list,map(str.strip, file.readlines())))
+        return mapped_grid(filename)
 
     except FileNotFoundError:
         print(f'ERROR: file {filename} not found.')
@@ -86,24 +92,22 @@ def expand_galaxies(space, galaxies, expansion=2):
         use expansion as expansion factor, 
         e.g. 10 means each empty row is 10 rows
     """
-    for y in reversed(range(len(space))):
-        #print(f'Expand Y {y} {space[y]}')
-        if '#' not in space[y]:
+    # rows and columns are empty when no galaxy is in them
+    occupied_rows = {galaxy.location[1] for galaxy in galaxies.values()}
+    occupied_cols = {galaxy.location[0] for galaxy in galaxies.values()}
+
+    for y in reversed(range(space.height)):
+        if y not in occupied_rows:
             for galaxy in galaxies.values():
                 if y < galaxy.location[1]:
                     e_y = galaxy.location[1] + expansion -1
-                    #print(f'\t{galaxy.id}:{galaxy.location[1]} -> {e_y}')
                     galaxy.location = (galaxy.location[0], e_y)
 
-    col_space = [[space[j][i] for j in range(len(space))] for i in range(len(space[0]))]
-
-    for x in reversed(range(len(col_space))):
-        if '#' not in col_space[x]:
-            #print(f'Expand X {x} {col_space[x]}')
+    for x in reversed(range(space.width)):
+        if x not in occupied_cols:
             for galaxy in galaxies.values():
                 if x < galaxy.location[0]:
                     e_x = galaxy.location[0] + expansion -1
-                    #print(f'\t{galaxy.id}:{galaxy.location[0]} -> {e_x}')
                     galaxy.location = (e_x, galaxy.location[1])
 
 def find_galaxies(space):
@@ -111,11 +115,12 @@ def find_galaxies(space):
     """
     galaxies = {}
 
-    for y, row in enumerate(space):
-        for x, col in enumerate(row):
-            if col == '#':
-                galaxy = Galaxy(x, y)
-                galaxies[galaxy.id] = galaxy
+    # search the (mapped) cells directly rather than visiting every cell
+    index = space.cells.find(b'#')
+    while index >= 0:
+        galaxy = Galaxy(*space.coords(index))
+        galaxies[galaxy.id] = galaxy
+        index = space.cells.find(b'#', index + 1)
 
     return galaxies
 
@@ -140,7 +145,7 @@ def sum_distances(galaxies):
 def print_space(space):
     """Pretty print the space map
     """
-    for row in space:
+    for row in space.rows():
         for col in row:
             print(f'{col:2}', end='')
         print()
@@ -149,39 +154,41 @@ def main():
     """Main Routine, does all the work"""
     parser = argparse.ArgumentParser()
     parser.add_argument('filename', default='input.txt', nargs='+')
+    add_profile_arguments(parser)
     args = parser.parse_args()
 
-    for filename in args.filename:
-        print(filename)
-        space = load_file(filename)
-        #print_space(space)
-        #print()
+    with profiler(args.profile, args.profile_output):
+        for filename in args.filename:
+            print(filename)
+            space = load_file(filename)
+            #print_space(space)
+            #print()
 
-        #
-        # Part One
-        #
+            #
+            # Part One
+            #
 
-        # expand by 2
-        galaxies = find_galaxies(space)
-        expand_galaxies(space, galaxies, 2)
+            # expand by 2
+            galaxies = find_galaxies(space)
+            expand_galaxies(space, galaxies, 2)
 
-        #pairs = combinations(list(galaxies.keys()), 2)
-        #distances = map(lambda p: distance(galaxies[p[0]], galaxies[p[1]]), pairs)
-        answer = sum_distances(galaxies)
-        print(f'\t1. The sum of the distances between galaxies is {answer}, with expansion=2')
+            #pairs = combinations(list(galaxies.keys()), 2)
+            #distances = map(lambda p: distance(galaxies[p[0]], galaxies[p[1]]), pairs)
+            answer = sum_distances(galaxies)
+            print(f'\t1. The sum of the distances between galaxies is {answer}, with expansion=2')
 
-        #
-        # Part Two
-        #
+            #
+            # Part Two
+            #
 
-        # expand by 1,000,000
-        galaxies = find_galaxies(space)
-        expand_galaxies(space, galaxies, 1000000)
+            # expand by 1,000,000
+            galaxies = find_galaxies(space)
+            expand_galaxies(space, galaxies, 1000000)
 
-        answer = sum_distances(galaxies)
-        print(f'\t2. The sum of the distances between galaxies is {answer}, with expansion=1,000,000')
+            answer = sum_distances(galaxies)
+            print(f'\t2. The sum of the distances between galaxies is {answer}, with expansion=1,000,000')
 
-        print()
+            print()
 
 if __name__ == '__main__':
     main()
@@ -4,11 +4,18 @@ Advent of Code 2023 - Day 12: Hot Springs
 Stephen Houser <stephenhouser@gmail.com>
 """
 
+import os
 import re
+import sys
 import argparse
 import unittest
 from itertools import repeat
-from functools import reduce, cache
+from functools import reduce
+
+# shared modules (performance.py) live in the directory above
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from performance import memoized, clear_memoized, print_memoized_stats  # pylint: disable=wrong-import-position
+from performance import add_profile_arguments, profiler    # pylint: disable=wrong-import-position
 
 class TestAOC(unittest.TestCase):
     """Test Advent of Code"""
@@ -38,7 +45,7 @@ class TestAOC(unittest.TestCase):
 #
 # Cache results by memoizing the function
 #
-@cache
+@memoized
 def matches_for(observations, sequence):
     """Return the number of possible sequence matches for observations
     """
@@ -127,12 +134,20 @@ def main():
     """Main Routine, does all the work"""
     parser = argparse.ArgumentParser()
     parser.add_argument('filename', default='input.txt', nargs='+')
+    add_profile_arguments(parser)
+    parser.add_argument('-s', '--stats', action='store_true',
+                        help='show cache statistics')
     args = parser.parse_args()
 
-    for filename in args.filename:
-        record_count = count_records(filename)
-        print(record_count)
-        print()
+    with profiler(args.profile, args.profile_output):
+        for filename in args.filename:
+            record_count = count_records(filename)
+            print(record_count)
+            if args.stats:
+                print_memoized_stats()
+            print()
+            # nothing carries over to the next input
+            clear_memoized()
 
 if __name__ == '__main__':
     main()
@@ -4,10 +4,17 @@ Advent of Code 2023 - Day 13: Point of Incidence
 Stephen Houser <stephenhouser@gmail.com>
 """
 
+import os
+import sys
 import argparse
 import unittest
 import itertools
 
+# shared modules (puzzle_input.py) live in the directory above
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from puzzle_input import map_file, mapped_blocks    # pylint: disable=wrong-import-position
+from performance import add_profile_arguments, profiler    # pylint: disable=wrong-import-position
+
 
 class TestAOC(unittest.TestCase):
     """Test Advent of Code"""
@@ -98,15 +105,12 @@ def find_reflection(island_map, smudges):
 def print_grid(grid):
     """Pretty print 2D grid in readable form"""
     for row in grid:
-        for col in row:
-            print(col, end='')
-        print()
+        print(bytes(row).decode())
 
 def load_file(filename: str):
-    """Load lines from file into 2D list"""
+    """Load maps from file, each a list of rows (memoryview of the mapped file)"""
     try:
-        with open(filename, 'r', encoding='utf-8') as file:
-            return tuple(map(lambda x: x.split('\n'), file.read().split('\n\n')))
+        return tuple(mapped_blocks(map_file(filename)))
 
     except FileNotFoundError:
         print('File %s not found.', filename)
@@ -117,21 +121,23 @@ def main():
     """Main Routine, does all the work"""
     parser = argparse.ArgumentParser()
     parser.add_argument('filename', default='input.txt', nargs='+')
+    add_profile_arguments(parser)
     args = parser.parse_args()
 
-    for filename in args.filename:
-        print(filename)
-        maps = load_file(filename)
+    with profiler(args.profile, args.profile_output):
+        for filename in args.filename:
+            print(filename)
+            maps = load_file(filename)
 
-        # Part One
-        summary = sum((map(lambda x: summarize_reflection(x, 0), maps)))
-        print(f'\t1. Number of reflections (no fixes)    : {summary}')
+            # Part One
+            summary = sum((map(lambda x: summarize_reflection(x, 0), maps)))
+            print(f'\t1. Number of reflections (no fixes)    : {summary}')
 
-        # Part Two
-        summary = sum((map(lambda x: summarize_reflection(x, 1), maps)))
-        print(f'\t2. Number of reflections (fixed smudge): {summary}')
+            # Part Two
+            summary = sum((map(lambda x: summarize_reflection(x, 1), maps)))
+            print(f'\t2. Number of reflections (fixed smudge): {summary}')
 
-        print()
+            print()
 
 if __name__ == '__main__':
     main()
@@ -4,14 +4,18 @@ Advent of Code 2023 - Day 14: Parabolic Reflector Dish
 Stephen Houser <stephenhouser@gmail.com>
 """
 
+import os
 import re
+import sys
 import argparse
 import unittest
-import logging as log
 import hashlib
 import itertools
-from cProfile import Profile
-from functools import cache
+
+# shared modules (performance.py) live in the directory above
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from performance import memoized, clear_memoized, print_memoized_stats  # pylint: disable=wrong-import-position
+from performance import add_profile_arguments, profiler    # pylint: disable=wrong-import-position
 
 class TestAOC(unittest.TestCase):
     """Test Advent of Code"""
@@ -71,7 +75,7 @@ def flip_lr(grid):
 #     59201 function calls (59175 primitive calls)   in 0.575 seconds
 # use @cache
 #     23913 function calls (23887 primitive calls) in 0.142 seconds
-@cache
+@memoized
 def roll_row_west(row):
     """Returns the value of a single row after a Westward roll.
     """
@@ -180,6 +184,7 @@ def load_file(filename: str):
             return tuple(map(tuple, map(str.strip, file.readlines())))
 
     except FileNotFoundError:
+        import logging as log   # pylint: disable=import-outside-toplevel
         log.error('File %s not found.', filename)
 
     return []
@@ -188,6 +193,9 @@ def main():
     """Main Routine, does all the work"""
     parser = argparse.ArgumentParser()
     parser.add_argument('filename', default='input.txt', nargs='+')
+    add_profile_arguments(parser)
+    parser.add_argument('-s', '--stats', action='store_true',
+                        help='show cache statistics')
     args = parser.parse_args()
 
     for filename in args.filename:
@@ -204,12 +212,14 @@ def main():
         #
         # Part Two
         #
-        with Profile() as profile:
+        with profiler(args.profile, args.profile_output):
             dish = tilt_cycles(dish, 1_000_000_000)
             weight = calculate_weight(dish)
             print(f'\t2. The weight on the north beam: {weight}')
 
-            profile.print_stats('time')
+        if args.stats:
+            print_memoized_stats()
+        clear_memoized()
 
         #print_grid(dish)
         #print()
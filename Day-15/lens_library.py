@@ -4,11 +4,16 @@ Advent of Code 2023 - Day X: ...
 Stephen Houser <stephenhouser@gmail.com>
 """
 
+import os
+import sys
 import re
 import argparse
 import unittest
 from functools import reduce
-from cProfile import Profile
+
+# shared modules (performance.py) live in the directory above
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from performance import add_profile_arguments, profiler    # pylint: disable=wrong-import-position
 
 class TestAOC(unittest.TestCase):
     """Test Advent of Code"""
@@ -115,6 +120,7 @@ def main():
     """Main Routine, does all the work"""
     parser = argparse.ArgumentParser()
     parser.add_argument('filename', default='input.txt', nargs='+')
+    add_profile_arguments(parser)
     args = parser.parse_args()
 
     example = hash_text('HASH')
@@ -124,7 +130,7 @@ def main():
         print(filename)
         sequence = load_file(filename)
 
-        with Profile() as profile:
+        with profiler(args.profile, args.profile_output):
             #
             # Part One
             #
@@ -138,8 +144,6 @@ def main():
             power = focus_power(boxes)
             print(f'\t2. The focusing power of the configuration is: {power}')
 
-            profile.print_stats('cumtime')
-
 if __name__ == '__main__':
     main()
     #unittest.main()
@@ -4,10 +4,15 @@ Advent of Code 2023 - Day 18: Lavaduct Lagoon
 Stephen Houser <stephenhouser@gmail.com>
 """
 
+import os
+import sys
 import re
 import argparse
 import unittest
-from cProfile import Profile
+
+# shared modules (performance.py) live in the directory above
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from performance import add_profile_arguments, profiler    # pylint: disable=wrong-import-position
 
 
 class TestAOC(unittest.TestCase):
@@ -258,13 +263,13 @@ def main():
     """Main Routine, does all the work"""
     parser = argparse.ArgumentParser()
     parser.add_argument('filename', default='input.txt', nargs='+')
-    parser.add_argument('-p', '--profile', action='store_true')
+    add_profile_arguments(parser)
     args = parser.parse_args()
 
-    for filename in args.filename:
-        print(filename)
+    with profiler(args.profile, args.profile_output):
+        for filename in args.filename:
+            print(filename)
 
-        with Profile() as profile:
             #
             # Part One
             #
@@ -288,9 +293,6 @@ def main():
 
             print()
 
-        if args.profile:
-            profile.print_stats('cumtime')
-
 if __name__ == '__main__':
     main()
     #unittest.main()
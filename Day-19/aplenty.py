@@ -4,12 +4,17 @@ Advent of Code 2023 - Day 19: Aplenty
 Stephen Houser <stephenhouser@gmail.com>
 """
 
+import os
+import sys
 import re
 import argparse
 import unittest
-from cProfile import Profile
 from functools import reduce, partial
 
+# shared modules (performance.py) live in the directory above
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from performance import add_profile_arguments, profiler    # pylint: disable=wrong-import-position
+
 class TestAOC(unittest.TestCase):
     """Test Advent of Code"""
 
@@ -193,13 +198,13 @@ def main():
     """Main Routine, does all the work"""
     parser = argparse.ArgumentParser()
     parser.add_argument('filename', default='input.txt', nargs='+')
-    parser.add_argument('-p', '--profile', action='store_true')
+    add_profile_arguments(parser)
     args = parser.parse_args()
 
-    for filename in args.filename:
-        print(filename)
+    with profiler(args.profile, args.profile_output):
+        for filename in args.filename:
+            print(filename)
 
-        with Profile() as profile:
             (workflows, parts) = load_file(filename)
             #print('workflows:', workflows)
             #print('Parts:', parts)
@@ -216,10 +221,7 @@ def main():
             accepted_parts = accepted_combinations(workflows)
             print(f'\t2. Accepted combinations: {accepted_parts}')
 
-        print()
-
-    if args.profile:
-        profile.print_stats('cumtime')
+            print()
 
 if __name__ == '__main__':
     main()
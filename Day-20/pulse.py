@@ -4,12 +4,17 @@ Advent of Code 2023 - Day 20: Pulse Propagation
 Stephen Houser <stephenhouser@gmail.com>
 """
 
+import os
+import sys
 import re
 import argparse
 import unittest
 import math
 from collections import deque
-from cProfile import Profile
+
+# shared modules (performance.py) live in the directory above
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from performance import add_profile_arguments, profiler    # pylint: disable=wrong-import-position
 
 
 class TestAOC(unittest.TestCase):
@@ -238,13 +243,13 @@ def main():
     """Main Routine, does all the work"""
     parser = argparse.ArgumentParser()
     parser.add_argument('filename', default='input.txt', nargs='+')
-    parser.add_argument('-p', '--profile', action='store_true')
+    add_profile_arguments(parser)
     args = parser.parse_args()
 
-    for filename in args.filename:
-        print(filename)
+    with profiler(args.profile, args.profile_output):
+        for filename in args.filename:
+            print(filename)
 
-        with Profile() as profile:
             #
             # Part One
             #
@@ -260,10 +265,7 @@ def main():
             pulse_count = find_low_pulse(circuit, 'rx')
             print(f'\t2. The circuit will trigger rx low at: {pulse_count:,}')
 
-        print()
-
-    if args.profile:
-        profile.print_stats('cumtime')
+            print()
 
 if __name__ == '__main__':
     main()
@@ -4,11 +4,19 @@ Advent of Code 2023 - Day 21: Step Counter
 Stephen Houser <stephenhouser@gmail.com>
 """
 
+import os
+import sys
 import argparse
 import unittest
-from cProfile import Profile
 from collections import deque
 
+# shared modules (grid.py) live in the directory above
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from grid import Grid   # pylint: disable=wrong-import-position
+from puzzle_input import mapped_grid    # pylint: disable=wrong-import-position
+from performance import add_profile_arguments, profiler    # pylint: disable=wrong-import-position
+from answer_cache import cached_answer  # pylint: disable=wrong-import-position
+
 
 class TestAOC(unittest.TestCase):
     """Test Advent of Code"""
@@ -30,14 +38,14 @@ class TestAOC(unittest.TestCase):
 
     def test_part1_solution(self):
         """Part 1 solution for input.txt"""
-        garden_map = load_file('input.txt')
-        gardens_reached = find_gardens_brute(garden_map, 64)
+        gardens_reached = cached_answer(find_gardens_brute, 'input.txt', 64,
+                                        loader=load_file)
         self.assertEqual(gardens_reached, 3_746)
 
     def test_part1_solution_fast(self):
         """Part 1 solution for input.txt"""
-        garden_map = load_file('input.txt')
-        gardens_reached = find_gardens_fast(garden_map, [64])[0]
+        gardens_reached = cached_answer(find_gardens_fast, 'input.txt', [64],
+                                        loader=load_file)[0]
         self.assertEqual(gardens_reached, 3_746)
 
     #
@@ -73,54 +81,50 @@ class TestAOC(unittest.TestCase):
     #     result = len(things)
     #     self.assertEqual(result, 10)
 
-def c_str(cplx):
-    """Pretty print a complex number as (i,j)"""
-    return f'({int(cplx.real)}, {int(cplx.imag)})'
-
 def ascii_color(hex_color, text):
     """Return text in ASCII color"""
     r = int(hex_color[0:2], 16)
     g = int(hex_color[2:4], 16)
     b = int(hex_color[4:6], 16)
     return f'\033[38;2;{r};{g};{b}m{text}\033[0m'
-    
+
+ROCK = ord('#')
 
 class Map:
-    """Represents a ___"""
+    """Represents the garden map, a Grid with a starting location"""
     def __init__(self, map_data):
         self.rows = 0
         self.cols = 0
-        self._map = None
+        self.grid = None
         self.load_map(map_data)
 
-    def get(self, x, y=None):
-        if isinstance(x, complex):
-            return self._map.get(x)
-        else:
-            return self._map.get(complex(x,y))
-    
-    def infinite_get(self, position):
-        x = position.real % self.cols
-        y = position.imag % self.rows
-        return self.get(complex(int(x),int(y)))    
+    def get(self, x, y):
+        """Return symbol at (x, y) on the map"""
+        return self.grid.get(x, y)
+
+    def infinite_get(self, x, y):
+        """Return symbol at (x, y) as if the map repeats forever"""
+        return self.grid.infinite_get(x, y)
 
     def load_map(self, text):
-        if isinstance(text, str):
-            lines = text.split('\n')
+        """Load the map from text or lines of text"""
+        if isinstance(text, Grid):
+            self.grid = text
+        elif isinstance(text, str):
+            self.grid = Grid.from_text(text)
         else:
-            lines = text
+            self.grid = Grid.from_lines(text)
 
-        self._map = {complex(i,j): c for j, r in enumerate(lines)
-                     for i, c in  enumerate(r.strip())}
-        self.rows = int(max([n.imag for n in self._map]))+1
-        self.cols = int(max([n.real for n in self._map]))+1 
+        self.rows = self.grid.height
+        self.cols = self.grid.width
 
     def get_start(self):
-        starts = list(filter(lambda x: self._map[x] == 'S', self._map))
-        
-        assert len(starts) == 1
-        return starts[0]
-    
+        """Return the (x, y) of the start location"""
+        start = self.grid.find('S')
+
+        assert start >= 0
+        return self.grid.coords(start)
+
     def print(self, highlights=None):
         """Pretty print 2D grid in readable form"""
         print('  ', end='')
@@ -133,7 +137,7 @@ class Map:
                 symbol = self.get(x, y)
                 if not symbol:
                     print(ascii_color('777777', '~'), end='')
-                elif highlights and complex(x,y) in highlights:
+                elif highlights and (x, y) in highlights:
                     print(ascii_color('ffffff', symbol), end='')
                 else:
                     print(symbol, end='')
@@ -146,13 +150,12 @@ class Map:
 
     def __str__(self):
         """Return string representation"""
-        return f'Empty'
+        return f'Map {self.cols}x{self.rows}'
 
 def load_file(filename: str):
-    """Load lines from file into ___"""
+    """Load lines from file into a garden Map"""
     try:
-        with open(filename, 'r', encoding='utf-8') as file:
-            return Map(file)
+        return Map(mapped_grid(filename))
 
     except FileNotFoundError:
         print('File %s not found.', filename)
@@ -163,16 +166,16 @@ def find_gardens_brute(garden_map, end_steps=16):
     """Return the gardens (positions) that would result from
         walking exactly end_steps steps from start_position.
     """
-    walker = deque([(garden_map.get_start(), 0)])
+    grid = garden_map.grid
+    walker = deque([(grid.index(*garden_map.get_start()), 0)])
     reached = set()
     repeats = set()
 
     while walker:
         position, steps = walker.popleft()
-        # print(f'walker {c_str(position)} {steps}')
 
         # ignore rocks
-        if garden_map.get(position) == '#':
+        if grid[position] == ROCK:
             continue
 
         # ignore repeated positions with steps
@@ -187,15 +190,28 @@ def find_gardens_brute(garden_map, end_steps=16):
             continue
 
         # add neighbors and walkers
-        for direction in (1, -1, 1j, -1j):
-            neighbor = position + direction
+        for neighbor in grid.neighbors(position):
             walker.append((neighbor, steps+1))
 
     return len(reached)
 
 def find_gardens_fast(garden_map, step_counts):
+    """Return the number of gardens reachable in each of step_counts steps
+        on the infinite (repeating) map.
+    """
+    grid = garden_map.grid
+    cells, stride = grid.cells, grid.stride
+    rows, cols = garden_map.rows, garden_map.cols
+
+    # Positions on the infinite map are single ints, y * span + x + bias.
+    # span is far wider than any walk and a multiple of the map width so
+    # (x + bias) % cols is still the column on the map.
+    span = cols * 2**16
+    bias = span // 2
+    start_x, start_y = garden_map.get_start()
+
     closed = []
-    open = {garden_map.get_start()}
+    open = {start_y * span + start_x + bias}
 
     step = 0
     while len(step_counts):
@@ -204,9 +220,10 @@ def find_gardens_fast(garden_map, step_counts):
             closed.append(len(open))
 
         new_open = set()
-        for direction in (1, -1, 1j, -1j):
+        for direction in (1, -1, span, -span):
             for position in open:
-                if garden_map.infinite_get(position+direction) != '#':
+                y, x = divmod(position + direction, span)
+                if cells[(y % rows) * stride + x % cols] != ROCK:
                     new_open.add(position+direction)
 
         open = new_open
@@ -214,17 +231,41 @@ def find_gardens_fast(garden_map, step_counts):
 
     return closed
 
+def lagrange_interpolation(vec):
+    """Returns the three terms of the quadratic; c + bx + ax**2
+        Can't say I understand this one, just used the formula
+    """
+    return [int(vec[0] / 2 - vec[1] + vec[2] / 2),
+            int(-3 * (vec[0] / 2) + 2 * vec[1] - vec[2] / 2),
+            int(vec[0])
+        ]
+
+def find_gardens_quadratic(garden_map, steps):
+    """Return the gardens reached in `steps` steps on the infinite map by
+        fitting a quadratic to the first three "map fills" (part 2).
+    """
+    # one "map" will fill up in half_map steps
+    half_map = garden_map.rows // 2
+    # we search for three terms to interpolate a quadratic
+    step_search = [half_map,
+                   half_map + garden_map.rows,
+                   half_map + garden_map.rows * 2]
+    a, b, c = lagrange_interpolation(find_gardens_fast(garden_map, step_search))
+
+    x = steps // garden_map.rows
+    return a*x**2 + b*x + c
+
 def main():
     """Main Routine, does all the work"""
     parser = argparse.ArgumentParser()
     parser.add_argument('filename', default='input.txt', nargs='+')
-    parser.add_argument('-p', '--profile', action='store_true')
+    add_profile_arguments(parser)
     args = parser.parse_args()
 
-    for filename in args.filename:
-        print(filename)
+    with profiler(args.profile, args.profile_output):
+        for filename in args.filename:
+            print(filename)
 
-        with Profile() as profile:
             garden_map = load_file(filename)
             # garden_map.print([garden_map.get_start()])
 
@@ -259,15 +300,6 @@ def main():
             # divide steps by the map size; x= 26501365 // 131
             # solve 3889 + 15379 x + 15236 x^2 with x=202300
             # 623_540_829_615_589 -- fits the quadratic!!
-            def lagrange_interpolation(vec):
-                """Returns the three terms of the quadratic; c + bx + ax**2
-                    Can't say I understand this one, just used the formula
-                """
-                return [int(vec[0] / 2 - vec[1] + vec[2] / 2),
-                        int(-3 * (vec[0] / 2) + 2 * vec[1] - vec[2] / 2),
-                        int(vec[0])
-                    ]
-
             steps = 26_501_365
             x = steps // garden_map.rows
             a, b, c = lagrange_interpolation(gardens_reached)
@@ -276,10 +308,7 @@ def main():
             gardens_reached = a*x**2 + b*x + c
             print(f'\t2. Unique gardens reached in {steps:,} steps: {gardens_reached:,}')
 
-        print()
-
-    if args.profile:
-        profile.print_stats('cumtime')
+            print()
 
 if __name__ == '__main__':
     main()
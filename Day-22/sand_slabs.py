@@ -4,10 +4,15 @@ Advent of Code 2023 - Day 22: Sand Slabs
 Stephen Houser <stephenhouser@gmail.com>
 """
 
+import os
+import sys
 import re
 import argparse
 import unittest
-from cProfile import Profile
+
+# shared modules (performance.py) live in the directory above
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from performance import add_profile_arguments, profiler    # pylint: disable=wrong-import-position
 
 class TestAOC(unittest.TestCase):
     """Test Advent of Code"""
@@ -222,13 +227,13 @@ def main():
     """Main Routine, does all the work"""
     parser = argparse.ArgumentParser()
     parser.add_argument('filename', default='input.txt', nargs='+')
-    parser.add_argument('-p', '--profile', action='store_true')
+    add_profile_arguments(parser)
     args = parser.parse_args()
 
-    for filename in args.filename:
-        print(filename)
+    with profiler(args.profile, args.profile_output):
+        for filename in args.filename:
+            print(filename)
 
-        with Profile() as profile:
             world = load_file(filename)
             drop_slabs(world)
 
@@ -244,10 +249,7 @@ def main():
             fallen_slabs = sum(map(count_supported, world.slabs))
             print(f'\t2. Sum of fallen san slabs: {fallen_slabs:,}')
 
-        print()
-
-    if args.profile:
-        profile.print_stats('cumtime')
+            print()
 
 if __name__ == '__main__':
     main()
@@ -4,12 +4,20 @@ Advent of Code 2023 - Day 23: A Long Walk
 Stephen Houser <stephenhouser@gmail.com>
 """
 
+import os
+import sys
 import argparse
 import unittest
-from cProfile import Profile
 from heapq import heappush, heappop
 from collections import defaultdict
 
+# shared modules (grid.py) live in the directory above
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from grid import Grid   # pylint: disable=wrong-import-position
+from puzzle_input import mapped_grid    # pylint: disable=wrong-import-position
+from performance import add_profile_arguments, profiler    # pylint: disable=wrong-import-position
+from answer_cache import cached_answer  # pylint: disable=wrong-import-position
+
 class TestAOC(unittest.TestCase):
     """Test Advent of Code"""
 
@@ -23,7 +31,8 @@ class TestAOC(unittest.TestCase):
 
     def test_part1_solution(self):
         """Part 1 solution for input.txt"""
-        longest_path = find_longest_directional_path(load_file('input.txt'))
+        longest_path = cached_answer(find_longest_directional_path, 'input.txt',
+                                     loader=load_file)
         self.assertEqual(longest_path, 2_186)
 
     #
@@ -36,18 +45,11 @@ class TestAOC(unittest.TestCase):
 
     def test_part2_solution(self):
         """Part 2 solution for input.txt"""
-        longest_path = find_longest_undirected_path(load_file('input.txt'))
+        longest_path = cached_answer(find_longest_undirected_path, 'input.txt',
+                                     loader=load_file)
         self.assertEqual(longest_path, 6_802)
 
 
-def c_str(cplx):
-    """Pretty print a complex number as (i,j)"""
-    return f'({int(cplx.real)}, {int(cplx.imag)})'
-
-def c_tup(cplx):
-    """Return a tuple(x,y) from a complex(x,y)"""
-    return (int(cplx.real), int(cplx.imag))
-
 def ascii_color(hex_color, text):
     """Return text in ASCII color"""
     r = int(hex_color[0:2], 16)
@@ -55,71 +57,61 @@ def ascii_color(hex_color, text):
     b = int(hex_color[4:6], 16)
     return f'\033[38;2;{r};{g};{b}m{text}\033[0m'
 
+FOREST = ord('#')
+
 class Map:
-    """Represents a ___"""
+    """Represents the trail map, a Grid with start and finish locations.
+        Locations are Grid indexes.
+    """
     def __init__(self, map_data):
         self.rows = 0
         self.cols = 0
         self.start = None
         self.finish = None
-        self._map = None
+        self.grid = None
         self.nodes = defaultdict(list)
         self.load_map(map_data)
 
-    def get(self, x, y=None):
-        """Return symbol at position on the map"""
-        if isinstance(x, complex):
-            return self._map.get(x)
-
-        return self._map.get(complex(x,y))
+    def get(self, x, y):
+        """Return symbol at (x, y) on the map"""
+        return self.grid.get(x, y)
 
-    def infinite_get(self, position):
+    def infinite_get(self, x, y):
         """Return symbol at position on the map
             as if the map were infinite copies of itself
         """
-        x = position.real % self.cols
-        y = position.imag % self.rows
-        return self.get(complex(int(x),int(y)))
+        return self.grid.infinite_get(x, y)
 
     def load_map(self, map_data):
         """Load the map from map_data"""
-        if isinstance(map_data, str):
-            lines = map_data.split('\n')
+        if isinstance(map_data, Grid):
+            self.grid = map_data
+        elif isinstance(map_data, str):
+            self.grid = Grid.from_text(map_data)
         else:
-            lines = map_data
-
-        self._map = {complex(i,j): c for j, r in enumerate(lines)
-                     for i, c in  enumerate(r.strip()) if c != '#'}
+            self.grid = Grid.from_lines(map_data)
 
-        self.rows = int(max(n.imag for n in self._map))+1
-        self.cols = int(max(n.real for n in self._map))+1+1
+        self.rows = self.grid.height
+        self.cols = self.grid.width
 
-        self.start = complex(1,0)
-        self.finish = complex(self.cols-2, self.rows-1)
-
-    # def get_start(self):
-    #     """Return the start location on the map"""
-    #     starts = list(filter(lambda x: self._map[x] == 'S', self._map))
-
-    #     assert len(starts) == 1
-    #     return starts[0]
+        self.start = self.grid.index(1, 0)
+        self.finish = self.grid.index(self.cols-2, self.rows-1)
 
     def get_nodes(self):
-        """Returns dictionary of nodes on the map, keys are complex(x,y).
+        """Returns dictionary of nodes on the map, keys are Grid indexes.
             Nodes are where two or more paths join
         """
         if not self.nodes:
+            grid = self.grid
             nodes = {}
             nodes[self.start] = []
             nodes[self.finish] = []
 
-            for location in self._map:
-                adjacent = []
-                for direction in (1, -1, 1j, -1j):
-                    symbol = self.get(location+direction)
-                    if symbol and symbol != '#':
-                        adjacent.append(location+direction)
+            for location in range(len(grid.cells)):
+                if not grid.valid(location) or grid[location] == FOREST:
+                    continue
 
+                adjacent = [n for n in grid.neighbors(location) if grid[n] != FOREST]
                 if len(adjacent) >= 3: # and not location in nodes:
                     nodes[location] = []
 
@@ -130,8 +122,8 @@ class Map:
     def print(self, highlights=None):
         """Pretty print map in readable form"""
 
-        print('start', c_str(self.start), self.get(self.start))
-        print('finish', c_str(self.finish), self.get(self.finish))
+        print('start', self.grid.coords(self.start), chr(self.grid[self.start]))
+        print('finish', self.grid.coords(self.finish), chr(self.grid[self.finish]))
 
         print('  ', end='')
         _ = [print(f'{x%10}', end='') for x in range(self.cols)]
@@ -141,11 +133,12 @@ class Map:
             print(f'\n{y%10}:', end='')
             for x in range(self.cols):
                 symbol = self.get(x, y)
-                if not symbol:
+                location = self.grid.index(x, y)
+                if symbol == '#':
                     print(ascii_color('777777', '~'), end='')
-                elif highlights and complex(x,y) in highlights:
+                elif highlights and location in highlights:
                     print(ascii_color('ffffff', symbol), end='')
-                elif complex(x,y) in (self.start, self.finish):
+                elif location in (self.start, self.finish):
                     print(ascii_color('ff0000', symbol), end='')
                 else:
                     print(symbol, end='')
@@ -158,12 +151,16 @@ class Map:
 
     def __str__(self):
         """Return string representation"""
-        return 'Empty'
+        return f'Map {self.cols}x{self.rows}'
 
 def find_neighbors(trail_map, node, check_neighbor):
     """Return list of neighbors for a node.
         Use check_neighbor to check if traversal is valid with given direction
     """
+    grid = trail_map.grid
+    nodes = trail_map.get_nodes()
+    directions = tuple(zip(Grid.DIRECTIONS, grid.offsets))
+
     neighbors = {}
     paths = [(0, node)]
 
@@ -171,24 +168,20 @@ def find_neighbors(trail_map, node, check_neighbor):
     visited = set()
     visited.add(node)
 
-    # print(f'Find neighbors for {node}')
     while paths:
         distance, position = paths.pop()
 
-        for direction in (1, -1, 1j, -1j):
-            neighbor = position+direction
+        for direction, offset in directions:
+            neighbor = position+offset
             if neighbor not in visited:
                 visited.add(neighbor)
-                symbol = trail_map.get(neighbor)
-                if symbol and check_neighbor(symbol, direction):
-                    if neighbor in trail_map.get_nodes():
-                        # print(f'\tfound {neighbor} {neighbor_symbol}')
+                if grid.valid(neighbor) and check_neighbor(chr(grid[neighbor]), direction):
+                    if neighbor in nodes:
                         neighbors[neighbor] = distance+1
                     else:
-                        # print(f'\twalk {neighbor} {neighbor_symbol}')
                         paths.append((distance+1, neighbor))
 
-    # returns list[tuple(node: complex, distance: int)]
+    # returns dict[node: int, distance: int]
     return neighbors
 
 def get_node_neighbors(trail_map, check_neighbor):
@@ -202,7 +195,9 @@ def get_node_neighbors(trail_map, check_neighbor):
     return dict(zip(trail_map.get_nodes(), neighbors))
 
 def is_valid_direction(symbol, direction):
-    """Return True if the given symbol can be traversed in direction"""
+    """Return True if the given symbol can be traversed in direction
+        direction is one of 'E', 'S', 'W', 'N'
+    """
     if symbol == '.':
         return True
 
@@ -210,13 +205,13 @@ def is_valid_direction(symbol, direction):
         return False
 
     match symbol, direction:
-        case '^', -1j:
+        case '^', 'N':
             return True
-        case 'v', 1j:
+        case 'v', 'S':
             return True
-        case '<', -1:
+        case '<', 'W':
             return True
-        case '>', 1:
+        case '>', 'E':
             return True
 
     return False
@@ -230,19 +225,19 @@ def find_longest_directional_path(trail_map):
     tentative = []
     confirmed = set()
 
-    heappush(tentative, (0, c_tup(trail_map.start)))
+    heappush(tentative, (0, trail_map.start))
     while tentative:
         distance, node = heappop(tentative)
         confirmed.add((distance, node))
         # print(f'confirmed {node}, {distance} steps')
 
         # Cannot early return here as we need to find the smallest
-        # if node == c_tup(trail_map.finish):
+        # if node == trail_map.finish:
         #     return distance
 
-        for neighbor, neighbor_distance in nodes[complex(*node)].items():
+        for neighbor, neighbor_distance in nodes[node].items():
             # print(f'\ttentative {neighbor}, {distance-neighbor_distance} steps')
-            heappush(tentative, (distance-neighbor_distance, c_tup(neighbor)))
+            heappush(tentative, (distance-neighbor_distance, neighbor))
 
     longest = -min(map(lambda x: x[0], confirmed))
     return longest
@@ -291,23 +286,22 @@ def find_longest_undirected_path(trail_map):
 def print_dot(nodes):
     """Print GraphViz `.dot` digraph of nodes"""
     def p_node(node):
-        return f'{int(node.real):03}{int(node.imag):03}'
+        return f'{node:06}'
 
     print('digraph {')
     for node, neighbors in nodes.items():
-        for n in neighbors:
+        for n, distance in neighbors.items():
             if node in nodes[n]:
-                print(f'{p_node(node)} -- {p_node(n[0])} [label="{n[1]}"]')
+                print(f'{p_node(node)} -- {p_node(n)} [label="{distance}"]')
             else:
-                print(f'{p_node(node)} -> {p_node(n[0])} [label="{n[1]}"]')
+                print(f'{p_node(node)} -> {p_node(n)} [label="{distance}"]')
 
     print('}')
 
 def load_file(filename: str):
     """Load lines from file into ___"""
     try:
-        with open(filename, 'r', encoding='utf-8') as file:
-            return Map(file)
+        return Map(mapped_grid(filename))
 
     except FileNotFoundError:
         print('File %s not found.', filename)
@@ -318,13 +312,13 @@ def main():
     """Main Routine, does all the work"""
     parser = argparse.ArgumentParser()
     parser.add_argument('filename', default='input.txt', nargs='+')
-    parser.add_argument('-p', '--profile', action='store_true')
+    add_profile_arguments(parser)
     args = parser.parse_args()
 
-    for filename in args.filename:
-        print(filename)
+    with profiler(args.profile, args.profile_output):
+        for filename in args.filename:
+            print(filename)
 
-        with Profile() as profile:
             trail_map = load_file(filename)
 
             # trail_map.print()
@@ -345,10 +339,7 @@ def main():
             longest_path = find_longest_undirected_path(trail_map)
             print(f'\t2. The longest overall path is: {longest_path:,}')
 
-        print()
-
-    if args.profile:
-        profile.print_stats('cumtime')
+            print()
 
 if __name__ == '__main__':
     main()
@@ -4,12 +4,20 @@ Advent of Code 2023 - Day 24: Never Tell Me The Odds
 Stephen Houser <stephenhouser@gmail.com>
 """
 
+import os
+import sys
 import re
 import argparse
 import unittest
-from cProfile import Profile
+import importlib.util
 from itertools import combinations
-import z3
+
+# shared modules (performance.py) live in the directory above
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from performance import add_profile_arguments, profiler    # pylint: disable=wrong-import-position
+
+# z3 is slow to import and optional, it is only imported by find_rock_z3()
+HAVE_Z3 = importlib.util.find_spec('z3') is not None
 
 class TestAOC(unittest.TestCase):
     """Test Advent of Code"""
@@ -38,6 +46,7 @@ class TestAOC(unittest.TestCase):
         rock = find_rock_geometric(load_file('test.txt'))
         self.assertEqual(sum(rock.position), 47)
 
+    @unittest.skipUnless(HAVE_Z3, 'z3-solver is not installed')
     def test_part2_example_z3(self):
         """Part 2 solution for test.txt"""
         rock = find_rock_z3(load_file('test.txt'))
@@ -48,6 +57,7 @@ class TestAOC(unittest.TestCase):
         rock = find_rock_geometric(load_file('input.txt'))
         self.assertEqual(sum(rock.position), 618_534_564_836_937)
 
+    @unittest.skipUnless(HAVE_Z3, 'z3-solver is not installed')
     def test_part2_solution_z3(self):
         """Part 2 solution for input.txt"""
         rock = find_rock_z3(load_file('input.txt'))
@@ -251,6 +261,8 @@ def find_rock_z3(stones):
         Adapted from: [4HbQ](https://www.reddit.com/user/4HbQ/)
         in [2023 Day 24 Solutions](https://www.reddit.com/r/adventofcode/comments/18pnycy/comment/keq6pj1/)
     """
+    import z3   # pylint: disable=import-outside-toplevel
+
     # solve for rock and it's velocity across time
     rock = z3.RealVector('r', 3)
     velo = z3.RealVector('v', 3)
@@ -286,13 +298,16 @@ def main():
     """Main Routine, does all the work"""
     parser = argparse.ArgumentParser()
     parser.add_argument('filename', default='input.txt', nargs='+')
-    parser.add_argument('-p', '--profile', action='store_true')
+    parser.add_argument('-s', '--solver', choices=('z3', 'geometric'),
+                        default='z3' if HAVE_Z3 else 'geometric',
+                        help='part 2 solver (default z3 if it is installed)')
+    add_profile_arguments(parser)
     args = parser.parse_args()
 
-    for filename in args.filename:
-        print(filename)
+    with profiler(args.profile, args.profile_output):
+        for filename in args.filename:
+            print(filename)
 
-        with Profile() as profile:
             stones = load_file(filename)
             # print_stones(stones)
 
@@ -315,13 +330,13 @@ def main():
             # rock = find_rock_geometric(stones)
             # print(f'\t2. The rock {rock} gives answer: {sum(rock.position):,}')
 
-            rock = find_rock_z3(stones)
+            if args.solver == 'z3':
+                rock = find_rock_z3(stones)
+            else:
+                rock = find_rock_geometric(stones)
             print(f'\t2. The rock {rock} gives answer: {sum(rock.position):,}')
 
-        print()
-
-    if args.profile:
-        profile.print_stats('cumtime')
+            print()
 
 if __name__ == '__main__':
     main()
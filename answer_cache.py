@@ -0,0 +1,274 @@
+#!/usr/bin/env python
+"""
+Advent of Code 2023 - Persistent answer cache
+Stephen Houser <stephenhouser@gmail.com>
+
+Remembers answers in a local SQLite file so that slow solutions are only
+run again when something they depend on changes. Answers are keyed by
+(day, part, solver, SHA-256 of the input bytes, SHA-256 of the source).
+The source hash covers the solver's module and the shared modules (grid.py,
+puzzle_input.py, ...) it imports, so editing any of them is a cache miss.
+
+The AOC_ANSWER_CACHE environment variable controls the cache for the tests
+and run_all.py: 'off' bypasses it, 'refresh' recomputes and replaces the
+saved answers. AOC_ANSWER_CACHE_FILE moves the database.
+
+    python answer_cache.py              # list saved answers
+    python answer_cache.py --clear 16   # forget day 16
+"""
+
+import os
+import re
+import json
+import time
+import sqlite3
+import hashlib
+import inspect
+import argparse
+import tempfile
+import unittest
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_FILE = os.path.join(ROOT, '.answer-cache.sqlite')
+MODES = ('on', 'off', 'refresh')
+
+SCHEMA = '''
+CREATE TABLE IF NOT EXISTS answers (
+    day INTEGER NOT NULL,
+    part TEXT NOT NULL,
+    solver TEXT NOT NULL,
+    input_sha256 TEXT NOT NULL,
+    source_sha256 TEXT NOT NULL,
+    answer TEXT NOT NULL,
+    seconds REAL,
+    created TEXT,
+    PRIMARY KEY (day, part, solver, input_sha256)
+)'''
+
+
+class TestAnswerCache(unittest.TestCase):
+    """Test answer cache"""
+
+    def setUp(self):
+        # pylint: disable=consider-using-with
+        self.directory = tempfile.TemporaryDirectory()
+        self.input = os.path.join(self.directory.name, 'input.txt')
+        with open(self.input, 'w', encoding='utf-8') as file:
+            file.write('1 2 3\n')
+        self.cache = AnswerCache(os.path.join(self.directory.name, 'cache.sqlite'))
+        self.calls = 0
+
+    def tearDown(self):
+        self.cache.close()
+        self.directory.cleanup()
+
+    def solve(self, filename):
+        """Count calls to a 'solver'"""
+        self.calls += 1
+        with open(filename, encoding='utf-8') as file:
+            return sum(map(int, file.read().split()))
+
+    def test_hit(self):
+        """Second call with the same input is answered from the cache"""
+        self.assertEqual(self.cache.answer(self.solve, self.input), 6)
+        self.assertEqual(self.cache.answer(self.solve, self.input), 6)
+        self.assertEqual(self.calls, 1)
+
+    def test_input_changed(self):
+        """Different input bytes are a miss"""
+        self.cache.answer(self.solve, self.input)
+        with open(self.input, 'w', encoding='utf-8') as file:
+            file.write('1 2 4\n')
+        self.assertEqual(self.cache.answer(self.solve, self.input), 7)
+        self.assertEqual(self.calls, 2)
+
+    def test_modes(self):
+        """Bypass and refresh always run the solver"""
+        self.cache.answer(self.solve, self.input)
+        self.cache.mode = 'off'
+        self.cache.answer(self.solve, self.input)
+        self.cache.mode = 'refresh'
+        self.cache.answer(self.solve, self.input)
+        self.assertEqual(self.calls, 3)
+        self.assertEqual(len(self.cache.entries()), 1)
+
+    def test_clear(self):
+        """Clearing a day forgets its answers"""
+        self.cache.put(3, 'part1', 'x:f', 'in', 'src', 42)
+        self.cache.put(4, 'part1', 'x:f', 'in', 'src', 43)
+        self.cache.clear([3])
+        self.assertIsNone(self.cache.get(3, 'part1', 'x:f', 'in', 'src'))
+        self.assertEqual(self.cache.get(4, 'part1', 'x:f', 'in', 'src'), 43)
+
+
+def file_sha256(filename):
+    """Return the SHA-256 hex digest of the contents of filename"""
+    digest = hashlib.sha256()
+    with open(filename, 'rb') as file:
+        for chunk in iter(lambda: file.read(2**20), b''):
+            digest.update(chunk)
+
+    return digest.hexdigest()
+
+def source_files(*modules):
+    """Return the sorted source files of modules and of the shared modules
+       (in the repository root) that they import from, recursively.
+    """
+    files = set()
+    pending = list(modules)
+    while pending:
+        module = pending.pop()
+        filename = os.path.abspath(module.__file__)
+        if filename in files:
+            continue
+
+        files.add(filename)
+        for value in vars(module).values():
+            shared = inspect.getmodule(value)
+            shared_file = getattr(shared, '__file__', None)
+            if shared_file and os.path.dirname(os.path.abspath(shared_file)) == ROOT:
+                pending.append(shared)
+
+    return sorted(files)
+
+def source_sha256(*modules):
+    """Return one SHA-256 hex digest over the source of modules"""
+    digest = hashlib.sha256()
+    for filename in source_files(*modules):
+        with open(filename, 'rb') as file:
+            digest.update(file.read())
+
+    return digest.hexdigest()
+
+def solver_name(func):
+    """Return 'file.py:qualname' for func, stable across __main__ and imports"""
+    return f'{os.path.basename(func.__code__.co_filename)}:{func.__qualname__}'
+
+def solver_day(func):
+    """Return the day number from the Day-NN directory holding func, or 0"""
+    directory = os.path.basename(os.path.dirname(func.__code__.co_filename))
+    match = re.fullmatch(r'Day-(\d+)', directory)
+    return int(match.group(1)) if match else 0
+
+
+class AnswerCache:
+    """Answers saved in an SQLite database.
+       mode 'on' uses saved answers, 'off' ignores the cache entirely and
+       'refresh' always recomputes and saves the new answer.
+    """
+    def __init__(self, filename=None, mode=None):
+        self.filename = filename or os.environ.get('AOC_ANSWER_CACHE_FILE', DEFAULT_FILE)
+        self.mode = mode or os.environ.get('AOC_ANSWER_CACHE', 'on')
+        assert self.mode in MODES, f'cache mode must be one of {MODES}'
+        self._db = None
+
+    @property
+    def db(self):
+        """Return the database connection, opening it on first use"""
+        if self._db is None:
+            # workers in run_all.py may write at the same time
+            self._db = sqlite3.connect(self.filename, timeout=30)
+            self._db.execute(SCHEMA)
+        return self._db
+
+    def close(self):
+        """Close the database connection"""
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+
+    def get(self, day, part, solver, input_sha, source_sha):
+        """Return the saved answer, None if there is none for this source"""
+        if self.mode != 'on':
+            return None
+
+        row = self.db.execute(
+            'SELECT answer FROM answers WHERE day=? AND part=? AND solver=? '
+            'AND input_sha256=? AND source_sha256=?',
+            (day, part, solver, input_sha, source_sha)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def put(self, day, part, solver, input_sha, source_sha, answer, seconds=None):
+        """Save an answer, replacing one from an older version of the source"""
+        if self.mode == 'off' or answer is None:
+            return
+
+        try:
+            text = json.dumps(answer)
+        except TypeError:   # not a plain value, just don't cache it
+            return
+
+        with self.db:
+            self.db.execute(
+                'INSERT OR REPLACE INTO answers VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+                (day, part, solver, input_sha, source_sha, text, seconds,
+                 time.strftime('%Y-%m-%dT%H:%M:%S')))
+
+    def answer(self, solver, filename, *args, loader=None, part=None):
+        """Return solver(loader(filename), *args), from the cache if the
+           input and source have not changed since it was last computed.
+           Without a loader the solver is passed the filename.
+        """
+        day = solver_day(solver)
+        part = part or solver.__name__ + (repr(args) if args else '')
+        funcs = [solver, loader] if loader else [solver]
+        name = ','.join(map(solver_name, funcs))
+        input_sha = file_sha256(filename)
+        source_sha = source_sha256(*{inspect.getmodule(f) for f in funcs})
+
+        result = self.get(day, part, name, input_sha, source_sha)
+        if result is None:
+            t0 = time.perf_counter()
+            result = solver(loader(filename) if loader else filename, *args)
+            self.put(day, part, name, input_sha, source_sha, result,
+                     time.perf_counter() - t0)
+
+        return result
+
+    def clear(self, days=None):
+        """Forget the saved answers for days (default all)"""
+        with self.db:
+            if days:
+                self.db.executemany('DELETE FROM answers WHERE day=?',
+                                    [(day,) for day in days])
+            else:
+                self.db.execute('DELETE FROM answers')
+
+    def entries(self, days=None):
+        """Return (day, part, solver, answer, seconds, created) rows"""
+        rows = self.db.execute(
+            'SELECT day, part, solver, answer, seconds, created FROM answers '
+            'ORDER BY day, part').fetchall()
+        return [row for row in rows if not days or row[0] in days]
+
+
+def cached_answer(solver, filename, *args, loader=None, part=None):
+    """Return solver(loader(filename), *args) using the default cache"""
+    cache = AnswerCache()
+    try:
+        return cache.answer(solver, filename, *args, loader=loader, part=part)
+    finally:
+        cache.close()
+
+def main():
+    """Main Routine, does all the work"""
+    parser = argparse.ArgumentParser(description=__doc__.strip().split('\n')[0])
+    parser.add_argument('days', type=int, nargs='*',
+                        help='days to list or clear (default all)')
+    parser.add_argument('--clear', action='store_true',
+                        help='forget the saved answers')
+    parser.add_argument('-f', '--file', help=f'cache file (default {DEFAULT_FILE})')
+    args = parser.parse_args()
+
+    cache = AnswerCache(args.file, mode='on')
+    if args.clear:
+        cache.clear(args.days)
+
+    for day, part, solver, answer, seconds, created in cache.entries(args.days):
+        seconds = f'{seconds:0.4f}' if seconds is not None else '-'
+        print(f'{day:3} {part:24} {solver:40} {seconds:>9} {created}  {answer}')
+
+    cache.close()
+
+if __name__ == '__main__':
+    main()
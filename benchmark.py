@@ -0,0 +1,232 @@
+#!/usr/bin/env python
+"""
+Advent of Code 2023 - Benchmark runner
+Stephen Houser <stephenhouser@gmail.com>
+
+Times loading/parsing, part 1 and part 2 of each day separately with warmup
+and repeated runs. Each day runs in a fresh process so peak memory (RSS) is
+reported per day. Results are appended to a history file (.csv or .json)
+so regressions can be tracked across commits. With --memory each phase is
+run once more under tracemalloc for its peak allocation, allocated blocks
+and garbage collections.
+"""
+
+import io
+import os
+import csv
+import json
+import time
+import argparse
+import statistics
+import subprocess
+import multiprocessing
+from functools import partial
+from contextlib import redirect_stdout, nullcontext
+
+from days import ROOT, find_days
+from performance import perf_context, peak_rss
+
+HISTORY_FIELDS = ('timestamp', 'commit', 'day', 'input', 'phase', 'runs',
+                  'median', 'p95', 'stdev', 'peak_rss', 'answer', 'error',
+                  'alloc_peak', 'blocks', 'collections')
+
+
+def summarize(times):
+    """Return (median, p95, stdev) of a list of run times"""
+    if not times:
+        return (None, None, None)
+
+    if len(times) == 1:
+        return (times[0], times[0], 0.0)
+
+    p95 = statistics.quantiles(times, n=20, method='inclusive')[-1]
+    return (statistics.median(times), p95, statistics.stdev(times))
+
+def run_phase(func, setup, verbose, memory=False):
+    """Return (answer, PerfRecord) for one run of func(setup())"""
+    data = setup()
+    with nullcontext() if verbose else redirect_stdout(io.StringIO()):
+        with perf_context(verbose=False, memory=memory) as record:
+            answer = func(data)
+
+    return answer, record
+
+def time_phase(func, setup, repeat, warmup, verbose):
+    """Return (answer, times) for running func(setup()) repeat times.
+
+       setup() is called (untimed) before every run so that solutions which
+       modify their input always start from freshly loaded data.
+    """
+    answer, times = None, []
+    for run in range(warmup + repeat):
+        answer, record = run_phase(func, setup, verbose)
+        if run >= warmup:
+            times.append(record.elapsed)
+
+    return answer, times
+
+def benchmark_day(solution, filename, repeat=5, warmup=1, verbose=False,
+                  memory=False):
+    """Return a list of result rows (one for each phase) for one day.
+       With memory=True each phase is run once more (untimed) to trace
+       its memory use.
+    """
+    results = []
+
+    def result(phase, times=(), answer=None, error=None, traced=None):
+        median, p95, stdev = summarize(list(times))
+        results.append({'day': solution.day, 'input': filename,
+                        'phase': phase, 'runs': len(times),
+                        'median': median, 'p95': p95, 'stdev': stdev,
+                        'answer': answer, 'error': error,
+                        'alloc_peak': traced.peak if traced else None,
+                        'blocks': traced.blocks if traced else None,
+                        'collections': sum(traced.collections) if traced else None})
+
+    def trace(func, setup):
+        return run_phase(func, setup, verbose, memory=True)[1] if memory else None
+
+    input_file = solution.input_file(filename)
+    if not os.path.exists(input_file):
+        result('load', error=f'{filename} not found')
+        return results
+
+    # Solutions open test files relative to their own directory
+    os.chdir(solution.directory)
+
+    def load():
+        return solution.load(module, input_file)
+
+    try:
+        module = solution.import_module()
+        _, times = time_phase(lambda _: load(), lambda: None,
+                              repeat, warmup, verbose)
+        result('load', times, traced=trace(lambda _: load(), lambda: None))
+    except Exception as error:  # pylint: disable=broad-except
+        result('load', error=repr(error))
+        return results
+
+    for phase, func in solution.parts():
+        try:
+            answer, times = time_phase(partial(func, module), load,
+                                       repeat, warmup, verbose)
+            result(phase, times, answer, traced=trace(partial(func, module), load))
+        except Exception as error:  # pylint: disable=broad-except
+            result(phase, error=repr(error))
+
+    # peak memory is for the whole process, so the same for every phase
+    for row in results:
+        row['peak_rss'] = peak_rss()
+
+    return results
+
+def run_isolated(day, *args):
+    """Pool worker: benchmark one day (in its own process)"""
+    return benchmark_day(find_days([day])[0], *args)
+
+def git_commit():
+    """Return the short hash of the current git commit, or '' if unknown"""
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'],
+                              cwd=ROOT, capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ''
+
+def save_history(filename, results):
+    """Append results to the history file; JSON lines or CSV by extension"""
+    stamp = time.strftime('%Y-%m-%dT%H:%M:%S')
+    commit = git_commit()
+    rows = [{'timestamp': stamp, 'commit': commit, **row} for row in results]
+
+    if filename.endswith(('.json', '.jsonl')):
+        with open(filename, 'a', encoding='utf-8') as file:
+            for row in rows:
+                file.write(json.dumps(row) + '\n')
+    else:
+        # keep to the columns of an existing file, older ones have fewer
+        fields = HISTORY_FIELDS
+        new_file = not os.path.exists(filename)
+        if not new_file:
+            with open(filename, 'r', encoding='utf-8', newline='') as file:
+                fields = next(csv.reader(file), HISTORY_FIELDS)
+
+        with open(filename, 'a', encoding='utf-8', newline='') as file:
+            writer = csv.DictWriter(file, fields, extrasaction='ignore')
+            if new_file:
+                writer.writeheader()
+            writer.writerows(rows)
+
+def load_history(filename):
+    """Return the rows saved in a history file, oldest first"""
+    if not os.path.exists(filename):
+        return []
+
+    with open(filename, 'r', encoding='utf-8') as file:
+        if filename.endswith(('.json', '.jsonl')):
+            return [json.loads(line) for line in file if line.strip()]
+
+        return list(csv.DictReader(file))
+
+def format_seconds(seconds):
+    """Return seconds formatted for the results table"""
+    if seconds is None or seconds == '':
+        return '-'
+
+    return f'{float(seconds):0.4f}'
+
+def print_results(results, header=True, memory=False):
+    """Pretty print benchmark results as a table"""
+    if header:
+        print(f'{"day":>3} {"phase":6} {"runs":>4} {"median":>9} {"p95":>9} '
+              f'{"stdev":>9} {"peak MB":>8}'
+              + (f' {"alloc MB":>8} {"blocks":>9} {"gc":>4}' if memory else '')
+              + '  answer')
+    for row in results:
+        rss = f'{row["peak_rss"] / 2**20:8.1f}' if row.get('peak_rss') else '       -'
+        answer = row['error'] if row['error'] else row['answer']
+        traced = ''
+        if memory:
+            alloc = f'{row["alloc_peak"] / 2**20:8.1f}' if row.get('alloc_peak') is not None else '       -'
+            blocks = row.get('blocks')
+            collections = row.get('collections')
+            traced = (f' {alloc} {"-" if blocks is None else blocks:>9}'
+                      f' {"-" if collections is None else collections:>4}')
+        print(f'{row["day"]:3} {row["phase"]:6} {row["runs"]:4} '
+              f'{format_seconds(row["median"]):>9} {format_seconds(row["p95"]):>9} '
+              f'{format_seconds(row["stdev"]):>9} {rss}{traced}  {answer}')
+
+def main():
+    """Main Routine, does all the work"""
+    parser = argparse.ArgumentParser(description=__doc__.strip().split('\n')[0])
+    parser.add_argument('days', type=int, nargs='*',
+                        help='days to benchmark (default all)')
+    parser.add_argument('-i', '--input', default='input.txt',
+                        help='input file name in each Day-* directory')
+    parser.add_argument('-r', '--repeat', type=int, default=5)
+    parser.add_argument('-w', '--warmup', type=int, default=1)
+    parser.add_argument('-o', '--history',
+                        default=os.path.join(ROOT, 'benchmark-history.csv'),
+                        help='history file to append to (.csv or .json)')
+    parser.add_argument('-n', '--no-history', action='store_true')
+    parser.add_argument('-v', '--verbose', action='store_true',
+                        help='show output printed by the solutions')
+    parser.add_argument('-m', '--memory', action='store_true',
+                        help='trace peak allocation, blocks and gc runs')
+    args = parser.parse_args()
+
+    results = []
+    # maxtasksperchild=1 gives each day a fresh process (and peak RSS)
+    with multiprocessing.Pool(processes=1, maxtasksperchild=1) as pool:
+        for solution in find_days(args.days):
+            task = (solution.day, args.input, args.repeat, args.warmup,
+                     args.verbose, args.memory)
+            day_results = pool.apply(run_isolated, task)
+            print_results(day_results, header=not results, memory=args.memory)
+            results.extend(day_results)
+
+    if not args.no_history:
+        save_history(args.history, results)
+
+if __name__ == '__main__':
+    main()
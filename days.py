@@ -0,0 +1,238 @@
+#!/usr/bin/env python
+"""
+Advent of Code 2023 - Registry of daily solutions
+Stephen Houser <stephenhouser@gmail.com>
+
+Describes how to load the puzzle input and solve each part for every day
+so that tools (benchmarks, drivers) can run them without going through
+each day's main().
+"""
+
+import os
+import glob
+import math
+import importlib.util
+from functools import reduce
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+
+
+class DaySolution:
+    """Describes how to load and solve one day's puzzle.
+
+       load(module, filename) returns the parsed puzzle data
+       part1(module, data) and part2(module, data) return the answers
+    """
+    def __init__(self, day, load, part1, part2=None):
+        self.day = day
+        self.load = load
+        self.part1 = part1
+        self.part2 = part2
+
+    @property
+    def directory(self):
+        """Return the directory holding this day's solution"""
+        return os.path.join(ROOT, f'Day-{self.day:02}')
+
+    @property
+    def source(self):
+        """Return the path to this day's solution module"""
+        sources = glob.glob(os.path.join(self.directory, '*.py'))
+        assert len(sources) == 1, f'Day {self.day} has {len(sources)} modules'
+        return sources[0]
+
+    def input_file(self, filename='input.txt'):
+        """Return the path to an input file for this day"""
+        return os.path.join(self.directory, filename)
+
+    def import_module(self):
+        """Import and return this day's solution module"""
+        name = os.path.splitext(os.path.basename(self.source))[0]
+        spec = importlib.util.spec_from_file_location(name, self.source)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        return module
+
+    def parts(self):
+        """Return list of (name, function) for the parts that can be solved"""
+        parts = [('part1', self.part1), ('part2', self.part2)]
+        return [(name, func) for name, func in parts if func]
+
+    def __repr__(self):
+        """Return REPL representation"""
+        return str(self)
+
+    def __str__(self):
+        """Return string representation"""
+        return f'Day {self.day:02}'
+
+
+def product(values):
+    """Return the product of values"""
+    return reduce(lambda a, c: a * c, values, 1)
+
+def is_test_file(filename):
+    """Return True if filename is one of the small example files"""
+    return os.path.basename(filename).startswith('test')
+
+#
+# Helpers for days where main() does more than call one function
+#
+def day03_load(m, filename):
+    """Load the engine map and find its symbols and parts"""
+    engine_map = m.load_map(filename)
+    return (m.find_symbols(engine_map), m.find_parts(engine_map))
+
+def day05_part2(m, data):
+    """Minimum location for the seed ranges (as computed in main)"""
+    (seeds, almanac) = data
+    return m.locate_seeds(m.seed_ranges(seeds), 'seed', almanac)[0][0]
+
+def day07_winnings(hands, rank, score):
+    """Return the total winnings for hands sorted by rank and score"""
+    sorted_hands = sorted(hands, key=lambda x: (rank(x.hand), score(x.hand)))
+    return sum(map(lambda h, i: h.bid*i, sorted_hands, range(1, len(hands)+1)))
+
+def day11_distances(m, space, expansion):
+    """Sum of galaxy distances after expanding space"""
+    galaxies = m.find_galaxies(space)
+    m.expand_galaxies(space, galaxies, expansion)
+    return m.sum_distances(galaxies)
+
+def day24_load(m, filename):
+    """Load hailstones and the test area that goes with the input"""
+    if is_test_file(filename):
+        test_area = ((7, 7, 0), (27, 27, 0))
+    else:
+        test_area = ((200_000_000_000_000, 200_000_000_000_000, 0),
+                     (400_000_000_000_000, 400_000_000_000_000, 0))
+    return (m.load_file(filename), test_area)
+
+def day25_part1(m, data):
+    """Product of the disconnected sets, using the wires found by hand"""
+    (machine, filename) = data
+    if is_test_file(filename):
+        cuts = (('hfx', 'pzl'), ('bvb', 'cmg'), ('jqt', 'nvd'))
+    else:
+        cuts = (('qfb', 'vkd'), ('hqq', 'xxq'), ('kgl', 'xzz'))
+
+    for wire in cuts:
+        machine.connections.remove(wire)
+
+    return product(m.count_reachable_nodes(node, machine) for node in cuts[0])
+
+
+SOLUTIONS = {s.day: s for s in (
+    DaySolution(1,
+        lambda m, f: f,
+        lambda m, f: m.bulk_calibration1(f),
+        lambda m, f: m.reduce_calibration(f, m.line_value2)),
+    DaySolution(2,
+        lambda m, f: m.load_game_store(f),
+        lambda m, d: sum(d.valid_ids((12, 13, 14))),
+        lambda m, d: sum(d.powers())),
+    DaySolution(3,
+        day03_load,
+        lambda m, d: sum(m.part_numbers(*d)),
+        lambda m, d: sum(m.gear_ratios(*d))),
+    DaySolution(4,
+        lambda m, f: m.load_card_matches(f),
+        lambda m, d: sum(map(m.match_score, d)),
+        lambda m, d: m.count_copies(d)),
+    DaySolution(5,
+        lambda m, f: m.load_almanac(f),
+        lambda m, d: min(map(d[1].locate, d[0])),
+        day05_part2),
+    DaySolution(6,
+        lambda m, f: (m.load_file(f), m.load_race_2(f)),
+        lambda m, d: product(map(m.race_times_exact, d[0])),
+        lambda m, d: product(map(m.race_times_exact, d[1]))),
+    DaySolution(7,
+        lambda m, f: m.load_file(f),
+        lambda m, d: day07_winnings(d, m.rank_hand, m.score_hand),
+        lambda m, d: day07_winnings(d, m.joker_rank, m.joker_score)),
+    DaySolution(8,
+        lambda m, f: m.load_file(f),
+        lambda m, d: m.traverse(lambda l: l == 'ZZZ', d[1]['AAA'], *d),
+        lambda m, d: math.lcm(*(m.traverse(lambda l: l[2] == 'Z', n, *d)
+                                for n in d[1].values() if n.label[2] == 'A'))),
+    DaySolution(9,
+        lambda m, f: m.load_file(f),
+        lambda m, d: sum(m.predict_forward(s)[-1] for s in d),
+        lambda m, d: sum(m.predict_backward(s)[0] for s in d)),
+    DaySolution(10,
+        lambda m, f: m.load_file(f),
+        lambda m, d: m.farthest_tile(d),
+        lambda m, d: m.enclosed_tiles(d)),
+    DaySolution(11,
+        lambda m, f: m.load_file(f),
+        lambda m, d: day11_distances(m, d, 2),
+        lambda m, d: day11_distances(m, d, 1_000_000)),
+    DaySolution(12,
+        lambda m, f: m.load_file(f),
+        lambda m, d: sum(map(m.count_matches, m.expand_records(d, 1))),
+        lambda m, d: sum(map(m.count_matches, m.expand_records(d, 5)))),
+    DaySolution(13,
+        lambda m, f: m.load_file(f),
+        lambda m, d: sum(m.summarize_reflection(x, 0) for x in d),
+        lambda m, d: sum(m.summarize_reflection(x, 1) for x in d)),
+    DaySolution(14,
+        lambda m, f: m.load_file(f),
+        lambda m, d: m.calculate_weight(m.tilt_north(d)),
+        lambda m, d: m.calculate_weight(m.tilt_cycles(d, 1_000_000_000))),
+    DaySolution(15,
+        lambda m, f: m.load_file(f),
+        lambda m, d: m.hash_summary(d),
+        lambda m, d: m.focus_power(m.initialize_mirrors(d))),
+    DaySolution(16,
+        lambda m, f: m.mapped_grid(f),
+        lambda m, d: m.traverse_grid(d, [(-1, 1)]),
+        lambda m, d: m.maximum_beam_grid(d)),
+    DaySolution(17,
+        lambda m, f: m.load_file(f),
+        lambda m, d: m.crucible_path(d, 1, 3),
+        lambda m, d: m.crucible_path(d, 4, 10)),
+    DaySolution(18,
+        lambda m, f: (m.load_file(f), m.load_file(f, m.parse_instruction2)),
+        lambda m, d: m.lagoon_volume_shoelace(d[0]),
+        lambda m, d: m.lagoon_volume_shoelace(d[1])),
+    DaySolution(19,
+        lambda m, f: m.load_file(f),
+        lambda m, d: m.rating_sum(*d),
+        lambda m, d: m.accepted_combinations(d[0])),
+    DaySolution(20,
+        lambda m, f: m.attach_gates(m.load_file(f)),
+        lambda m, d: m.count_pulses(d, 1000),
+        lambda m, d: m.find_low_pulse(d, 'rx')),
+    DaySolution(21,
+        lambda m, f: m.load_file(f),
+        lambda m, d: m.find_gardens_fast(d, [64])[0],
+        lambda m, d: m.find_gardens_quadratic(d, 26_501_365)),
+    DaySolution(22,
+        lambda m, f: m.drop_slabs(m.load_file(f)),
+        lambda m, d: len(m.find_disintigratable(d)),
+        lambda m, d: sum(map(m.count_supported, d.slabs))),
+    DaySolution(23,
+        lambda m, f: m.load_file(f),
+        lambda m, d: m.find_longest_directional_path(d),
+        lambda m, d: m.find_longest_undirected_path(d)),
+    DaySolution(24,
+        day24_load,
+        lambda m, d: len(m.intersections_in_area(*d)),
+        lambda m, d: sum(m.find_rock_geometric(d[0]).position)),
+    DaySolution(25,
+        lambda m, f: (m.load_file(f), f),
+        day25_part1),
+)}
+
+def find_days(days=None):
+    """Return the solutions for the Day-* directories that exist on disk.
+       Limit to the list of day numbers in `days` if given.
+    """
+    found = []
+    for directory in sorted(glob.glob(os.path.join(ROOT, 'Day-*'))):
+        day = int(os.path.basename(directory).split('-')[1])
+        if day in SOLUTIONS and (not days or day in days):
+            found.append(SOLUTIONS[day])
+
+    return found
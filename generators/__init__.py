@@ -0,0 +1,27 @@
+"""
+Advent of Code 2023 - Synthetic puzzle input generators
+Stephen Houser <stephenhouser@gmail.com>
+
+One module per day (day01.py ... day25.py), each with a
+generate(rng, scale) function that returns the text of a valid puzzle input.
+scale=1 is roughly the size of a real input; scale=10 is ten times the
+work for a linear solution (grids grow in area, not side length).
+Inputs are seeded so the same (day, scale, seed) always gives the same text.
+
+    python -m generators 11 -s 100 > Day-11/synthetic.txt
+"""
+
+import random
+import importlib
+
+DAYS = range(1, 26)
+
+
+def generator(day):
+    """Return the generator module for day"""
+    return importlib.import_module(f'{__name__}.day{day:02}')
+
+def generate(day, scale=1.0, seed=0):
+    """Return the text of a synthetic puzzle input for day"""
+    rng = random.Random(f'{day}:{seed}')
+    return generator(day).generate(rng, scale)
@@ -0,0 +1,40 @@
+"""
+Advent of Code 2023 - Synthetic puzzle input generators
+Stephen Houser <stephenhouser@gmail.com>
+
+Write generated inputs to stdout, or to files named by --output which
+may use {day} and {scale}, e.g. -o 'Day-{day:02}/synthetic-x{scale:g}.txt'
+"""
+
+import sys
+import argparse
+
+from generators import DAYS, generate
+
+
+def main():
+    """Main Routine, does all the work"""
+    parser = argparse.ArgumentParser(prog='python -m generators',
+                                     description='Synthetic puzzle inputs')
+    parser.add_argument('days', type=int, nargs='*', default=list(DAYS))
+    parser.add_argument('-s', '--scale', type=float, default=1.0,
+                        help='size relative to a real input (default 1)')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('-o', '--output',
+                        help='output file name, may use {day} and {scale}')
+    args = parser.parse_args()
+
+    if not args.output and len(args.days) > 1:
+        parser.error('--output is needed to generate more than one day')
+
+    for day in args.days:
+        text = generate(day, args.scale, args.seed)
+        if args.output:
+            filename = args.output.format(day=day, scale=args.scale)
+            with open(filename, 'w', encoding='utf-8') as file:
+                file.write(text)
+        else:
+            sys.stdout.write(text)
+
+if __name__ == '__main__':
+    main()
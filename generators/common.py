@@ -0,0 +1,60 @@
+"""
+Advent of Code 2023 - Helpers shared by the input generators
+Stephen Houser <stephenhouser@gmail.com>
+"""
+
+import math
+import string
+
+
+def scaled(count, scale):
+    """Return count scaled by scale, at least 1"""
+    return max(1, round(count * scale))
+
+def scaled_side(side, scale):
+    """Return the side of a square grid with its area scaled by scale"""
+    return max(1, round(side * math.sqrt(scale)))
+
+def unique_names(rng, count, length=3, alphabet=string.ascii_lowercase,
+                 exclude=()):
+    """Return a list of count distinct random names.
+        Names get longer than length when there are not enough to choose from.
+    """
+    exclude = set(exclude)
+    while len(alphabet) ** length < count + len(exclude):
+        length += 1
+
+    names = []
+    for number in rng.sample(range(len(alphabet) ** length), count + len(exclude)):
+        name = ''
+        for _ in range(length):
+            number, digit = divmod(number, len(alphabet))
+            name += alphabet[digit]
+        if name not in exclude:
+            names.append(name)
+
+    return names[:count]
+
+def loop_path(rng, width, height, x0=0, y0=0):
+    """Return the (x, y) corners of a random simple rectilinear loop.
+        The loop is a comb: teeth of random width and depth hang down
+        from a top edge, all within width x height starting at (x0, y0).
+        The last corner joins back up with the first.
+    """
+    corners = [(x0, y0)]
+    x = x0
+    right = x0 + width - 1
+    while right - x >= 5:
+        tooth = rng.randint(2, min(right - x - 3, max(2, width // 8)))
+        depth = rng.randint(2, height - 1)
+        corners.append((x, y0 + depth))
+        corners.append((x + tooth, y0 + depth))
+        corners.append((x + tooth, y0 + 1))
+        x += tooth + 1
+        corners.append((x, y0 + 1))
+
+    depth = rng.randint(2, height - 1)
+    corners.append((x, y0 + depth))
+    corners.append((right, y0 + depth))
+    corners.append((right, y0))
+    return corners
@@ -0,0 +1,31 @@
+"""
+Advent of Code 2023 - Day 1: Trebuchet?! input generator
+Stephen Houser <stephenhouser@gmail.com>
+"""
+
+import string
+
+from generators.common import scaled
+
+WORDS = ('one', 'two', 'three', 'four', 'five', 'six', 'seven', 'eight', 'nine')
+
+
+def generate(rng, scale=1.0):
+    """Return lines of letters, digits and spelled out digits"""
+    lines = []
+    for _ in range(scaled(1000, scale)):
+        # every line has at least one real digit
+        tokens = [rng.choice(string.digits[1:])]
+        for _ in range(rng.randint(1, 8)):
+            kind = rng.random()
+            if kind < 0.3:
+                tokens.append(rng.choice(WORDS))
+            elif kind < 0.5:
+                tokens.append(rng.choice(string.digits[1:]))
+            else:
+                tokens.append(''.join(rng.choices(string.ascii_lowercase,
+                                                  k=rng.randint(1, 5))))
+        rng.shuffle(tokens)
+        lines.append(''.join(tokens))
+
+    return '\n'.join(lines)
@@ -0,0 +1,21 @@
+"""
+Advent of Code 2023 - Day 2: Cube Conundrum input generator
+Stephen Houser <stephenhouser@gmail.com>
+"""
+
+from generators.common import scaled
+
+COLORS = ('red', 'green', 'blue')
+
+
+def generate(rng, scale=1.0):
+    """Return games of several draws of colored cubes"""
+    lines = []
+    for game in range(1, scaled(100, scale) + 1):
+        draws = []
+        for _ in range(rng.randint(1, 6)):
+            colors = rng.sample(COLORS, rng.randint(1, 3))
+            draws.append(', '.join(f'{rng.randint(1, 20)} {c}' for c in colors))
+        lines.append(f'Game {game}: ' + '; '.join(draws))
+
+    return '\n'.join(lines)
@@ -0,0 +1,29 @@
+"""
+Advent of Code 2023 - Day 3: Gear Ratios input generator
+Stephen Houser <stephenhouser@gmail.com>
+"""
+
+from generators.common import scaled_side
+
+SYMBOLS = '*#+$/@%=&-'
+
+
+def generate(rng, scale=1.0):
+    """Return an engine schematic of part numbers and symbols"""
+    side = scaled_side(140, scale)
+    rows = []
+    for _ in range(side):
+        row = []
+        while len(row) < side:
+            kind = rng.random()
+            length = rng.randint(1, 3)
+            if kind < 0.15 and len(row) + length < side:
+                number = str(rng.randint(10 ** (length - 1), 10 ** length - 1))
+                row.extend(number + '.')
+            elif kind < 0.20:
+                row.append('*' if rng.random() < 0.4 else rng.choice(SYMBOLS))
+            else:
+                row.append('.')
+        rows.append(''.join(row[:side]))
+
+    return '\n'.join(rows)
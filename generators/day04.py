@@ -0,0 +1,35 @@
+"""
+Advent of Code 2023 - Day 4: Scratchcards input generator
+Stephen Houser <stephenhouser@gmail.com>
+"""
+
+from generators.common import scaled
+
+# relative odds of 0..10 matches, mostly few as in real inputs
+MATCH_WEIGHTS = (30, 20, 15, 10, 8, 6, 4, 3, 2, 1, 1)
+
+
+def generate(rng, scale=1.0):
+    """Return cards of 10 winning numbers and 25 picks.
+        Cards come in runs of 10 to 30 and no card wins copies past the end
+        of its run, so the number of copies stays about the same per card
+        at any scale, rather than growing exponentially with the cards.
+    """
+    cards = scaled(200, scale)
+    lines = []
+    run_end = 0
+    for card in range(1, cards + 1):
+        if card > run_end:
+            run_end = min(cards, card + rng.randint(9, 29))
+
+        winning = rng.sample(range(1, 100), 10)
+        most = min(10, run_end - card)
+        matches = rng.choices(range(most + 1), MATCH_WEIGHTS[:most + 1])[0]
+        others = [n for n in range(1, 100) if n not in winning]
+        picks = rng.sample(winning, matches) + rng.sample(others, 25 - matches)
+        rng.shuffle(picks)
+        lines.append(f'Card {card:{len(str(cards))}}: '
+                     + ' '.join(f'{n:2}' for n in winning) + ' | '
+                     + ' '.join(f'{n:2}' for n in picks))
+
+    return '\n'.join(lines)
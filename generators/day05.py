@@ -0,0 +1,41 @@
+"""
+Advent of Code 2023 - Day 5: If You Give A Seed A Fertilizer input generator
+Stephen Houser <stephenhouser@gmail.com>
+"""
+
+from generators.common import scaled
+
+CATEGORIES = ('seed', 'soil', 'fertilizer', 'water', 'light',
+              'temperature', 'humidity', 'location')
+LIMIT = 2 ** 32
+
+
+def mapping(rng, count):
+    """Return count (destination, source, length) ranges that tile [0, LIMIT)"""
+    cuts = sorted(rng.sample(range(1, LIMIT), count - 1))
+    sources = list(zip([0] + cuts, cuts + [LIMIT]))
+    destinations = sources[:]
+    rng.shuffle(destinations)
+
+    ranges = []
+    for (start, end), (dest, _) in zip(sources, destinations):
+        length = min(end - start, LIMIT - dest)
+        ranges.append((dest, start, length))
+
+    rng.shuffle(ranges)
+    return ranges
+
+def generate(rng, scale=1.0):
+    """Return seeds (start, length pairs) and seven category maps"""
+    seeds = []
+    for _ in range(scaled(10, scale)):
+        start = rng.randrange(LIMIT // 2)
+        seeds.extend((start, rng.randint(1, LIMIT // 16)))
+
+    sections = ['seeds: ' + ' '.join(map(str, seeds))]
+    for source, destination in zip(CATEGORIES, CATEGORIES[1:]):
+        ranges = mapping(rng, scaled(40, scale))
+        sections.append(f'{source}-to-{destination} map:\n'
+                        + '\n'.join(' '.join(map(str, r)) for r in ranges))
+
+    return '\n\n'.join(sections)
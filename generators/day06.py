@@ -0,0 +1,23 @@
+"""
+Advent of Code 2023 - Day 6: Wait For It input generator
+Stephen Houser <stephenhouser@gmail.com>
+
+Part two joins every race into one, so its numbers grow with the scale.
+"""
+
+from generators.common import scaled
+
+
+def generate(rng, scale=1.0):
+    """Return race times and record distances"""
+    times, distances = [], []
+    for _ in range(scaled(4, scale)):
+        time = rng.randint(30, 99)
+        # record is beaten by holding between 10% and 40% of the time
+        hold = int(time * rng.uniform(0.1, 0.4))
+        times.append(time)
+        distances.append(hold * (time - hold))
+
+    width = max(len(str(d)) for d in distances) + 1
+    return ('Time:    ' + ''.join(f'{t:{width}}' for t in times) + '\n'
+            'Distance:' + ''.join(f'{d:{width}}' for d in distances))
@@ -0,0 +1,20 @@
+"""
+Advent of Code 2023 - Day 7: Camel Cards input generator
+Stephen Houser <stephenhouser@gmail.com>
+"""
+
+from generators.common import scaled
+
+CARDS = 'AKQJT98765432'
+
+
+def generate(rng, scale=1.0):
+    """Return hands of five cards and their bids"""
+    lines = []
+    for _ in range(scaled(1000, scale)):
+        # draw from a few distinct cards so pairs and sets are common
+        faces = rng.sample(CARDS, rng.randint(1, 5))
+        hand = ''.join(rng.choice(faces) for _ in range(5))
+        lines.append(f'{hand} {rng.randint(1, 1000)}')
+
+    return '\n'.join(lines)
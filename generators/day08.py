@@ -0,0 +1,46 @@
+"""
+Advent of Code 2023 - Day 8: Haunted Wasteland input generator
+Stephen Houser <stephenhouser@gmail.com>
+
+Like the real input, each ghost (a node ending in A) walks into a loop that
+passes through exactly one node ending in Z, so part two is the LCM of the
+loop lengths. AAA is one of the ghosts and its loop holds ZZZ. Left and right
+lead to the same node so the loops do not depend on the directions.
+Labels get longer than three characters at large scales, the third
+character still marks the A and Z nodes.
+"""
+
+import string
+
+from generators.common import scaled, unique_names
+
+ALPHABET = string.ascii_uppercase + string.digits
+GHOSTS = 6
+
+
+def label(name, role):
+    """Return a node label with role (A, Z or other) as the third character"""
+    return name[:2] + role + name[2:]
+
+def generate(rng, scale=1.0):
+    """Return directions and the node network"""
+    directions = ''.join(rng.choices('LR', k=rng.randint(250, 300)))
+    nodes = max(GHOSTS * 3, scaled(750, scale))
+    names = iter(unique_names(rng, nodes + GHOSTS, 2, ALPHABET,
+                              exclude=('AA', 'ZZ')))
+    others = ALPHABET.replace('A', '').replace('Z', '')
+
+    network = []
+    for ghost in range(GHOSTS):
+        length = nodes // GHOSTS + rng.randint(-1, 1)
+        roles = ['A'] + rng.choices(others, k=length - 2) + ['Z']
+        path = [label(next(names), role) for role in roles]
+        if ghost == 0:
+            path[0], path[-1] = 'AAA', 'ZZZ'
+
+        # the A node is only visited once, Z loops back around to the second
+        for here, there in zip(path, path[1:] + path[1:2]):
+            network.append(f'{here} = ({there}, {there})')
+
+    rng.shuffle(network)
+    return directions + '\n\n' + '\n'.join(network)
@@ -0,0 +1,18 @@
+"""
+Advent of Code 2023 - Day 9: Mirage Maintenance input generator
+Stephen Houser <stephenhouser@gmail.com>
+"""
+
+from generators.common import scaled
+
+
+def generate(rng, scale=1.0):
+    """Return histories of 21 values, each sampled from a polynomial"""
+    lines = []
+    for _ in range(scaled(200, scale)):
+        coefficients = [rng.randint(-10, 10) for _ in range(rng.randint(1, 7))]
+        values = [sum(c * x ** n for n, c in enumerate(coefficients))
+                  for x in range(21)]
+        lines.append(' '.join(map(str, values)))
+
+    return '\n'.join(lines)
@@ -0,0 +1,38 @@
+"""
+Advent of Code 2023 - Day 10: Pipe Maze input generator
+Stephen Houser <stephenhouser@gmail.com>
+"""
+
+from generators.common import scaled_side, loop_path
+
+# pipe for each (from, to) pair of directions through a tile
+PIPES = {frozenset('NS'): '|', frozenset('EW'): '-', frozenset('NE'): 'L',
+         frozenset('NW'): 'J', frozenset('SW'): '7', frozenset('SE'): 'F'}
+
+
+def direction(here, there):
+    """Return the direction (N, E, S, W) from here to the adjacent there"""
+    (x1, y1), (x2, y2) = here, there
+    return {(0, -1): 'N', (1, 0): 'E', (0, 1): 'S', (-1, 0): 'W'}[(x2-x1, y2-y1)]
+
+def generate(rng, scale=1.0):
+    """Return a grid with one pipe loop (with S on it) among junk pipe"""
+    side = scaled_side(140, scale)
+    grid = [[rng.choice('|-LJ7F.') for _ in range(side)] for _ in range(side)]
+
+    # walk the corners one tile at a time, keep a border of junk around it
+    corners = loop_path(rng, side - 2, side - 2, 1, 1)
+    tiles = []
+    for (x1, y1), (x2, y2) in zip(corners, corners[1:] + corners[:1]):
+        dx, dy = (x2 > x1) - (x2 < x1), (y2 > y1) - (y2 < y1)
+        while (x1, y1) != (x2, y2):
+            tiles.append((x1, y1))
+            x1, y1 = x1 + dx, y1 + dy
+
+    for before, here, after in zip(tiles[-1:] + tiles, tiles, tiles[1:] + tiles[:1]):
+        x, y = here
+        grid[y][x] = PIPES[frozenset((direction(here, before), direction(here, after)))]
+
+    x, y = rng.choice(tiles)
+    grid[y][x] = 'S'
+    return '\n'.join(map(''.join, grid))
@@ -0,0 +1,24 @@
+"""
+Advent of Code 2023 - Day 11: Cosmic Expansion input generator
+Stephen Houser <stephenhouser@gmail.com>
+
+The number of galaxies grows with the area, so galaxy pairs grow with
+the square of the scale.
+"""
+
+from generators.common import scaled_side
+
+
+def generate(rng, scale=1.0):
+    """Return a map of galaxies with some empty rows and columns"""
+    side = scaled_side(140, scale)
+    empty_rows = set(rng.sample(range(side), side // 12))
+    empty_cols = set(rng.sample(range(side), side // 12))
+    rows = []
+    for y in range(side):
+        rows.append(''.join(
+            '#' if y not in empty_rows and x not in empty_cols
+                   and rng.random() < 0.025 else '.'
+            for x in range(side)))
+
+    return '\n'.join(rows)
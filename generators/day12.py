@@ -0,0 +1,23 @@
+"""
+Advent of Code 2023 - Day 12: Hot Springs input generator
+Stephen Houser <stephenhouser@gmail.com>
+"""
+
+import itertools
+
+from generators.common import scaled
+
+
+def generate(rng, scale=1.0):
+    """Return spring records, partly unknown, and their damaged groups"""
+    lines = []
+    for _ in range(scaled(1000, scale)):
+        springs = ''.join(rng.choices('#.', k=rng.randint(4, 20)))
+        if '#' not in springs:
+            springs = '#' + springs[1:]
+
+        groups = [len(list(g)) for k, g in itertools.groupby(springs) if k == '#']
+        record = ''.join('?' if rng.random() < 0.4 else c for c in springs)
+        lines.append(f'{record} {",".join(map(str, groups))}')
+
+    return '\n'.join(lines)
@@ -0,0 +1,31 @@
+"""
+Advent of Code 2023 - Day 13: Point of Incidence input generator
+Stephen Houser <stephenhouser@gmail.com>
+
+Each pattern reflects across one random row or column. Reflections that
+need a smudge fixed (part two) only happen by chance.
+"""
+
+from generators.common import scaled
+
+
+def mirrored(rng, length, width):
+    """Return length random rows of width that reflect across a random line"""
+    line = rng.randint(1, length - 1)
+    half = max(line, length - line)
+    rows = [''.join(rng.choices('#.', k=width)) for _ in range(half)]
+    reflected = rows[::-1] + rows
+    return reflected[half - line:half - line + length]
+
+def generate(rng, scale=1.0):
+    """Return patterns of ash and rocks separated by blank lines"""
+    patterns = []
+    for _ in range(scaled(100, scale)):
+        length, width = rng.randint(7, 17), rng.randint(7, 17)
+        rows = mirrored(rng, length, width)
+        if rng.random() < 0.5:
+            # reflect across a column instead
+            rows = [''.join(c) for c in zip(*mirrored(rng, width, length))]
+        patterns.append('\n'.join(rows))
+
+    return '\n\n'.join(patterns)
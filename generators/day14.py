@@ -0,0 +1,13 @@
+"""
+Advent of Code 2023 - Day 14: Parabolic Reflector Dish input generator
+Stephen Houser <stephenhouser@gmail.com>
+"""
+
+from generators.common import scaled_side
+
+
+def generate(rng, scale=1.0):
+    """Return a platform of round (O) and cube (#) rocks"""
+    side = scaled_side(100, scale)
+    return '\n'.join(''.join(rng.choices('O#.', weights=(20, 15, 65), k=side))
+                     for _ in range(side))
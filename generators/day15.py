@@ -0,0 +1,20 @@
+"""
+Advent of Code 2023 - Day 15: Lens Library input generator
+Stephen Houser <stephenhouser@gmail.com>
+"""
+
+from generators.common import scaled, unique_names
+
+
+def generate(rng, scale=1.0):
+    """Return comma separated initialization steps"""
+    labels = unique_names(rng, scaled(500, scale), rng.randint(2, 6))
+    steps = []
+    for _ in range(scaled(4000, scale)):
+        label = rng.choice(labels)
+        if rng.random() < 0.6:
+            steps.append(f'{label}={rng.randint(1, 9)}')
+        else:
+            steps.append(f'{label}-')
+
+    return ','.join(steps)
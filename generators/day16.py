@@ -0,0 +1,13 @@
+"""
+Advent of Code 2023 - Day 16: The Floor Will Be Lava input generator
+Stephen Houser <stephenhouser@gmail.com>
+"""
+
+from generators.common import scaled_side
+
+
+def generate(rng, scale=1.0):
+    """Return a contraption of mirrors and splitters"""
+    side = scaled_side(110, scale)
+    return '\n'.join(''.join(rng.choices('.|-/\\', weights=(90, 3, 3, 2, 2), k=side))
+                     for _ in range(side))
@@ -0,0 +1,12 @@
+"""
+Advent of Code 2023 - Day 17: Clumsy Crucible input generator
+Stephen Houser <stephenhouser@gmail.com>
+"""
+
+from generators.common import scaled_side
+
+
+def generate(rng, scale=1.0):
+    """Return a city of heat loss digits"""
+    side = scaled_side(141, scale)
+    return '\n'.join(''.join(rng.choices('123456789', k=side)) for _ in range(side))
@@ -0,0 +1,66 @@
+"""
+Advent of Code 2023 - Day 18: Lavaduct Lagoon input generator
+Stephen Houser <stephenhouser@gmail.com>
+
+The plan, and the plan hidden in the colors, each trace a simple loop:
+a strip with teeth sticking up from its top and down from its bottom.
+Both loops have the same teeth so they have the same number of steps.
+"""
+
+from generators.common import scaled
+
+DIRECTIONS = 'RDLU'
+
+
+def comb_loop(rng, teeth, width, depth):
+    """Return the corners of a loop with teeth of random size (< width, depth)"""
+    spans = []
+    x = 0
+    for _ in range(teeth):
+        tooth = rng.randint(1, width)
+        spans.append((x, x + tooth))
+        x += tooth + rng.randint(1, width)
+
+    strip = rng.randint(1, depth)
+    corners = []
+    for start, end in spans:      # along the top, teeth up
+        up = -rng.randint(1, depth)
+        corners.extend([(start, 0), (start, up), (end, up), (end, 0)])
+
+    for start, end in reversed(spans):   # back along the bottom, teeth down
+        down = strip + rng.randint(1, depth)
+        corners.extend([(end, strip), (end, down), (start, down), (start, strip)])
+
+    return corners
+
+def instructions(corners):
+    """Return the (direction, length) steps to walk around the loop of corners"""
+    steps = []
+    for (x1, y1), (x2, y2) in zip(corners, corners[1:] + corners[:1]):
+        if (x1, y1) == (x2, y2):
+            continue
+        if x1 == x2:
+            step = ('D' if y2 > y1 else 'U', abs(y2 - y1))
+        else:
+            step = ('R' if x2 > x1 else 'L', abs(x2 - x1))
+
+        # join straight runs that pass through a corner
+        if steps and steps[-1][0] == step[0]:
+            step = (step[0], steps.pop()[1] + step[1])
+        steps.append(step)
+
+    if steps[0][0] == steps[-1][0]:
+        steps[0] = (steps[0][0], steps.pop()[1] + steps[0][1])
+
+    return steps
+
+def generate(rng, scale=1.0):
+    """Return a dig plan with colors that encode the real instructions"""
+    teeth = scaled(90, scale)
+    plan = instructions(comb_loop(rng, teeth, 6, 10))
+    # hex lengths are at most 5 digits, the longest step is about 3 * depth
+    hidden = instructions(comb_loop(rng, teeth, 30_000, 300_000))
+    assert len(plan) == len(hidden)
+
+    return '\n'.join(f'{d} {n} (#{m:05x}{DIRECTIONS.index(h)})'
+                     for (d, n), (h, m) in zip(plan, hidden))
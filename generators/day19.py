@@ -0,0 +1,55 @@
+"""
+Advent of Code 2023 - Day 19: Aplenty input generator
+Stephen Houser <stephenhouser@gmail.com>
+
+Workflows form a tree below 'in'. Each condition splits the ratings that
+can reach it, so every accepted range in part two is non-empty.
+"""
+
+from generators.common import scaled, unique_names
+
+
+def generate(rng, scale=1.0):
+    """Return the workflows and the part ratings"""
+    count = scaled(550, scale)
+    names = iter(unique_names(rng, count, 2, exclude=('in',)))
+    lines = []
+    full = {c: (1, 4000) for c in 'xmas'}
+    todo = [('in', full)]
+    made = 1
+    while todo:
+        name, ranges = todo.pop(rng.randrange(len(todo)))
+        rules = []
+        for _ in range(rng.randint(1, 3)):
+            category = rng.choice('xmas')
+            low, high = ranges[category]
+            if high - low < 2:
+                continue
+
+            value = rng.randint(low + 1, high - 1)
+            if rng.random() < 0.5:
+                rule, taken, left = '<', (low, value - 1), (value, high)
+            else:
+                rule, taken, left = '>', (value + 1, high), (low, value)
+
+            destination = rng.choice('AR')
+            if made < count:
+                destination = next(names)
+                todo.append((destination, {**ranges, category: taken}))
+                made += 1
+            rules.append(f'{category}{rule}{value}:{destination}')
+            ranges = {**ranges, category: left}
+
+        if made < count and rng.random() < 0.5:
+            rules.append(next(names))
+            todo.append((rules[-1], ranges))
+            made += 1
+        else:
+            rules.append(rng.choice('AR'))
+        lines.append(f'{name}{{{",".join(rules)}}}')
+
+    rng.shuffle(lines)
+    parts = [f'{{x={rng.randint(1, 4000)},m={rng.randint(1, 4000)},'
+             f'a={rng.randint(1, 4000)},s={rng.randint(1, 4000)}}}'
+             for _ in range(scaled(200, scale))]
+    return '\n'.join(lines) + '\n\n' + '\n'.join(parts)
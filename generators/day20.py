@@ -0,0 +1,45 @@
+"""
+Advent of Code 2023 - Day 20: Pulse Propagation input generator
+Stephen Houser <stephenhouser@gmail.com>
+
+Built like the real input: the broadcaster starts several 12 bit counters
+made of flip-flops. Each counter's conjunction fires (and resets it) when
+it reaches a prime, and an inverter passes that on to the conjunction
+in front of rx. More counters at larger scales.
+"""
+
+from generators.common import scaled, unique_names
+
+BITS = 12
+PRIMES = [n for n in range(3001, 2 ** BITS, 2)
+          if all(n % d for d in range(3, int(n ** 0.5) + 1, 2))]
+
+
+def generate(rng, scale=1.0):
+    """Return the module configuration"""
+    counters = scaled(4, scale)
+    names = iter(unique_names(rng, counters * (BITS + 2) + 1, 2,
+                              exclude=('rx', 'broadcaster')))
+    final = next(names)
+    starts = []
+    lines = []
+    for target in rng.sample(PRIMES, counters):
+        bits = [next(names) for _ in range(BITS)]
+        hub, inverter = next(names), next(names)
+        starts.append(bits[0])
+        for bit, name in enumerate(bits):
+            outputs = bits[bit + 1:bit + 2]
+            if target & (1 << bit):
+                outputs.append(hub)
+            lines.append(f'%{name} -> {", ".join(outputs)}')
+
+        # the hub resets the zero bits (and the first bit) of the counter
+        resets = [name for bit, name in enumerate(bits)
+                  if bit == 0 or not target & (1 << bit)]
+        lines.append(f'&{hub} -> {", ".join(resets + [inverter])}')
+        lines.append(f'&{inverter} -> {final}')
+
+    lines.append(f'&{final} -> rx')
+    lines.append(f'broadcaster -> {", ".join(starts)}')
+    rng.shuffle(lines)
+    return '\n'.join(lines)
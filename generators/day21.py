@@ -0,0 +1,23 @@
+"""
+Advent of Code 2023 - Day 21: Step Counter input generator
+Stephen Houser <stephenhouser@gmail.com>
+
+Like the real input the map is square with an odd side, S in the middle,
+and clear edges and middle row and column.
+"""
+
+from generators.common import scaled_side
+
+
+def generate(rng, scale=1.0):
+    """Return a garden map of plots and rocks"""
+    side = scaled_side(131, scale) | 1
+    middle = side // 2
+    rows = []
+    for y in range(side):
+        row = ['.' if y in (0, middle, side - 1) or x in (0, middle, side - 1)
+               or rng.random() > 0.15 else '#' for x in range(side)]
+        rows.append(row)
+
+    rows[middle][middle] = 'S'
+    return '\n'.join(map(''.join, rows))
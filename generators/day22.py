@@ -0,0 +1,32 @@
+"""
+Advent of Code 2023 - Day 22: Sand Slabs input generator
+Stephen Houser <stephenhouser@gmail.com>
+"""
+
+from generators.common import scaled
+
+
+def generate(rng, scale=1.0):
+    """Return bricks in the air on a 10x10 footprint, none overlapping"""
+    bricks = scaled(1200, scale)
+    occupied = set()
+    lines = []
+    while len(lines) < bricks:
+        axis = rng.choices('xyz', weights=(2, 2, 1))[0]
+        start = [rng.randint(0, 9), rng.randint(0, 9),
+                 rng.randint(1, 1 + len(lines) // 3)]
+        end = start[:]
+        end['xyz'.index(axis)] += rng.randint(0, 4)
+        if end[0] > 9 or end[1] > 9:
+            continue
+
+        cubes = {(x, y, z) for x in range(start[0], end[0] + 1)
+                 for y in range(start[1], end[1] + 1)
+                 for z in range(start[2], end[2] + 1)}
+        if cubes & occupied:
+            continue
+
+        occupied |= cubes
+        lines.append(','.join(map(str, start)) + '~' + ','.join(map(str, end)))
+
+    return '\n'.join(lines)
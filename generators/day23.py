@@ -0,0 +1,49 @@
+"""
+Advent of Code 2023 - Day 23: A Long Walk input generator
+Stephen Houser <stephenhouser@gmail.com>
+
+Like the real input, junctions sit on a 6x6 lattice joined by trails with
+slopes pointing right and down at both ends. The lattice stays the same
+size (the longest path search is exponential in it), larger scales have
+longer trails between junctions.
+"""
+
+from generators.common import scaled_side
+
+JUNCTIONS = 6
+
+
+def spacing(rng, first, last):
+    """Return JUNCTIONS positions from first to last with random gaps"""
+    gaps = [rng.randint(3, 5) for _ in range(JUNCTIONS - 1)]
+    # stretch the gaps to fill the space
+    total = last - first
+    gaps = [max(3, gap * total // sum(gaps)) for gap in gaps]
+    gaps[-1] += total - sum(gaps)
+    positions = [first]
+    for gap in gaps:
+        positions.append(positions[-1] + gap)
+
+    return positions
+
+def generate(rng, scale=1.0):
+    """Return a map of forest and trails"""
+    side = max(JUNCTIONS * 4, scaled_side(141, scale))
+    # trails from the start and to the finish have a slope as well
+    xs, ys = spacing(rng, 1, side - 2), spacing(rng, 2, side - 3)
+    grid = [['#'] * side for _ in range(side)]
+
+    for y in ys:
+        for x0, x1 in zip(xs, xs[1:]):
+            grid[y][x0:x1] = ['.'] + ['>'] + ['.'] * (x1 - x0 - 3) + ['>']
+    for x in xs:
+        for y0, y1 in zip(ys, ys[1:]):
+            for y in range(y0 + 1, y1):
+                grid[y][x] = 'v' if y in (y0 + 1, y1 - 1) else '.'
+
+    for y in ys:
+        for x in xs:
+            grid[y][x] = '.'
+    grid[0][1], grid[1][1] = '.', 'v'
+    grid[side - 2][side - 2], grid[side - 1][side - 2] = 'v', '.'
+    return '\n'.join(map(''.join, grid))
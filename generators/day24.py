@@ -0,0 +1,28 @@
+"""
+Advent of Code 2023 - Day 24: Never Tell Me The Odds input generator
+Stephen Houser <stephenhouser@gmail.com>
+
+Hailstones are placed so that one rock thrown from an integer position
+with an integer velocity hits every one of them (part two).
+"""
+
+from generators.common import scaled
+
+AREA = (200_000_000_000_000, 400_000_000_000_000)
+
+
+def generate(rng, scale=1.0):
+    """Return hailstone positions and velocities"""
+    rock = [rng.randint(*AREA) for _ in range(3)]
+    throw = [rng.randint(-300, 300) for _ in range(3)]
+    times = rng.sample(range(10 ** 11, 10 ** 12), scaled(300, scale))
+
+    lines = []
+    for time in times:
+        velocity = [rng.randint(-300, 300) for _ in range(3)]
+        # at `time` the stone is where the rock is
+        position = [r + time * (t - v) for r, t, v in zip(rock, throw, velocity)]
+        lines.append(', '.join(map(str, position)) + ' @ '
+                     + ', '.join(map(str, velocity)))
+
+    return '\n'.join(lines)
@@ -0,0 +1,40 @@
+"""
+Advent of Code 2023 - Day 25: Snowverload input generator
+Stephen Houser <stephenhouser@gmail.com>
+
+Two well connected groups of components joined by exactly three wires.
+The solution cuts the wires it found by hand for the real input, so the
+generated input joins the groups with those same three wires.
+"""
+
+from generators.common import scaled, unique_names
+
+CUTS = (('qfb', 'vkd'), ('hqq', 'xxq'), ('kgl', 'xzz'))
+
+
+def group(rng, names):
+    """Return wires connecting names so no three cuts separate them"""
+    wires = set()
+    for i, name in enumerate(names[1:], 1):
+        # link back to several earlier components
+        for other in rng.sample(names[:i], min(i, 4)):
+            wires.add((other, name))
+
+    return wires
+
+def generate(rng, scale=1.0):
+    """Return the wiring diagram"""
+    count = scaled(750, scale)
+    cut_names = [name for wire in CUTS for name in wire]
+    names = unique_names(rng, 2 * count, exclude=cut_names)
+    left = [a for a, _ in CUTS] + names[:count]
+    right = [b for _, b in CUTS] + names[count:]
+
+    wires = group(rng, left) | group(rng, right) | set(CUTS)
+    connections = {}
+    for a, b in sorted(wires):
+        connections.setdefault(a, []).append(b)
+
+    lines = [f'{name}: {" ".join(others)}' for name, others in connections.items()]
+    rng.shuffle(lines)
+    return '\n'.join(lines)
@@ -0,0 +1,145 @@
+#!/usr/bin/env python
+"""
+Advent of Code 2023 - Compact 2D grid
+Stephen Houser <stephenhouser@gmail.com>
+
+A grid of single byte cells kept in one flat buffer, laid out exactly like
+the puzzle input: each row is followed by a newline. Cells are addressed by
+integer index (y * stride + x) so neighbor lookups are integer arithmetic,
+no complex numbers or tuples are created. The newline at the end of each
+row is a sentinel, stepping off the left or right edge lands on it (or off
+the ends of the buffer) and valid() returns False.
+"""
+
+import unittest
+
+NEWLINE = ord('\n')
+
+
+class TestGrid(unittest.TestCase):
+    """Test Grid"""
+
+    def test_layout(self):
+        """Rows, columns and indexes"""
+        grid = Grid.from_text('abc\ndef\n')
+        self.assertEqual((grid.width, grid.height, grid.stride), (3, 2, 4))
+        self.assertEqual(grid.get(2, 1), 'f')
+        self.assertEqual(grid.coords(grid.index(2, 1)), (2, 1))
+        self.assertEqual(grid.find('e'), grid.index(1, 1))
+
+    def test_edges(self):
+        """Stepping off any edge is not valid"""
+        grid = Grid.from_text('ab\ncd')
+        self.assertEqual(sorted(grid.neighbors(0)), [1, grid.stride])
+        self.assertFalse(grid.valid(grid.index(1, 0) + 1))
+        self.assertFalse(grid.valid(grid.index(0, 1) - 1))
+        self.assertFalse(grid.valid(-grid.stride))
+        self.assertIsNone(grid.get(2, 0))
+
+    def test_infinite(self):
+        """Toroidal wrapping"""
+        grid = Grid.from_text('ab\ncd')
+        self.assertEqual(grid.infinite_get(-1, -1), 'd')
+        self.assertEqual(grid.infinite_get(4, 3), 'c')
+
+
+class Grid:
+    """2D grid of single byte cells stored in one flat buffer"""
+
+    # direction names and the order of Grid.offsets
+    DIRECTIONS = 'ESWN'
+
+    def __init__(self, cells, width, height, stride=None):
+        self.cells = cells
+        self.width = width
+        self.height = height
+        self.stride = stride if stride else width + 1
+        # index offsets to the E, S, W, and N neighbors
+        self.offsets = (1, self.stride, -1, -self.stride)
+
+    @classmethod
+    def from_text(cls, text):
+        """Return a new Grid from text (str or bytes) with one row per line"""
+        if isinstance(text, str):
+            text = text.encode()
+
+        rows = text.replace(b'\r', b'').strip(b'\n').split(b'\n')
+        width = len(rows[0])
+        assert all(len(row) == width for row in rows), 'rows must be same width'
+
+        cells = bytearray(b'\n'.join(rows) + b'\n')
+        return cls(cells, width, len(rows))
+
+    @classmethod
+    def from_lines(cls, lines):
+        """Return a new Grid from an iterable of lines (e.g. an open file)"""
+        return cls.from_text(''.join(line.rstrip('\r\n') + '\n' for line in lines))
+
+    @classmethod
+    def from_file(cls, filename):
+        """Return a new Grid loaded from filename"""
+        with open(filename, 'rb') as file:
+            return cls.from_text(file.read())
+
+    def index(self, x, y):
+        """Return the index of cell (x, y)"""
+        return y * self.stride + x
+
+    def coords(self, index):
+        """Return the (x, y) of the cell at index"""
+        y, x = divmod(index, self.stride)
+        return (x, y)
+
+    def valid(self, index):
+        """Return True if index is a cell on the grid"""
+        return 0 <= index < len(self.cells) and self.cells[index] != NEWLINE
+
+    def contains(self, x, y):
+        """Return True if (x, y) is on the grid"""
+        return 0 <= x < self.width and 0 <= y < self.height
+
+    def neighbors(self, index):
+        """Yield the indexes of the E, S, W, N neighbors that are on the grid"""
+        for offset in self.offsets:
+            if self.valid(index + offset):
+                yield index + offset
+
+    def find(self, symbol):
+        """Return the index of the first cell holding symbol, -1 if none"""
+        return self.cells.find(symbol.encode())
+
+    def get(self, x, y, default=None):
+        """Return the symbol (str) at (x, y), or default if off the grid"""
+        if not self.contains(x, y):
+            return default
+
+        return chr(self.cells[y * self.stride + x])
+
+    def infinite_get(self, x, y):
+        """Return the symbol at (x, y) as if the grid repeated forever"""
+        return chr(self.cells[(y % self.height) * self.stride + x % self.width])
+
+    def __getitem__(self, index):
+        """Return the byte value of the cell at index"""
+        return self.cells[index]
+
+    def __len__(self):
+        """Return the number of cells on the grid"""
+        return self.width * self.height
+
+    def rows(self):
+        """Yield each row as a str"""
+        for y in range(self.height):
+            start = y * self.stride
+            yield bytes(self.cells[start:start + self.width]).decode()
+
+    def __repr__(self):
+        """Return REPL representation"""
+        return str(self)
+
+    def __str__(self):
+        """Return string representation"""
+        return '\n'.join(self.rows())
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,117 @@
+#!/usr/bin/env python
+"""
+Advent of Code 2023 - Import time benchmark
+Stephen Houser <stephenhouser@gmail.com>
+
+Imports each day's module in a fresh interpreter with `python -X importtime`
+and reports how long the import took and which of the modules it pulled in
+were the most expensive. Short runs over small inputs are dominated by this
+startup cost, so a heavy import on the common path shows up here first.
+
+    python importtime.py            # all days
+    python importtime.py 24 -n 10   # ten heaviest imports of day 24
+"""
+
+import os
+import sys
+import argparse
+import unittest
+import subprocess
+
+from days import find_days
+
+
+class TestImportTime(unittest.TestCase):
+    """Test import time parsing"""
+
+    def test_parse(self):
+        """Self and cumulative times with nesting depth"""
+        stderr = ('import time: self [us] | cumulative | imported package\n'
+                  'import time:       100 |        100 |     _json\n'
+                  'import time:       250 |        350 |   json\n'
+                  'import time:        50 |        400 | boat_race\n')
+        imports = parse_importtime(stderr)
+        self.assertEqual(imports[-1], ('boat_race', 0, 50, 400))
+        self.assertEqual(imports[0], ('_json', 2, 100, 100))
+
+    def test_merge(self):
+        """Best of several runs"""
+        runs = [[('re', 1, 30, 90)], [('re', 1, 20, 80)]]
+        self.assertEqual(fastest(runs), [('re', 1, 20, 80)])
+
+
+def parse_importtime(stderr):
+    """Return [(module, depth, self us, cumulative us), ...] in the order
+       Python reported them (a module comes after everything it imported).
+    """
+    imports = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'imported package' in line:
+            continue
+
+        own, cumulative, name = line[len('import time:'):].split('|')
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        imports.append((name.strip(), depth, int(own), int(cumulative)))
+
+    return imports
+
+def fastest(runs):
+    """Return the imports of the run where the last (outermost) import was
+       quickest, the run least disturbed by the rest of the machine.
+    """
+    return min(runs, key=lambda imports: imports[-1][3] if imports else 0)
+
+def import_times(module, directory, repeat=3):
+    """Return the parsed -X importtime report for importing module from
+       directory, the best of repeat runs in fresh interpreters.
+    """
+    # write .pyc files (once, in a warmup run) so compiling is not timed
+    env = {k: v for k, v in os.environ.items() if k != 'PYTHONDONTWRITEBYTECODE'}
+    command = [sys.executable, '-X', 'importtime', '-c', f'import {module}']
+
+    runs = []
+    for run in range(repeat + 1):
+        result = subprocess.run(command, cwd=directory, env=env,
+                                capture_output=True, text=True, check=False)
+        if result.returncode:
+            raise ImportError(result.stderr.strip().splitlines()[-1])
+        if run:
+            runs.append(parse_importtime(result.stderr))
+
+    return fastest(runs)
+
+def print_imports(day, imports, top):
+    """Pretty print the total import time of a day and its heaviest imports"""
+    name, _, own, cumulative = imports[-1]
+    print(f'{day:3} {name:16} {cumulative / 1000:8.1f} {own / 1000:8.1f}')
+
+    # modules imported by the day itself (or by its shared modules)
+    nested = sorted((i for i in imports[:-1] if i[1] <= 2),
+                    key=lambda i: -i[3])
+    for name, depth, own, cumulative in nested[:top]:
+        print(f'{"":3} {"  " * depth + name:24} {cumulative / 1000:8.1f}')
+
+def main():
+    """Main Routine, does all the work"""
+    parser = argparse.ArgumentParser(description=__doc__.strip().split('\n')[0])
+    parser.add_argument('days', type=int, nargs='*',
+                        help='days to import (default all)')
+    parser.add_argument('-r', '--repeat', type=int, default=5,
+                        help='runs per day, the fastest is reported')
+    parser.add_argument('-n', '--top', type=int, default=3,
+                        help='show the n slowest imports of each day')
+    args = parser.parse_args()
+
+    print(f'{"day":>3} {"module":16} {"total ms":>8} {"self ms":>8}')
+    for solution in find_days(args.days):
+        module = os.path.splitext(os.path.basename(solution.source))[0]
+        try:
+            imports = import_times(module, solution.directory, args.repeat)
+        except ImportError as error:
+            print(f'{solution.day:3} {module:16} {error}')
+            continue
+
+        print_imports(solution.day, imports, args.top)
+
+if __name__ == '__main__':
+    main()
@@ -1,71 +1,589 @@
 #!/usr/bin/env/python3
+import gc
+import os
+import sys
 import time
+import signal
+import weakref
+import argparse
+import unittest
+from collections import OrderedDict, Counter, deque, namedtuple
 from functools import wraps, partial
 from contextlib import contextmanager
 
+
+class TestSamplingProfiler(unittest.TestCase):
+    """Test SamplingProfiler"""
+
+    def test_samples(self):
+        """Busy function shows up in the samples and collapsed stacks"""
+        def busy():
+            t0 = time.perf_counter()
+            while time.perf_counter() - t0 < 0.2:
+                pass
+
+        with SamplingProfiler(interval=0.005, clock='wall') as sampler:
+            busy()
+
+        self.assertGreater(sampler.samples, 10)
+        self.assertTrue(any(frame.endswith('.busy')
+                            for frame in sampler.function_times()))
+        self.assertTrue(all(line.rsplit(' ', 1)[1].isdigit()
+                            for line in sampler.collapsed()))
+
+
+class TestProfileArguments(unittest.TestCase):
+    """Test profile command line options"""
+
+    def parse(self, *arguments):
+        """Return the profiler chosen by arguments"""
+        parser = argparse.ArgumentParser()
+        parser.add_argument('filename', nargs='+')
+        add_profile_arguments(parser)
+        return parser.parse_args(arguments).profile
+
+    def test_flag(self):
+        """-p is a flag, it does not take the file name that follows"""
+        self.assertEqual(self.parse('-p', 'input.txt'), 'cprofile')
+        self.assertIsNone(self.parse('input.txt'))
+
+    def test_profiler(self):
+        """--profiler picks the profiler before or after -p"""
+        self.assertEqual(self.parse('--profiler', 'wall', '-p', 'input.txt'), 'wall')
+        self.assertEqual(self.parse('input.txt', '-p', '--profiler=sample'), 'sample')
+
+
+class TestMemoized(unittest.TestCase):
+    """Test memoized"""
+
+    def test_lru(self):
+        """Least recently used results are evicted past maxsize"""
+        calls = []
+        @memoized(maxsize=2)
+        def square(x, power=2):
+            calls.append(x)
+            return x ** power
+
+        self.assertEqual([square(2), square(3), square(2), square(4)], [4, 9, 4, 16])
+        self.assertEqual(square(3, power=3), 27)
+        self.assertEqual(calls, [2, 3, 4, 3])
+        info = square.cache_info()
+        self.assertEqual((info.hits, info.misses, info.evictions), (1, 4, 2))
+
+    def test_registry(self):
+        """Bare decorator, maxbytes and clearing every cache"""
+        @memoized
+        def double(x):
+            return x * 2
+
+        @memoized(maxbytes=1)
+        def triple(x):
+            return x * 3
+
+        double(1), double(1), triple(1)
+        self.assertEqual(triple.cache_info().currsize, 0)
+        self.assertIn(double.cache_info(), memoized_stats())
+        clear_memoized()
+        self.assertEqual(double.cache_info().currsize, 0)
+
+class TestPerfTimer(unittest.TestCase):
+    """Test perf_timer and perf_context"""
+
+    def test_memory(self):
+        """Allocations show up in the peak and block counts"""
+        with perf_context('alloc', verbose=False, memory=True) as record:
+            kept = [list(range(100)) for _ in range(1000)]
+
+        self.assertGreater(record.peak, 100 * 1000 * 8)
+        self.assertGreaterEqual(record.blocks, 1000)
+        self.assertEqual(len(record.collections), 3)
+        self.assertEqual(len(kept), 1000)
+
+    def test_records(self):
+        """Each call is recorded and the records aggregate"""
+        @perf_timer(memory=True)
+        def build(n):
+            return [0] * n
+
+        build(10), build(100_000)
+        self.assertEqual(len(build.records), 2)
+        stats = build.perf_stats()
+        self.assertEqual(stats.calls, 2)
+        self.assertEqual(stats.peak, build.records[1].peak)
+        self.assertIn(stats, perf_stats())
+        clear_perf_records()
+        self.assertEqual(len(build.records), 0)
+        self.assertEqual(build.perf_stats().calls, 0)
+
+    def test_keep(self):
+        """Totals count every call, only the latest records are kept"""
+        @perf_timer(keep=3)
+        def nothing():
+            pass
+
+        for _ in range(5):
+            nothing()
+        self.assertEqual(len(nothing.records), 3)
+        self.assertEqual(nothing.perf_stats().calls, 5)
+
+    def test_nested_peak(self):
+        """An inner traced block does not hide the outer block's peak"""
+        with perf_context('outer', verbose=False, memory=True) as outer:
+            kept = [list(range(100)) for _ in range(1000)]
+            del kept
+            with perf_context('inner', verbose=False, memory=True) as inner:
+                small = list(range(10))
+
+        self.assertGreater(outer.peak, 100 * 1000 * 8)
+        self.assertLess(inner.peak, outer.peak)
+        self.assertEqual(len(small), 10)
+
+
+class PerfRecord:
+    """Measurements taken for a single timed block or function call.
+
+       elapsed      seconds
+       peak         most bytes traced by tracemalloc at once (memory=True)
+       blocks       change in allocated memory blocks (sys.getallocatedblocks)
+       collections  garbage collections run in each generation (0, 1, 2)
+    """
+    __slots__ = ('label', 'elapsed', 'peak', 'blocks', 'collections')
+
+    def __init__(self, label=None):
+        self.label = label
+        self.elapsed = None
+        self.peak = None
+        self.blocks = None
+        self.collections = None
+
+    def __repr__(self):
+        """Return REPL representation"""
+        return str(self)
+
+    def __str__(self):
+        """Return string representation"""
+        text = f'{self.label}: {self.elapsed:0.4f}'
+        if self.peak is not None:
+            text += f' peak {self.peak / 2**20:0.1f}MB'
+        if self.blocks is not None:
+            text += f' {self.blocks:+} blocks gc {self.collections}'
+        return text
+
+def gc_collections():
+    """Return the number of collections run so far in each gc generation"""
+    return tuple(generation['collections'] for generation in gc.get_stats())
+
+# peaks of the traced perf_contexts that are running, innermost last
+PEAKS = []
+
 # https://www.learndatasci.com/solutions/python-timer/
 # https://dev.to/kcdchennai/python-decorator-to-measure-execution-time-54hk
 @contextmanager
-def perf_context():
-    """Performance timer for use as a context (with)"""
+def perf_context(label=None, verbose=True, memory=False):
+    """Performance timer for use as a context (with)
+
+       Yields a PerfRecord that holds the elapsed time, change in allocated
+       blocks and gc collections once the block exits. With memory=True the
+       peak memory is traced too (tracemalloc, which slows the block down).
+       Set verbose=False to collect the record without printing it.
+    """
+    if memory:
+        # pylint: disable=import-outside-toplevel
+        import tracemalloc  # only when asked for, it is slow to import
+
+    record = PerfRecord(label)
+    tracing = memory and not tracemalloc.is_tracing()
+    if tracing:
+        tracemalloc.start()
+    if memory:
+        base, peak = tracemalloc.get_traced_memory()
+        # resetting loses the peak of an enclosing block, keep it for it
+        if PEAKS:
+            PEAKS[-1] = max(PEAKS[-1], peak)
+        PEAKS.append(0)
+        tracemalloc.reset_peak()
+
+    collections = gc_collections()
+    blocks = sys.getallocatedblocks()
     t0 = time.perf_counter()
     try:
-        yield
+        yield record
     finally:
         t1 = time.perf_counter()
-        elapsed = t1 - t0
-        print(f'{elapsed:0.4f}')
+        record.elapsed = t1 - t0
+        record.blocks = sys.getallocatedblocks() - blocks
+        record.collections = tuple(n - c for n, c in zip(gc_collections(), collections))
+        if memory:
+            record.peak = max(PEAKS.pop(), tracemalloc.get_traced_memory()[1]) - base
+        if tracing:
+            tracemalloc.stop()
+        if verbose:
+            print(record if label else f'{record.elapsed:0.4f}')
+
+def peak_rss():
+    """Return the peak resident set size of this process in bytes"""
+    # pylint: disable=import-outside-toplevel
+    import resource     # Unix only
+
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS reports bytes
+    return max_rss if sys.platform == 'darwin' else max_rss * 1024
 
 #
 # Performance Decorator
 # @perf_timer on function to be evaluated
+# @perf_timer(memory=True) to trace peak memory as well
 #
-def perf_timer(func):
-    """Performance timer decorator"""
-    total_time, runs = 0, 0
+PerfStats = namedtuple('PerfStats', ['name', 'calls', 'total', 'mean', 'max',
+                                     'peak', 'blocks', 'collections'])
+
+# every perf_timer function, for perf_stats() and clear_perf_records()
+TIMED = weakref.WeakSet()
+
+# most recent PerfRecords a perf_timer function keeps
+DEFAULT_KEEP = 100
+
+class PerfTotals:
+    """Running totals of PerfRecords, updated as each one is added.
+       peak is the largest of the peaks; blocks and collections are totals.
+    """
+    __slots__ = ('calls', 'total', 'max', 'peak', 'blocks', 'collections')
+
+    def __init__(self):
+        self.clear()
+
+    def clear(self):
+        """Forget everything added so far"""
+        self.calls = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.peak = None
+        self.blocks = 0
+        self.collections = (0, 0, 0)
+
+    def add(self, record):
+        """Add one PerfRecord to the totals"""
+        self.calls += 1
+        self.total += record.elapsed
+        self.max = max(self.max, record.elapsed)
+        if record.peak is not None:
+            self.peak = record.peak if self.peak is None else max(self.peak, record.peak)
+        self.blocks += record.blocks
+        self.collections = tuple(map(sum, zip(self.collections, record.collections)))
+
+    def stats(self, name):
+        """Return the totals as PerfStats"""
+        return PerfStats(name, self.calls, self.total,
+                         self.total / self.calls if self.calls else 0,
+                         self.max, self.peak, self.blocks, self.collections)
+
+def aggregate(name, records):
+    """Return PerfStats summarizing a list of PerfRecords, e.g. many runs"""
+    totals = PerfTotals()
+    for record in records:
+        totals.add(record)
+
+    return totals.stats(name)
+
+def perf_timer(func=None, *, memory=False, verbose=False, keep=DEFAULT_KEEP):
+    """Performance timer decorator. Adds every call (see perf_context) to
+       running totals, .perf_stats(), rather than printing, and keeps the
+       PerfRecords of the last keep calls in .records. verbose=True prints
+       each record.
+    """
+    # @perf_timer(...) is called without func, return the real decorator
+    if func is None:
+        return partial(perf_timer, memory=memory, verbose=verbose, keep=keep)
+
+    records = deque(maxlen=keep)
+    totals = PerfTotals()
 
     @wraps(func)
     def _timer(*args, **kwargs):
         """Timer wrapper"""
-        t0 = time.perf_counter()
-        result = func(*args, **kwargs)
-        t1 = time.perf_counter()
-        elapsed = t1 - t0
-
-        # bring variables into scope
-        nonlocal total_time, runs
-        runs += 1
-        total_time += elapsed
-
-        print(f"@perf_timer: {func.__name__} took {elapsed:0.4f} seconds")
-        print(f"@perf_timer: The average run time is {(total_time / runs):0.4f} seconds\n")
+        with perf_context(func.__qualname__, verbose, memory) as record:
+            result = func(*args, **kwargs)
 
+        records.append(record)
+        totals.add(record)
         return result
 
+    _timer.records = records
+    _timer.totals = totals
+    _timer.perf_stats = lambda: totals.stats(func.__qualname__)
+    TIMED.add(_timer)
     return _timer
 
+def perf_stats():
+    """Return the PerfStats of every perf_timer function that has been called"""
+    return sorted((f.perf_stats() for f in TIMED if f.totals.calls),
+                  key=lambda s: s.name)
+
+def print_perf_stats():
+    """Pretty print the aggregated records of every perf_timer function"""
+    for stats in perf_stats():
+        peak = f' peak {stats.peak / 2**20:0.1f}MB' if stats.peak is not None else ''
+        print(f'@perf_timer: {stats.name} {stats.calls} calls {stats.total:0.4f}s '
+              f'(mean {stats.mean:0.4f}s, max {stats.max:0.4f}s){peak} '
+              f'{stats.blocks:+} blocks, gc {stats.collections}')
+
+def clear_perf_records():
+    """Forget the records of every perf_timer function"""
+    for func in TIMED:
+        func.records.clear()
+        func.totals.clear()
+
 #
 # Memoized -- remember function calls and cache them
 #
-class memoized:
+# @memoized                      at most DEFAULT_MAXSIZE results
+# @memoized(maxsize=None)        unbounded, like functools.cache
+# @memoized(maxbytes=2**20)      evict once results take about 1MB
+#
+DEFAULT_MAXSIZE = 2**16
+MISSING = object()  # marker, cached results can be None
+
+CacheInfo = namedtuple('CacheInfo', ['name', 'hits', 'misses', 'evictions',
+                                     'maxsize', 'currsize', 'nbytes'])
+
+# every memoized function, for memoized_stats() and clear_memoized()
+MEMOIZED = weakref.WeakSet()
+
+def make_key(args, kwargs):
+    """Return the cache key for a call"""
+    if not kwargs:
+        return args
+
+    return args + (MISSING,) + tuple(sorted(kwargs.items()))
+
+def sizeof(key, value):
+    """Return the approximate memory used by one cache entry"""
+    return sys.getsizeof(key) + sys.getsizeof(value)
+
+def memoized(func=None, *, maxsize=DEFAULT_MAXSIZE, maxbytes=None):
     """Decorator. Caches a function's return value each time it is called.
        If called later with the same arguments, the cached value is returned
-       (not reevaluated).
+       (not reevaluated). The least recently used results are evicted once
+       there are more than maxsize of them, or once their approximate size
+       (sys.getsizeof of the arguments and result) is more than maxbytes.
+
+       The decorated function has cache_info() and cache_clear().
     """
-    def __init__(self, func):
-        self.func = func
-        self.cache = {}
-
-    def __call__(self, *args):
-        if args in self.cache:
-            return self.cache[args]
-        else:
-            value = self.func(*args)
-            self.cache[args] = value
+    # @memoized(...) is called without func, return the real decorator
+    if func is None:
+        return partial(memoized, maxsize=maxsize, maxbytes=maxbytes)
+
+    cache = OrderedDict()   # key -> value, least recently used first
+    sizes = {}              # key -> size, only kept when maxbytes is set
+    hits = misses = evictions = nbytes = 0
+
+    # a closure (rather than a class with __call__) keeps the hot path lean
+    cache_get, cache_touch = cache.get, cache.move_to_end
+
+    def evict():
+        nonlocal evictions, nbytes
+        key, _ = cache.popitem(last=False)
+        nbytes -= sizes.pop(key, 0)
+        evictions += 1
+
+    @wraps(func)
+    def _memoized(*args, **kwargs):
+        nonlocal hits, misses, nbytes
+        key = make_key(args, kwargs) if kwargs else args
+        value = cache_get(key, MISSING)
+        if value is not MISSING:
+            hits += 1
+            cache_touch(key)
             return value
-    def __repr__(self):
-        '''Return the function's docstring.'''
-        return self.func.__doc__
-    def __get__(self, obj, objtype):
-        '''Support instance methods.'''
-        return partial(self.__call__, obj)
+
+        misses += 1
+        value = cache[key] = func(*args, **kwargs)
+
+        if maxsize is not None and len(cache) > maxsize:
+            evict()
+
+        if maxbytes is not None:
+            sizes[key] = sizeof(key, value)
+            nbytes += sizes[key]
+            while cache and nbytes > maxbytes:
+                evict()
+
+        return value
+
+    def cache_info():
+        """Return the hit, miss and eviction counts and size of the cache"""
+        size = nbytes
+        if maxbytes is None:    # not tracked as we go, add it up now
+            size = sum(sizeof(k, v) for k, v in cache.items())
+
+        return CacheInfo(func.__qualname__, hits, misses, evictions,
+                         maxsize, len(cache), size)
+
+    def cache_clear():
+        """Empty the cache and reset the counts"""
+        nonlocal hits, misses, evictions, nbytes
+        cache.clear()
+        sizes.clear()
+        hits = misses = evictions = nbytes = 0
+
+    _memoized.cache_info = cache_info
+    _memoized.cache_clear = cache_clear
+    MEMOIZED.add(_memoized)
+    return _memoized
+
+def memoized_stats():
+    """Return the CacheInfo of every memoized function"""
+    return sorted((f.cache_info() for f in MEMOIZED), key=lambda i: i.name)
+
+def print_memoized_stats():
+    """Pretty print the cache statistics of every memoized function"""
+    for info in memoized_stats():
+        calls = info.hits + info.misses
+        rate = info.hits / calls if calls else 0
+        print(f'@memoized: {info.name} {info.hits} hits {info.misses} misses '
+              f'({rate:0.1%}), {info.evictions} evictions, '
+              f'{info.currsize} entries ~{info.nbytes / 1024:0.1f}KB')
+
+def clear_memoized():
+    """Empty every memoized function's cache, e.g. between inputs"""
+    for func in MEMOIZED:
+        func.cache_clear()
+
+#
+# Profilers -- pick one with the -p/--profile option of each day
+#
+#   -p, --profile=cprofile  deterministic cProfile, cumulative time (slow loops
+#                           can run 2-5x slower under it)
+#   --profile=sample        sample the stack on CPU time, low overhead
+#   --profile=wall          sample the stack on wall clock time
+#
+PROFILERS = ('cprofile', 'sample', 'wall')
+
+class SamplingProfiler:
+    """Statistical profiler. Records the Python call stack on a timer signal
+       every `interval` seconds of CPU ('cpu') or wall ('wall') time, so the
+       code being profiled runs (almost) at full speed. Unix only, and only
+       profiles the main thread.
+    """
+    TIMERS = {'cpu': (signal.ITIMER_PROF, signal.SIGPROF),
+              'wall': (signal.ITIMER_REAL, signal.SIGALRM)}
+
+    def __init__(self, interval=0.001, clock='cpu'):
+        self.interval = interval
+        self.timer, self.signum = SamplingProfiler.TIMERS[clock]
+        self.stacks = Counter()     # (outermost, ..., innermost) -> samples
+        self.samples = 0
+        self.previous = None
+
+    def _sample(self, _, frame):
+        """Signal handler, count the stack that was interrupted"""
+        stack = []
+        while frame is not None:
+            code = frame.f_code
+            name = getattr(code, 'co_qualname', code.co_name)
+            stack.append(f'{os.path.basename(code.co_filename)}:{name}')
+            frame = frame.f_back
+
+        self.stacks[tuple(reversed(stack))] += 1
+        self.samples += 1
+
+    def start(self):
+        """Start sampling"""
+        self.previous = signal.signal(self.signum, self._sample)
+        signal.setitimer(self.timer, self.interval, self.interval)
+
+    def stop(self):
+        """Stop sampling"""
+        signal.setitimer(self.timer, 0)
+        signal.signal(self.signum, self.previous)
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *_):
+        self.stop()
+
+    def function_times(self):
+        """Return {'file:function': (self seconds, total seconds)} estimated
+           from the samples. Total includes the functions it called.
+        """
+        own, total = Counter(), Counter()
+        for stack, count in self.stacks.items():
+            own[stack[-1]] += count
+            for frame in set(stack):    # recursion only counts once
+                total[frame] += count
+
+        return {frame: (own[frame] * self.interval, count * self.interval)
+                for frame, count in total.items()}
+
+    def collapsed(self):
+        """Yield stacks in the collapsed format of flamegraph.pl / speedscope"""
+        for stack, count in self.stacks.most_common():
+            yield ';'.join(frame.replace(' ', '_') for frame in stack) + f' {count}'
+
+    def write_collapsed(self, filename):
+        """Save the collapsed stacks to filename"""
+        with open(filename, 'w', encoding='utf-8') as file:
+            for line in self.collapsed():
+                file.write(line + '\n')
+
+    def print_stats(self, limit=25):
+        """Pretty print the functions with the most time, like cProfile"""
+        times = sorted(self.function_times().items(), key=lambda t: -t[1][1])
+        print(f'{self.samples} samples every {self.interval * 1000:g}ms\n')
+        print(f'{"self":>9} {"total":>9}  function')
+        for frame, (own, total) in times[:limit]:
+            print(f'{own:9.3f} {total:9.3f}  {frame}')
+
+@contextmanager
+def profiler(mode=None, output=None, limit=25):
+    """Profile the with block using one of PROFILERS, or not at all if mode
+       is None. Prints the results when the block exits and saves them to
+       output (cProfile stats, or collapsed stacks when sampling) if given.
+    """
+    if not mode:
+        yield None
+        return
+
+    if mode == 'cprofile':
+        # pylint: disable=import-outside-toplevel
+        from cProfile import Profile
+
+        with Profile() as profile:
+            yield profile
+        profile.print_stats('cumtime')
+        if output:
+            profile.dump_stats(output)
+        return
+
+    with SamplingProfiler(clock='cpu' if mode == 'sample' else 'wall') as sampler:
+        yield sampler
+    sampler.print_stats(limit)
+    if output:
+        sampler.write_collapsed(output)
+
+class ProfileFlag(argparse.Action):
+    """-p/--profile, a flag that profiles with cProfile unless --profiler
+       picks another, whichever order they are given in.
+    """
+    def __init__(self, option_strings, dest, **kwargs):
+        super().__init__(option_strings, dest, nargs=0, **kwargs)
+
+    def __call__(self, parser, namespace, values, option_string=None):
+        if getattr(namespace, self.dest) is None:
+            setattr(namespace, self.dest, PROFILERS[0])
+
+def add_profile_arguments(parser):
+    """Add the -p/--profile, --profiler and --profile-output options to an
+       ArgumentParser. args.profile is the profiler to use, None for none.
+    """
+    parser.add_argument('-p', '--profile', action=ProfileFlag,
+                        help='profile the run (with cProfile by default)')
+    parser.add_argument('--profiler', dest='profile', choices=PROFILERS,
+                        help='profile the run with this profiler')
+    parser.add_argument('--profile-output', metavar='FILE',
+                        help='save cProfile stats or collapsed stacks to FILE')
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,122 @@
+#!/usr/bin/env python
+"""
+Advent of Code 2023 - Memory mapped puzzle input
+Stephen Houser <stephenhouser@gmail.com>
+
+Maps an input file into memory (read-only) once and hands out rows as
+memoryview slices of the mapping, so nothing is copied until a solution
+actually needs its own data. Grid days can index the mapping directly, see
+mapped_grid(). Large (synthetic) inputs only cost the pages that are touched.
+"""
+
+import mmap
+import tempfile
+import unittest
+
+from grid import Grid
+
+CR = ord('\r')
+
+
+class TestPuzzleInput(unittest.TestCase):
+    """Test memory mapped input"""
+
+    def setUp(self):
+        # pylint: disable=consider-using-with
+        self.file = tempfile.NamedTemporaryFile('wb', suffix='.txt')
+        self.file.write(b'#..\n.#.\n\n..#\n#..\n')
+        self.file.flush()
+
+    def tearDown(self):
+        self.file.close()
+
+    def test_rows(self):
+        """Rows are slices of the mapped file without newlines"""
+        rows = mapped_rows(map_file(self.file.name))
+        self.assertEqual([bytes(row) for row in rows],
+                         [b'#..', b'.#.', b'', b'..#', b'#..'])
+
+    def test_blocks(self):
+        """Blocks are separated by blank lines"""
+        blocks = mapped_blocks(map_file(self.file.name))
+        self.assertEqual(len(blocks), 2)
+        self.assertEqual(bytes(blocks[1][0]), b'..#')
+
+    def test_crlf(self):
+        """CRLF line endings are left off rows, blank lines split blocks"""
+        with open(self.file.name, 'wb') as file:
+            file.write(b'#..\r\n.#.\r\n\r\n..#\r\n#..\r\n')
+        buffer = map_file(self.file.name)
+        self.assertEqual([bytes(row) for row in mapped_rows(buffer)],
+                         [b'#..', b'.#.', b'', b'..#', b'#..'])
+        blocks = mapped_blocks(buffer)
+        self.assertEqual(len(blocks), 2)
+        self.assertEqual(bytes(blocks[1][0]), b'..#')
+
+    def test_grid(self):
+        """Grid indexes straight into the mapped file"""
+        with open(self.file.name, 'wb') as file:
+            file.write(b'ab\ncd')
+        grid = mapped_grid(self.file.name)
+        self.assertEqual((grid.width, grid.height), (2, 2))
+        self.assertEqual(grid.get(1, 1), 'd')
+        self.assertFalse(grid.valid(grid.index(1, 1) + 1))
+
+
+def map_file(filename: str):
+    """Return the contents of filename mapped read-only into memory.
+        The result is an mmap (or b'' for an empty file) which supports
+        indexing, slicing, find() and memoryview() like bytes.
+    """
+    with open(filename, 'rb') as file:
+        try:
+            # the mapping stays valid after the file is closed
+            return mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:  # cannot map an empty file
+            return b''
+
+def iter_rows(buffer):
+    """Yield each line of buffer as a memoryview slice (no newline).
+        A '\r' before the newline (CRLF line endings) is left off too.
+    """
+    view = memoryview(buffer)
+    start = 0
+    while start < len(buffer):
+        end = buffer.find(b'\n', start)
+        if end < 0:
+            end = len(buffer)
+
+        row_end = end - 1 if end > start and buffer[end-1] == CR else end
+        yield view[start:row_end]
+        start = end + 1
+
+def mapped_rows(buffer):
+    """Return a list of each line of buffer as a memoryview slice"""
+    return list(iter_rows(buffer))
+
+def mapped_blocks(buffer):
+    """Return lists of rows for each block of lines separated by blank lines"""
+    blocks = [[]]
+    for row in iter_rows(buffer):
+        if len(row):
+            blocks[-1].append(row)
+        elif blocks[-1]:
+            blocks.append([])
+
+    return [block for block in blocks if block]
+
+def mapped_grid(filename: str):
+    """Return a Grid that indexes directly into the mapped file.
+        The file must use '\\n' line endings with every row the same width.
+    """
+    buffer = map_file(filename)
+    width = buffer.find(b'\n')
+    if width < 0:
+        width = len(buffer)
+
+    height = (len(buffer) + 1) // (width + 1)
+    assert b'\r' not in buffer[:width+1], 'input must use \\n line endings'
+    return Grid(buffer, width, height, stride=width+1)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,11 +1,8 @@
 #!/bin/bash
-
-for day in Day-* ; do
-	
-	(cd $day; 
-		prog=$(ls -1 *.py);
-		echo "Running ${day} [${prog}] input.txt"
-		time python ./${prog} input.txt
-	)
-
-done
\ No newline at end of file
+#
+# Time every day's solution on input.txt, see benchmark.py for options.
+# Times load/parse, part 1 and part 2 separately and appends the results
+# to benchmark-history.csv
+#
+cd "$(dirname "$0")"
+python ./benchmark.py "$@"
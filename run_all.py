@@ -0,0 +1,141 @@
+#!/usr/bin/env python
+"""
+Advent of Code 2023 - Run all days concurrently
+Stephen Houser <stephenhouser@gmail.com>
+
+Runs every day's solution on a process pool. Days are scheduled by their
+historical runtime (longest first, from the benchmark history) so the
+total time is bounded by the slowest day rather than the sum of all days.
+Days whose input and source have not changed since the last run are
+answered from the answer cache (see answer_cache.py) instead of being run.
+"""
+
+import os
+import time
+import argparse
+import multiprocessing
+
+import days
+from days import ROOT, find_days
+from benchmark import run_isolated, load_history, save_history, format_seconds
+from answer_cache import MODES, AnswerCache, file_sha256, source_sha256
+
+
+def historical_runtimes(history, filename):
+    """Return {day: seconds} from the most recent history for each day.
+       A day's runtime is the sum of its load, part1 and part2 medians.
+    """
+    latest = {}     # (day, phase) -> median, later rows replace earlier
+    for row in history:
+        if row['input'] == filename and row['median'] not in (None, ''):
+            latest[(int(row['day']), row['phase'])] = float(row['median'])
+
+    runtimes = {}
+    for (day, _), median in latest.items():
+        runtimes[day] = runtimes.get(day, 0) + median
+
+    return runtimes
+
+def schedule(solutions, runtimes):
+    """Return solutions ordered longest running first.
+       Days with no history are assumed to be slow and go first.
+    """
+    return sorted(solutions, key=lambda s: -runtimes.get(s.day, float('inf')))
+
+def answer_keys(solution, filename):
+    """Return {part: cache key} for each part of a day, {} if it can't be cached"""
+    input_file = solution.input_file(filename)
+    try:
+        module = solution.import_module()
+        input_sha = file_sha256(input_file)
+    except Exception:   # pylint: disable=broad-except
+        return {}       # let the benchmark report the error
+
+    source_sha = source_sha256(module, days)
+    return {part: (solution.day, part, f'days.py:SOLUTIONS[{solution.day}].{part}',
+                   input_sha, source_sha)
+            for part, _ in solution.parts()}
+
+def cached_rows(cache, solution, filename):
+    """Return (keys, rows) where rows are the cached answers as result rows,
+       or None unless every part of the day is in the cache.
+    """
+    keys = answer_keys(solution, filename)
+    answers = {part: cache.get(*key) for part, key in keys.items()}
+    if not keys or None in answers.values():
+        return keys, None
+
+    return keys, [{'day': solution.day, 'input': filename, 'phase': part,
+                   'runs': 0, 'median': None, 'p95': None, 'stdev': None,
+                   'answer': answer, 'error': None}
+                  for part, answer in answers.items()]
+
+def run_day(task):
+    """Pool worker: run one day once and return (day, rows, elapsed, cached)"""
+    day, filename, verbose, cache_mode = task
+    t0 = time.perf_counter()
+    cache = AnswerCache(mode=cache_mode)
+    keys, rows = cached_rows(cache, find_days([day])[0], filename)
+    cached = rows is not None
+    if not cached:
+        rows = run_isolated(day, filename, 1, 0, verbose)
+        for row in rows:
+            if row['phase'] in keys and not row['error']:
+                cache.put(*keys[row['phase']], row['answer'], row['median'])
+
+    cache.close()
+    return (day, rows, time.perf_counter() - t0, cached)
+
+def print_table(results):
+    """Pretty print the answers and timings for each day"""
+    print(f'{"day":>3} {"time":>9}  {"part 1":>20}  {"part 2":>20}')
+    for day, rows, elapsed, cached in sorted(results):
+        answers = {r['phase']: r['error'] or r['answer'] for r in rows}
+        part1 = answers.get('part1', answers.get('load', ''))
+        part2 = answers.get('part2', '')
+        timing = 'cached' if cached else format_seconds(elapsed)
+        print(f'{day:3} {timing:>9}  {str(part1):>20}  {str(part2):>20}')
+
+def main():
+    """Main Routine, does all the work"""
+    parser = argparse.ArgumentParser(description=__doc__.strip().split('\n')[0])
+    parser.add_argument('days', type=int, nargs='*',
+                        help='days to run (default all)')
+    parser.add_argument('-i', '--input', default='input.txt',
+                        help='input file name in each Day-* directory')
+    parser.add_argument('-j', '--jobs', type=int, default=os.cpu_count(),
+                        help='number of worker processes')
+    parser.add_argument('-o', '--history',
+                        default=os.path.join(ROOT, 'benchmark-history.csv'),
+                        help='history file for scheduling and results')
+    parser.add_argument('-n', '--no-history', action='store_true')
+    parser.add_argument('-v', '--verbose', action='store_true',
+                        help='show output printed by the solutions')
+    parser.add_argument('-c', '--cache', choices=MODES,
+                        default=os.environ.get('AOC_ANSWER_CACHE', 'on'),
+                        help="answer cache: 'off' to bypass, 'refresh' to recompute")
+    args = parser.parse_args()
+
+    runtimes = historical_runtimes(load_history(args.history), args.input)
+    solutions = schedule(find_days(args.days), runtimes)
+    tasks = [(s.day, args.input, args.verbose, args.cache) for s in solutions]
+
+    t0 = time.perf_counter()
+    # maxtasksperchild=1 keeps one day's state (caches, recursion limits)
+    # from leaking into the next day run in the same worker
+    with multiprocessing.Pool(processes=args.jobs, maxtasksperchild=1) as pool:
+        results = list(pool.imap_unordered(run_day, tasks))
+    wall_time = time.perf_counter() - t0
+
+    print_table(results)
+    total = sum(elapsed for _, _, elapsed, _ in results)
+    print(f'\nWall time {wall_time:0.2f}s, sum of days {total:0.2f}s, '
+          f'{args.jobs} workers')
+
+    if not args.no_history:
+        # cached days were not timed, they have nothing to add to the history
+        save_history(args.history, [row for _, rows, _, cached in results
+                                    if not cached for row in rows])
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,144 @@
+#!/usr/bin/env python
+"""
+Advent of Code 2023 - Scaling benchmark
+Stephen Houser <stephenhouser@gmail.com>
+
+Runs each day on synthetic inputs (see generators/) of increasing size and
+fits time = c * size**k to the timings. k is about 1 for a linear solution
+and 2 for a quadratic one, so hot paths that will not survive a bigger input
+show up before a bigger input does.
+
+    python scaling.py 11 22 -s 1 2 4 8
+"""
+
+import os
+import math
+import argparse
+import tempfile
+import statistics
+import unittest
+import multiprocessing
+
+from days import SOLUTIONS, find_days
+from benchmark import run_isolated, format_seconds
+from generators import DAYS, generate
+
+
+class TestScaling(unittest.TestCase):
+    """Test scaling benchmark"""
+
+    def test_fit_exponent(self):
+        """Linear and quadratic timings"""
+        sizes = [1, 2, 4, 8]
+        self.assertAlmostEqual(fit_exponent(sizes, [3 * s for s in sizes]), 1)
+        self.assertAlmostEqual(fit_exponent(sizes, [s * s for s in sizes]), 2)
+        self.assertIsNone(fit_exponent([1], [1]))
+
+    def test_generators(self):
+        """Generated inputs are repeatable and grow with scale"""
+        for day in DAYS:
+            self.assertEqual(generate(day, 0.5, 1), generate(day, 0.5, 1))
+            self.assertLessEqual(len(generate(day, 0.5)), len(generate(day, 2)))
+
+    def test_day04_copies(self):
+        """Generated scratchcards win about as many copies per card at any
+           scale, not exponentially more as the cards grow.
+        """
+        solution = SOLUTIONS[4]
+        module = solution.import_module()
+        for scale in (1, 10, 100):
+            with tempfile.NamedTemporaryFile('w', suffix='.txt') as file:
+                file.write(generate(4, scale))
+                file.flush()
+                matches = solution.load(module, file.name)
+
+            self.assertLess(solution.part2(module, matches), len(matches) * 2**12)
+
+
+def fit_exponent(sizes, times):
+    """Return the exponent k that best fits times = c * sizes**k (log-log),
+       None if there are not at least two timings to fit.
+    """
+    points = [(math.log(s), math.log(t)) for s, t in zip(sizes, times) if t]
+    if len(points) < 2:
+        return None
+
+    slope, _ = statistics.linear_regression(*zip(*points))
+    return slope
+
+def run_with_timeout(day, filename, repeat, timeout):
+    """Return the benchmark rows for one day, None if it ran past timeout"""
+    # leaving the pool terminates the worker if it is still running
+    with multiprocessing.Pool(processes=1) as pool:
+        result = pool.apply_async(run_isolated, (day, filename, repeat, 0, False))
+        try:
+            return result.get(timeout)
+        except multiprocessing.TimeoutError:
+            return None
+
+def scale_day(solution, scales, directory, seed=0, repeat=1, timeout=60):
+    """Return {phase: [(size, median or error), ...]} over increasing scales.
+       Larger scales are skipped once one times out.
+    """
+    timings = {}
+    for scale in sorted(scales):
+        text = generate(solution.day, scale, seed)
+        filename = os.path.join(directory, f'synthetic-{solution.day:02}-x{scale:g}.txt')
+        with open(filename, 'w', encoding='utf-8') as file:
+            file.write(text)
+
+        rows = run_with_timeout(solution.day, filename, repeat, timeout)
+        if rows is None:
+            timings.setdefault('timeout', []).append((len(text), f'> {timeout}s'))
+            break
+
+        for row in rows:
+            result = row['error'] if row['error'] else row['median']
+            timings.setdefault(row['phase'], []).append((len(text), result))
+
+    return timings
+
+def print_scaling(day, scales, timings, threshold):
+    """Pretty print the timings and fitted exponent for each phase of a day"""
+    for phase, results in timings.items():
+        cells = [format_seconds(r) if isinstance(r, float) else str(r)
+                 for _, r in results]
+        cells += ['-'] * (len(scales) - len(cells))
+
+        timed = [(size, r) for size, r in results if isinstance(r, float)]
+        k = fit_exponent(*zip(*timed)) if len(timed) > 1 else None
+        fit = f'k={k:4.2f}' if k is not None else ''
+        flag = '  <- superlinear' if k is not None and k > threshold else ''
+        print(f'{day:3} {phase:7} ' + ' '.join(f'{c:>10}' for c in cells)
+              + f'  {fit}{flag}')
+
+def main():
+    """Main Routine, does all the work"""
+    parser = argparse.ArgumentParser(description=__doc__.strip().split('\n')[0])
+    parser.add_argument('days', type=int, nargs='*',
+                        help='days to run (default all)')
+    parser.add_argument('-s', '--scales', type=float, nargs='+',
+                        default=[1, 2, 4, 8],
+                        help='input sizes relative to a real input')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('-r', '--repeat', type=int, default=1)
+    parser.add_argument('-t', '--timeout', type=float, default=60,
+                        help='seconds before giving up on larger inputs')
+    parser.add_argument('-k', '--threshold', type=float, default=1.5,
+                        help='flag phases that grow faster than size**k')
+    parser.add_argument('-d', '--directory',
+                        help='keep generated inputs here (default temporary)')
+    args = parser.parse_args()
+
+    scales = sorted(args.scales)
+    print(f'{"day":>3} {"phase":7} ' + ' '.join(f'{"x" + format(s, "g"):>10}'
+                                               for s in scales))
+    with tempfile.TemporaryDirectory() as temporary:
+        directory = args.directory if args.directory else temporary
+        for solution in find_days(args.days):
+            timings = scale_day(solution, scales, directory,
+                                args.seed, args.repeat, args.timeout)
+            print_scaling(solution.day, scales, timings, args.threshold)
+
+if __name__ == '__main__':
+    main()